@@ -3,6 +3,15 @@ This module contains a base hero class, to hold basic hero attributes.
 """
 
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from Heroes.hero_snapshot import get_snapshot_codec
+from Heroes.spec_data import SpellDefinition, get_class_spec
+from Spells.spell_registry import SpellRegistry
+from Spells.spell_table import CompiledSpell, compile_spell_table
+
+if TYPE_CHECKING:
+    from battles_handler import EventBus
 
 
 # ---------------------------------------------------------------------------- #
@@ -12,52 +21,215 @@ class IBaseHero(ABC):
     """
     Base interface class for all heroes. This class holds the basic attributes of a hero as well
     as all common spells.
+    The attributes are stored in slots, so every hero has a fixed layout without an instance dict.
+    Each child class must declare the slots of its own attributes.
     """
 
+    __slots__ = (
+        "_max_health",
+        "_max_secondary_pool",
+        "_spell_power",
+        "_attack_power",
+        "_max_damage_reduction",
+        "_spell_table",
+        "damage_reduction",
+        "_curr_health",
+        "event_bus",
+    )
+
+    # Numbers of all spells of the spec, by spell name, read from the spec definitions data file
+    spell_definitions: dict[str, SpellDefinition] = {}
+    # Spells of the spec by id and name, built for every child class when it is defined
+    spell_registry: SpellRegistry
+    # Effects, with which the hero buffs its own stats, by effect name - the slot holding the amount of the buff,
+    # which the hero takes back in expire_effect
+    buff_effects: dict[str, str] = {}
+
+    # ------------------------------------------------------------------------ #
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        spec = get_class_spec(cls)
+        if spec is not None:
+            cls.spell_definitions = spec.spells
+        cls.spell_registry = SpellRegistry(cls)
+
     # ------------------------------------------------------------------------ #
     def __init__(self) -> None:
-        self.max_health: int = 1000
-        self.max_secondary_pool: int = 500
-        self.spell_power: int = 10
-        self.attack_power: int = 10
+        self._max_health: int = 1000
+        self._max_secondary_pool: int = 500
+        self._spell_power: int = 10
+        self._attack_power: int = 10
+        self._max_damage_reduction: int = 100
         self.damage_reduction: int = 0
-        self.max_damage_reduction: int = 100
-        self.spell_attributes = {
-            "spell_cost": 0,
-            "spell_damage": 0,
-            "cooldown": 0,
-            "turns_active": 0,
-            "damage_reduction": 0,
-            "initial_spell_damage": 0,
-            "health_leech": 0,
-            "damage_over_time": 0,
-        }
+        # Bus to which the hero publishes its healing and class resource, None outside of observed battles
+        self.event_bus: "EventBus | None" = None
+        self._spell_table = compile_spell_table(self)
 
     # ------------------------------------------------------------------------ #
-    @abstractmethod
-    def get_name(self) -> str:
+    @property
+    def max_health(self) -> int:
         """
-        Get the name of the hero class.
+        Max health of the hero.
+        """
+        return self._max_health
+
+    # ------------------------------------------------------------------------ #
+    @max_health.setter
+    def max_health(self, value: int) -> None:
+        if value != self._max_health:
+            self._max_health = value
+            self._spell_table = compile_spell_table(self)
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def max_secondary_pool(self) -> int:
+        """
+        Max secondary pool of the hero - mana, energy or rage.
+        """
+        return self._max_secondary_pool
+
+    # ------------------------------------------------------------------------ #
+    @max_secondary_pool.setter
+    def max_secondary_pool(self, value: int) -> None:
+        if value != self._max_secondary_pool:
+            self._max_secondary_pool = value
+            self._spell_table = compile_spell_table(self)
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def spell_power(self) -> int:
+        """
+        Spell power of the hero.
+        """
+        return self._spell_power
+
+    # ------------------------------------------------------------------------ #
+    @spell_power.setter
+    def spell_power(self, value: int) -> None:
+        if value != self._spell_power:
+            self._spell_power = value
+            self._spell_table = compile_spell_table(self)
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def attack_power(self) -> int:
+        """
+        Attack power of the hero.
+        """
+        return self._attack_power
+
+    # ------------------------------------------------------------------------ #
+    @attack_power.setter
+    def attack_power(self, value: int) -> None:
+        if value != self._attack_power:
+            self._attack_power = value
+            self._spell_table = compile_spell_table(self)
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def max_damage_reduction(self) -> int:
+        """
+        Max damage reduction, which a single spell can give.
+        """
+        return self._max_damage_reduction
+
+    # ------------------------------------------------------------------------ #
+    @max_damage_reduction.setter
+    def max_damage_reduction(self, value: int) -> None:
+        if value != self._max_damage_reduction:
+            self._max_damage_reduction = value
+            self._spell_table = compile_spell_table(self)
+
+    # ------------------------------------------------------------------------ #
+    def get_spell_table(self) -> dict[str, CompiledSpell]:
+        """
+        Get the spell table of the hero, compiled for its current stats.
+        The table is rebuilt only when one of the stats, used by the spells, changes.
 
         Returns:
-            str: name of the hero class
+            dict[str, CompiledSpell]: compiled spells by spell name
         """
-        raise NotImplementedError
+        return self._spell_table
 
     # ------------------------------------------------------------------------ #
-    @abstractmethod
-    def create_hero(self, hero_instance: "IBaseHero"):
+    def snapshot(self) -> tuple:
         """
-        Create a hero based on the instance provided.
+        Capture the state of the hero - health, pool, class resource, stats and damage reduction.
+        The event bus is not part of the state.
+
+        Returns:
+            tuple: state of the hero, which can be given to restore
+        """
+        return get_snapshot_codec(type(self))[0](self)
+
+    # ------------------------------------------------------------------------ #
+    def restore(self, state: tuple) -> None:
+        """
+        Bring the hero back to a captured state.
 
         Args:
-            hero_instance (IBaseHero): class instance
+            state (tuple): state captured by snapshot of a hero of the same class
+        """
+        get_snapshot_codec(type(self))[1](self, state)
 
-        Raises:
-            NotImplementedError: the method must be implemented in the child class
+    # ------------------------------------------------------------------------ #
+    def get_current_health(self) -> int:
+        """
+        Get the current health of the hero.
+
+        Returns:
+            int: current health
+        """
+        return self._curr_health
+
+    # ------------------------------------------------------------------------ #
+    def get_current_damage_reduction(self) -> int:
+        """
+        Get the flat amount of damage, which the hero ignores from every incoming hit.
+
+        Returns:
+            int: current damage reduction
+        """
+        return self.damage_reduction
+
+    # ------------------------------------------------------------------------ #
+    def take_damage(self, damage: int) -> None:
+        """
+        Subtract the already mitigated damage from the current health of the hero.
+
+        Args:
+            damage (int): amount of damage taken
+        """
+        self._curr_health -= damage
+
+    # ------------------------------------------------------------------------ #
+    def is_alive(self) -> bool:
+        """
+        Check if the hero has any health left.
 
         Returns:
-            Any: class instance
+            bool: True if the current health is above zero, else False
+        """
+        return self._curr_health > 0
+
+    # ------------------------------------------------------------------------ #
+    def expire_effect(self, effect_name: str) -> None:
+        """
+        Called when an effect, which is active on the hero, expires.
+        Heroes with buff effects take the buff back here.
+
+        Args:
+            effect_name (str): name of the effect, for example "arcane_intellect"
+        """
+
+    # ------------------------------------------------------------------------ #
+    @abstractmethod
+    def get_name(self) -> str:
+        """
+        Get the name of the hero class.
+
+        Returns:
+            str: name of the hero class
         """
         raise NotImplementedError
 
@@ -1,21 +1,141 @@
 """
 Hero Factory which creates a hero based on the input.
+The specs, their hero classes and stats come from the spec definitions data file.
+Every spec is built once as a prototype with the stats of its spec, and heroes are handed out as clones
+of it, which copy the slots of the prototype instead of running the constructors again.
+Finished heroes can be given back to a bounded pool and are reset from the prototype when reused.
+The spell module of a spec is imported only when the spec is used for the first time.
 """
 
-from Heroes.hero_base_stats import IBaseHero
-from Spells.mage_spell_handler import FireMageSpells
-from Spells.monk_spell_handler import BrewmasterMonkSpells, WindwalkerMonkSpells
-from Spells.paladin_spell_handler import (
-    ProtectionPaladinSpells,
-    RetributionPaladinSpells,
-)
-from Spells.priest_spell_handler import ShadowPriestSpells
-from Spells.shaman_spell_handler import EnhancementShamanSpells
-from Spells.warrior_spell_handler import FuryWarriorSpells, ProtectionWarriorSpells
+import importlib
+from collections.abc import Callable, Iterator, Mapping
+from typing import TYPE_CHECKING
+
+from Heroes.hero_layout import get_hero_layout
+from Heroes.spec_data import load_spec_definitions
+
+if TYPE_CHECKING:
+    from Heroes.hero_base_stats import IBaseHero
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Helpers                                   #
+# ---------------------------------------------------------------------------- #
+def get_hero_slots(hero_cls: type) -> tuple[str, ...]:
+    """
+    Get all slots of a hero class, including the slots of its parent classes.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+
+    Returns:
+        tuple[str, ...]: names of the slots, from the base class down
+    """
+    slots = []
+    for klass in reversed(hero_cls.__mro__):
+        for slot in getattr(klass, "__slots__", ()):
+            if slot not in slots:
+                slots.append(slot)
+
+    return tuple(slots)
+
+
+# ---------------------------------------------------------------------------- #
+def build_prototype(hero_cls: type, stats: Mapping[str, int]) -> "IBaseHero":
+    """
+    Build a hero with the stats of its spec and with full health, pool and class resource limit
+    for those stats.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+        stats (Mapping[str, int]): stats of the spec, by property name, for example "max_health"
+
+    Returns:
+        IBaseHero: the statted hero
+    """
+    hero = hero_cls()
+    for stat, value in stats.items():
+        setattr(hero, stat, value)
+
+    # The constructors filled the resources for the default stats
+    layout = get_hero_layout(hero_cls)
+    hero._curr_health = hero.max_health
+    if layout.pool is not None:
+        setattr(hero, layout.pool, hero.max_secondary_pool)
+    else:
+        # Heroes without a pool use it as the limit of their class resource, for example rage
+        setattr(hero, layout.max_resource, hero.max_secondary_pool)
+
+    return hero
+
+
+# ---------------------------------------------------------------------------- #
+def _make_restore(hero_cls: type) -> Callable[["IBaseHero", "IBaseHero"], None]:
+    # Like namedtuple, the copy is generated as straight line code, one assignment per slot, which is
+    # several times faster than a loop over the slots. All slots hold numbers or the shared, read only
+    # spell table, so a shallow copy is complete.
+    slots = get_hero_slots(hero_cls)
+    assert all(slot.isidentifier() for slot in slots)
+    lines = [f"    hero.{slot} = prototype.{slot}" for slot in slots]
+    source = "def restore(hero, prototype):\n" + "\n".join(lines or ["    pass"]) + "\n"
+    namespace: dict = {}
+    exec(compile(source, f"<restore {hero_cls.__name__}>", "exec"), namespace)
+    return namespace["restore"]
 
 
 # ---------------------------------------------------------------------------- #
 #                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class LazyHeroRegistry(Mapping):
+    """
+    Hero classes by (class, role) key. The keys are known up front, the classes are imported
+    on first access, so listing or validating the keys imports no spell code.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, paths: dict[tuple[str, str], tuple[str, str]]) -> None:
+        """
+        Args:
+            paths (dict): module and class name of every hero class, by (class, role) key
+        """
+        self._paths = paths
+        self._classes: dict[tuple[str, str], type] = {}
+
+    # ------------------------------------------------------------------------ #
+    def __getitem__(self, key: tuple[str, str]) -> type:
+        hero_cls = self._classes.get(key)
+        if hero_cls is None:
+            module_name, class_name = self._paths[key]
+            hero_cls = getattr(importlib.import_module(module_name), class_name)
+            self._classes[key] = hero_cls
+        return hero_cls
+
+    # ------------------------------------------------------------------------ #
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        return iter(self._paths)
+
+    # ------------------------------------------------------------------------ #
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    # ------------------------------------------------------------------------ #
+    def __contains__(self, key: object) -> bool:
+        return key in self._paths
+
+    # ------------------------------------------------------------------------ #
+    def is_loaded(self, key: tuple[str, str]) -> bool:
+        """
+        Check if the hero class of a key was already imported.
+
+        Args:
+            key (tuple[str, str]): key of the hero, for example ("paladin", "retribution")
+
+        Returns:
+            bool: True if the class was imported, else False
+        """
+        return key in self._classes
+
+
 # ---------------------------------------------------------------------------- #
 class HeroFactory:
     """
@@ -25,22 +145,108 @@ class HeroFactory:
         IBaseHero: hero instance
     """
 
-    _hero_registry = {
-        ("paladin", "protection"): ProtectionPaladinSpells,
-        ("paladin", "retribution"): RetributionPaladinSpells,
-        ("warrior", "protection"): ProtectionWarriorSpells,
-        ("warrior", "fury"): FuryWarriorSpells,
-        ("priest", "shadow"): ShadowPriestSpells,
-        ("mage", "fire"): FireMageSpells,
-        ("monk", "brewmaster"): BrewmasterMonkSpells,
-        ("monk", "windwalker"): WindwalkerMonkSpells,
-        ("shaman", "enhancement"): EnhancementShamanSpells,
-    }
+    _hero_registry = LazyHeroRegistry(
+        {key: (spec.module, spec.class_name) for key, spec in load_spec_definitions().items()}
+    )
+    # Prototypes and their restore functions are shared by all factories and built on first use
+    _prototypes: dict[
+        tuple[str, str], tuple["IBaseHero", Callable[["IBaseHero", "IBaseHero"], None]]
+    ] = {}
 
     # ------------------------------------------------------------------------ #
-    def create_hero(self, hero_class: str, hero_role: str) -> IBaseHero:
+    def __init__(self, pool_size: int = 0) -> None:
+        """
+        Args:
+            pool_size (int): how many released heroes of every spec are kept for reuse, 0 disables the pool
+        """
+        self._pool_size = pool_size
+        self._pools: dict[type, list["IBaseHero"]] = {}
+
+    # ------------------------------------------------------------------------ #
+    def create_hero(self, hero_class: str, hero_role: str) -> "IBaseHero":
+        """
+        Create a hero of the given class and role, with the stats of its spec. The hero is a clone of
+        the prototype of the spec, or a released hero from the pool reset to it. It comes with the spell
+        table of its spec already compiled for its stats, so the casts only look up the ready results.
+
+        Args:
+            hero_class (str): class of the hero, for example "paladin"
+            hero_role (str): role of the hero, for example "retribution"
+
+        Raises:
+            ValueError: if the class or the role is unknown
+
+        Returns:
+            IBaseHero: hero instance
+        """
         key = (hero_class.lower(), hero_role.lower())
-        hero_cls = self._hero_registry.get(key)
-        if not hero_cls:
-            raise ValueError(f"Unknown hero class or role: {hero_class}, {hero_role}")
-        return hero_cls()
+        prototype, restore = self._get_prototype(key)
+        hero_cls = type(prototype)
+
+        pool = self._pools.get(hero_cls)
+        hero = pool.pop() if pool else hero_cls.__new__(hero_cls)
+        restore(hero, prototype)
+        return hero
+
+    # ------------------------------------------------------------------------ #
+    def release_hero(self, hero: "IBaseHero") -> None:
+        """
+        Give a finished hero back for reuse. The hero must not be used after it was released.
+        Heroes are dropped, when the pool of their spec is full. A hero released twice is pooled once,
+        so it is never handed out to two callers.
+
+        Args:
+            hero (IBaseHero): hero created by a factory
+        """
+        if not self._pool_size:
+            return
+
+        pool = self._pools.setdefault(type(hero), [])
+        # Compared by identity, the pools are small
+        if len(pool) < self._pool_size and not any(pooled is hero for pooled in pool):
+            pool.append(hero)
+
+    # ------------------------------------------------------------------------ #
+    @classmethod
+    def get_prototype(cls, hero_class: str, hero_role: str) -> "IBaseHero":
+        """
+        Get the prototype of a spec. It is shared, so it must not be changed.
+
+        Args:
+            hero_class (str): class of the hero, for example "paladin"
+            hero_role (str): role of the hero, for example "retribution"
+
+        Raises:
+            ValueError: if the class or the role is unknown
+
+        Returns:
+            IBaseHero: hero with the stats of the spec and full resources
+        """
+        return cls._get_prototype((hero_class.lower(), hero_role.lower()))[0]
+
+    # ------------------------------------------------------------------------ #
+    @classmethod
+    def clear_prototypes(cls) -> None:
+        """
+        Drop the prototypes of all specs, so they are built again with the current spell definitions.
+        Heroes created before keep the spell tables of the old definitions.
+        """
+        cls._prototypes.clear()
+
+    # ------------------------------------------------------------------------ #
+    @classmethod
+    def _get_prototype(
+        cls, key: tuple[str, str]
+    ) -> tuple["IBaseHero", Callable[["IBaseHero", "IBaseHero"], None]]:
+        entry = cls._prototypes.get(key)
+        if entry is None:
+            if key not in cls._hero_registry:
+                raise ValueError(f"Unknown hero class or role: {key[0]}, {key[1]}")
+            hero_cls = cls._hero_registry[key]
+            stats = load_spec_definitions()[key].stats
+            entry = cls._prototypes[key] = (
+                build_prototype(hero_cls, stats),
+                _make_restore(hero_cls),
+            )
+
+        return entry
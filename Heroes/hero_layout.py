@@ -0,0 +1,76 @@
+"""
+Resource layout of every hero class - in which slots the pool and the class resource are kept
+and how the class resource is checked by is_specific_stat_spent.
+The classes are referenced by their import path, so the layouts can be looked up without importing
+the spell modules of every class.
+"""
+
+from typing import NamedTuple
+
+# --------------------------------- Constants -------------------------------- #
+# How the class resource is checked by is_specific_stat_spent
+GATE_CONSUME = 0  # enough resource, which is then spent (holy power, rage, chi, maelstrom)
+GATE_EXACT_RESET = 1  # exactly the given amount, which is then reset to zero (fire stacks)
+GATE_EXACT = 2  # exactly the given amount, nothing is spent (insanity)
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class HeroLayout(NamedTuple):
+    """
+    Where a hero class keeps its resources and how its class resource is spent.
+    Heroes without a pool slot (warriors) never pay the cost of their spells from the pool.
+    """
+
+    pool: str | None
+    resource: str
+    max_resource: str
+    resource_gate: int = GATE_CONSUME
+
+
+# ---------------------------------------------------------------------------- #
+_HERO_LAYOUTS: dict[str, HeroLayout] = {
+    "Spells.paladin_spell_handler.PaladinCommonSpells": HeroLayout(
+        "_curr_mana", "_curr_holy_power", "_max_holy_power"
+    ),
+    "Spells.warrior_spell_handler.WarriorCommonSpells": HeroLayout(
+        None, "_curr_rage", "_max_rage"
+    ),
+    "Spells.monk_spell_handler.MonkCommonSpells": HeroLayout(
+        "_curr_energy", "_curr_chi", "_max_chi"
+    ),
+    "Spells.shaman_spell_handler.ShamanCommonSpells": HeroLayout(
+        "_curr_mana", "_curr_maelstrom_stacks", "_max_maelstrom_stacks"
+    ),
+    "Spells.mage_spell_handler.FireMageSpells": HeroLayout(
+        "_curr_mana", "_curr_fire_stacks", "_max_fire_stacks", GATE_EXACT_RESET
+    ),
+    "Spells.priest_spell_handler.ShadowPriestSpells": HeroLayout(
+        "_curr_mana", "_curr_insanity", "_max_insanity", GATE_EXACT
+    ),
+}
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def get_hero_layout(hero_cls: type) -> HeroLayout:
+    """
+    Get the resource layout of a hero class.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+
+    Raises:
+        ValueError: if the class has no resource layout
+
+    Returns:
+        HeroLayout: slots of the resources and the class resource check
+    """
+    for base_cls in hero_cls.__mro__:
+        layout = _HERO_LAYOUTS.get(f"{base_cls.__module__}.{base_cls.__qualname__}")
+        if layout is not None:
+            return layout
+
+    raise ValueError(f"Hero class has no resource layout: {hero_cls.__name__}")
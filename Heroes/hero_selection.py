@@ -0,0 +1,87 @@
+"""
+Classes and roles a player can choose from, and the rules which validate the choice.
+Shared by the interactive game, the command line and the game server. Nothing here imports spell code.
+"""
+
+from Heroes.hero_factory import HeroFactory
+
+# --------------------------------- Constants -------------------------------- #
+AVAILABLE_CLASSES = ["Warrior", "Mage", "Paladin", "Shaman", "Monk", "Priest"]
+AVAILABLE_ROLES = {
+    "Paladin": {"Tank": "Protection", "Damage": "Retribution"},
+    "Warrior": {"Tank": "Protection", "Damage": "Fury"},
+    "Monk": {"Tank": "Brewmaster", "Damage": "Windwalker"},
+    "Mage": {"Damage": "Fire"},
+    "Shaman": {"Damage": "Enhancement"},
+    "Priest": {"Damage": "Shadow"},
+}
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def parse_hero_class(value: str) -> str | None:
+    """
+    Validate a hero class entered by a player, in any case.
+
+    Args:
+        value (str): entered class, for example "paladin"
+
+    Returns:
+        str | None: the class as listed in AVAILABLE_CLASSES or None if there is no such class
+    """
+    hero_class = value.strip().capitalize()
+    return hero_class if hero_class in AVAILABLE_CLASSES else None
+
+
+# ---------------------------------------------------------------------------- #
+def parse_hero_role(hero_class: str, value: str) -> str | None:
+    """
+    Validate a hero role entered by a player, in any case.
+
+    Args:
+        hero_class (str): class of the hero, as listed in AVAILABLE_CLASSES
+        value (str): entered role, for example "tank"
+
+    Returns:
+        str | None: the role as listed in AVAILABLE_ROLES or None if the class has no such role
+    """
+    hero_role = value.strip().capitalize()
+    return hero_role if hero_role in AVAILABLE_ROLES[hero_class] else None
+
+
+# ---------------------------------------------------------------------------- #
+def get_spec(hero_class: str, hero_role: str) -> str:
+    """
+    Get the spec of a hero class for a role, which is the role HeroFactory expects.
+
+    Args:
+        hero_class (str): class of the hero, as listed in AVAILABLE_CLASSES
+        hero_role (str): role of the hero, as listed in AVAILABLE_ROLES
+
+    Returns:
+        str: spec of the hero, for example "Retribution" for a Paladin with the Damage role
+    """
+    return AVAILABLE_ROLES[hero_class][hero_role]
+
+
+# ---------------------------------------------------------------------------- #
+def parse_hero_key(value: str) -> tuple[str, str]:
+    """
+    Parse a hero given as "class:role", for example "paladin:retribution".
+
+    Args:
+        value (str): hero class and role, separated by a colon
+
+    Raises:
+        ValueError: if the value is not in the expected format or the hero is unknown
+
+    Returns:
+        tuple[str, str]: key of the hero in the hero registry
+    """
+    hero_class, separator, hero_role = value.partition(":")
+    key = (hero_class.strip().lower(), hero_role.strip().lower())
+    if not separator or key not in HeroFactory._hero_registry:
+        raise ValueError(f"Unknown hero, expected class:role - {value}")
+
+    return key
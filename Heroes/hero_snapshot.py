@@ -0,0 +1,60 @@
+"""
+Snapshots of the state of a hero - health, pool, class resource, stats and damage reduction - as a flat tuple.
+Like the restore of the hero factory, the snapshot and restore functions of every hero class are generated
+as straight line code, one attribute per slot, so both take O(slots) without copy.deepcopy.
+"""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from Heroes.hero_factory import get_hero_slots
+
+if TYPE_CHECKING:
+    from Heroes.hero_base_stats import IBaseHero
+
+# --------------------------------- Constants -------------------------------- #
+# The event bus belongs to the battle the hero is in, not to its state
+SNAPSHOT_EXCLUDED_SLOTS = ("event_bus",)
+
+_codecs: dict[type, tuple[Callable[["IBaseHero"], tuple], Callable[["IBaseHero", tuple], None]]] = {}
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def get_snapshot_codec(
+    hero_cls: type,
+) -> tuple[Callable[["IBaseHero"], tuple], Callable[["IBaseHero", tuple], None]]:
+    """
+    Get the snapshot and restore functions of a hero class, which are generated on first use.
+    The spell table is kept by reference, it is shared and read only.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+
+    Returns:
+        tuple: function which captures the state of a hero into a tuple
+        and function which writes such a tuple back into a hero
+    """
+    codec = _codecs.get(hero_cls)
+    if codec is None:
+        codec = _codecs[hero_cls] = _make_codec(hero_cls)
+
+    return codec
+
+
+# ---------------------------------------------------------------------------- #
+def _make_codec(
+    hero_cls: type,
+) -> tuple[Callable[["IBaseHero"], tuple], Callable[["IBaseHero", tuple], None]]:
+    slots = [slot for slot in get_hero_slots(hero_cls) if slot not in SNAPSHOT_EXCLUDED_SLOTS]
+    assert slots and all(slot.isidentifier() for slot in slots)
+    # The trailing comma keeps a single slot a tuple
+    fields = ", ".join(f"hero.{slot}" for slot in slots) + ","
+    source = (
+        f"def snapshot(hero):\n    return ({fields})\n"
+        f"def restore(hero, state):\n    {fields} = state\n"
+    )
+    namespace: dict = {}
+    exec(compile(source, f"<snapshot {hero_cls.__name__}>", "exec"), namespace)
+    return namespace["snapshot"], namespace["restore"]
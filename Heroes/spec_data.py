@@ -0,0 +1,222 @@
+"""
+Declarative spec definitions - the hero class, stats and spell numbers of every spec, read from a JSON data file.
+The module holds no spell code, so the info-only paths of the CLI can read the specs without loading it.
+The file is validated once and compiled to a marshal cache next to the bytecode of this package. The cache is
+keyed by the modification time and size of the file and, when those change, by the hash of its content, so
+a start with an unchanged file only reads the cache, and a balance change only needs an edit of the file.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+from typing import NamedTuple
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_SPEC_PATH = os.path.join(os.path.dirname(__file__), "spec_definitions.json")
+CACHE_FORMAT = 1  # bump when the compiled layout changes
+HERO_STATS = ("max_health", "max_secondary_pool", "spell_power", "attack_power", "max_damage_reduction")
+
+_loaded: dict[str, dict[tuple[str, str], "SpecDefinition"]] = {}
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class SpellDefinition(NamedTuple):
+    """
+    Numbers of a single spell. All percentages are whole numbers, for example 135 means 135%.
+    """
+
+    attack_power: int = 0  # damage, percent of the attack power
+    spell_power: int = 0  # damage, percent of the spell power
+    cost: int = 0  # cost, percent of the max secondary pool
+    flat_cost: int = 0  # fixed cost, for example energy or rage
+    cooldown: int = 0
+    turns_active: int = 0
+    damage_reduction: int = 0  # capped by the max damage reduction of the hero
+    damage_reduction_attack_power: int = 0  # damage reduction, percent of the attack power
+    initial_damage: int = 0  # initial damage, percent of the spell power
+    damage_over_time: int = 0  # damage per tick, percent of the spell power
+    damage_over_time_initial: int = 0  # damage per tick, percent of the initial damage
+    health_leech: int = 0  # health restored to the caster, percent of the initial damage
+    heal_spell_power: int = 0  # healing, percent of the spell power
+    heal_max_health: int = 0  # healing, percent of the max health
+    generation: int = 0  # class resource generated, for example holy power or rage
+    resource_cost: int = 0  # class resource needed to cast the spell
+
+
+# ---------------------------------------------------------------------------- #
+class SpecDefinition(NamedTuple):
+    """
+    A single spec - where its hero class lives, the stats applied to its heroes and the numbers of its spells.
+    Stats which are not given keep the defaults of IBaseHero.
+    """
+
+    key: tuple[str, str]
+    module: str
+    class_name: str
+    stats: dict[str, int]
+    spells: dict[str, SpellDefinition]
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def load_spec_definitions(path: str = DEFAULT_SPEC_PATH) -> dict[tuple[str, str], SpecDefinition]:
+    """
+    Load the spec definitions of a data file, from its compiled cache when the file did not change.
+    The definitions are loaded once per process and path.
+
+    Args:
+        path (str): path of the JSON data file
+
+    Raises:
+        ValueError: if the data file is not valid
+
+    Returns:
+        dict[tuple[str, str], SpecDefinition]: definitions by (class, role) key, in file order
+    """
+    specs = _loaded.get(path)
+    if specs is None:
+        specs = _loaded[path] = _build_specs(_load_compiled(path))
+
+    return specs
+
+
+# ---------------------------------------------------------------------------- #
+def get_class_spec(hero_cls: type) -> SpecDefinition | None:
+    """
+    Get the definition of the spec implemented by a hero class.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+
+    Returns:
+        SpecDefinition | None: definition of the spec or None for classes of no spec, like the class mixins
+    """
+    for spec in load_spec_definitions().values():
+        if spec.class_name == hero_cls.__name__ and spec.module == hero_cls.__module__:
+            return spec
+
+    return None
+
+
+# ---------------------------------------------------------------------------- #
+def compile_spec_definitions(data: object) -> dict[str, tuple]:
+    """
+    Validate the content of a data file and compile it into plain tuples, which marshal can store.
+
+    Args:
+        data (object): parsed JSON of the data file
+
+    Raises:
+        ValueError: if a spec, stat or spell is not valid
+
+    Returns:
+        dict[str, tuple]: module, class name, stats and spell fields by "class:role" key
+    """
+    if not isinstance(data, dict) or not data:
+        raise ValueError("The spec definitions must be a non-empty object of specs")
+
+    compiled = {}
+    for spec_name, spec in data.items():
+        hero_class, separator, hero_role = spec_name.partition(":")
+        if not separator or not hero_class or not hero_role or spec_name != spec_name.lower():
+            raise ValueError(f"The spec must be given as lowercase class:role - {spec_name}")
+        if not isinstance(spec, dict) or set(spec) != {"module", "class", "stats", "spells"}:
+            raise ValueError(f"{spec_name} must have exactly a module, class, stats and spells")
+        if not isinstance(spec["module"], str) or not isinstance(spec["class"], str):
+            raise ValueError(f"The module and class of {spec_name} must be names")
+
+        stats = _validate_numbers(spec_name, spec["stats"], HERO_STATS)
+        if not isinstance(spec["spells"], dict):
+            raise ValueError(f"The spells of {spec_name} must be an object")
+        spells = {}
+        for spell_name, fields in spec["spells"].items():
+            if not spell_name.startswith("cast_"):
+                raise ValueError(f"The spells of {spec_name} must start with cast_ - {spell_name}")
+            numbers = _validate_numbers(f"{spec_name} {spell_name}", fields, SpellDefinition._fields)
+            spells[spell_name] = tuple(SpellDefinition(**numbers))
+
+        compiled[spec_name] = (spec["module"], spec["class"], tuple(stats.items()), spells)
+
+    return compiled
+
+
+# ---------------------------------------------------------------------------- #
+def _validate_numbers(owner: str, numbers: object, names: tuple[str, ...]) -> dict[str, int]:
+    if not isinstance(numbers, dict):
+        raise ValueError(f"The numbers of {owner} must be an object")
+    for name, value in numbers.items():
+        if name not in names:
+            raise ValueError(f"Unknown field of {owner}: {name}")
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"{owner} {name} must be a non-negative integer: {value}")
+
+    return numbers
+
+
+# ---------------------------------------------------------------------------- #
+def _get_cache_path(path: str) -> str:
+    directory, file_name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, "__pycache__", f"{os.path.splitext(file_name)[0]}.marshal")
+
+
+# ---------------------------------------------------------------------------- #
+def _load_compiled(path: str) -> dict[str, tuple]:
+    file_stat = os.stat(path)
+    cache_path = _get_cache_path(path)
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cache_format, mtime_ns, size, digest, compiled = marshal.loads(cache_file.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        cache_format = None
+
+    if cache_format == CACHE_FORMAT and (mtime_ns, size) == (file_stat.st_mtime_ns, file_stat.st_size):
+        return compiled
+
+    with open(path, "rb") as data_file:
+        content = data_file.read()
+    new_digest = hashlib.sha256(content).hexdigest()
+    # A touched file with the same content keeps its compiled definitions, only the key is renewed
+    if cache_format != CACHE_FORMAT or digest != new_digest:
+        try:
+            compiled = compile_spec_definitions(json.loads(content))
+        except json.JSONDecodeError as error:
+            raise ValueError(f"The spec definitions in {path} are not valid JSON: {error}") from error
+
+    _write_cache(
+        cache_path, (CACHE_FORMAT, file_stat.st_mtime_ns, file_stat.st_size, new_digest, compiled)
+    )
+    return compiled
+
+
+# ---------------------------------------------------------------------------- #
+def _write_cache(cache_path: str, entry: tuple) -> None:
+    # The cache only speeds up the start, so a read-only install works without it
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temporary_path, "wb") as cache_file:
+            cache_file.write(marshal.dumps(entry))
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        pass
+
+
+# ---------------------------------------------------------------------------- #
+def _build_specs(compiled: dict[str, tuple]) -> dict[tuple[str, str], SpecDefinition]:
+    specs = {}
+    for spec_name, (module, class_name, stats, spells) in compiled.items():
+        hero_class, _, hero_role = spec_name.partition(":")
+        key = (hero_class, hero_role)
+        specs[key] = SpecDefinition(
+            key,
+            module,
+            class_name,
+            dict(stats),
+            {spell_name: SpellDefinition(*fields) for spell_name, fields in spells.items()},
+        )
+
+    return specs
@@ -0,0 +1,529 @@
+"""
+Streaming battle analytics - damage and healing per turn (DPS and HPS), time to kill of every spec and
+damage and resource efficiency of every spell. The analytics listen to the event bus of the simulated duels
+and keep only running moments and quantile sketches, so the memory stays the same for any amount of battles.
+Aggregates of parallel workers are merged into one, with the same result as a single aggregate of all battles
+up to the relative accuracy of the sketches.
+"""
+
+import json
+import math
+from typing import TYPE_CHECKING, Any
+
+from battles_handler import (
+    CastEvent,
+    DamageEvent,
+    EventBus,
+    HealEvent,
+    ResourceGainEvent,
+    ResourceSpendEvent,
+)
+
+if TYPE_CHECKING:
+    from Heroes.hero_base_stats import IBaseHero
+    from Simulations.simulation_handler import BattleResult
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+REPORTED_QUANTILES = (0.5, 0.95, 0.99)
+
+
+# ---------------------------------------------------------------------------- #
+#                                  Statistics                                  #
+# ---------------------------------------------------------------------------- #
+class RunningMoments:
+    """
+    Count, sum, mean, variance, min and max of a stream of values, updated with Welford's algorithm.
+    """
+
+    __slots__ = ("count", "total", "mean", "_m2", "minimum", "maximum")
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def variance(self) -> float:
+        """
+        Population variance of the values.
+        """
+        return self._m2 / self.count if self.count else 0.0
+
+    # ------------------------------------------------------------------------ #
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    # ------------------------------------------------------------------------ #
+    def merge(self, other: "RunningMoments") -> None:
+        """
+        Add the values of another aggregate, with the parallel variant of the algorithm.
+        """
+        if not other.count:
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+# ---------------------------------------------------------------------------- #
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy (DDSketch). Positive values are counted in buckets
+    with logarithmic bounds, bucket i holds the values in (gamma^(i-1), gamma^i], so every quantile is
+    estimated within the relative accuracy. With more buckets than the limit, the lowest buckets are
+    collapsed into one, which only affects the accuracy of the lowest quantiles.
+    """
+
+    __slots__ = ("_gamma", "_log_gamma", "_max_buckets", "_buckets", "_zeros", "count")
+
+    # ------------------------------------------------------------------------ #
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ) -> None:
+        """
+        Args:
+            relative_accuracy (float): relative error of the estimated quantiles, between 0 and 1
+            max_buckets (int): limit of the amount of buckets, which bounds the memory of the sketch
+
+        Raises:
+            ValueError: if the relative accuracy is not between 0 and 1 or the limit is not positive
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"The relative accuracy must be between 0 and 1: {relative_accuracy}")
+        if max_buckets < 1:
+            raise ValueError(f"The bucket limit must be positive: {max_buckets}")
+
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_buckets = max_buckets
+        self._buckets: dict[int, int] = {}
+        self._zeros = 0
+        self.count = 0
+
+    # ------------------------------------------------------------------------ #
+    def add(self, value: float) -> None:
+        """
+        Add a value to the sketch.
+
+        Raises:
+            ValueError: if the value is negative
+        """
+        if value > 0:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            buckets = self._buckets
+            buckets[index] = buckets.get(index, 0) + 1
+            if len(buckets) > self._max_buckets:
+                self._collapse()
+        elif value == 0:
+            self._zeros += 1
+        else:
+            raise ValueError(f"The sketch holds no negative values: {value}")
+        self.count += 1
+
+    # ------------------------------------------------------------------------ #
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Add the values of another sketch with the same relative accuracy.
+
+        Raises:
+            ValueError: if the sketches have a different relative accuracy
+        """
+        if other._gamma != self._gamma:
+            raise ValueError("Only sketches with the same relative accuracy can be merged")
+
+        buckets = self._buckets
+        for index, count in other._buckets.items():
+            buckets[index] = buckets.get(index, 0) + count
+        self._zeros += other._zeros
+        self.count += other.count
+        if len(buckets) > self._max_buckets:
+            self._collapse()
+
+    # ------------------------------------------------------------------------ #
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile of the values.
+
+        Args:
+            q (float): the quantile, between 0 and 1, for example 0.95
+
+        Raises:
+            ValueError: if the quantile is not between 0 and 1
+
+        Returns:
+            float: estimated value of the quantile, 0 for an empty sketch
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"The quantile must be between 0 and 1: {q}")
+        if not self.count:
+            return 0.0
+
+        rank = q * (self.count - 1)
+        seen = self._zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen > rank:
+                return 2 * self._gamma**index / (self._gamma + 1)
+
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+    # ------------------------------------------------------------------------ #
+    def _collapse(self) -> None:
+        buckets = self._buckets
+        indices = sorted(buckets)
+        excess = len(indices) - self._max_buckets
+        target = indices[excess]
+        for index in indices[:excess]:
+            buckets[target] += buckets.pop(index)
+
+
+# ---------------------------------------------------------------------------- #
+class Distribution:
+    """
+    Running moments and a quantile sketch of the same stream of values.
+    """
+
+    __slots__ = ("moments", "sketch")
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self) -> None:
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch()
+
+    # ------------------------------------------------------------------------ #
+    def add(self, value: float) -> None:
+        self.moments.add(value)
+        self.sketch.add(value)
+
+    # ------------------------------------------------------------------------ #
+    def merge(self, other: "Distribution") -> None:
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+
+    # ------------------------------------------------------------------------ #
+    def summary(self) -> dict[str, float]:
+        """
+        Count, mean, standard deviation, min, max and the reported quantiles of the values.
+        """
+        moments = self.moments
+        summary = {
+            "count": moments.count,
+            "mean": moments.mean,
+            "std": math.sqrt(moments.variance),
+            "min": moments.minimum if moments.count else 0.0,
+            "max": moments.maximum if moments.count else 0.0,
+        }
+        for q in REPORTED_QUANTILES:
+            summary[f"p{round(q * 100)}"] = self.sketch.quantile(q)
+        return summary
+
+
+# ---------------------------------------------------------------------------- #
+#                                  Aggregates                                  #
+# ---------------------------------------------------------------------------- #
+class SpellStats:
+    """
+    Casts of a spell, the damage of its hits - including its damage over time ticks - the healing
+    of its heals and the pool spent on it.
+    """
+
+    __slots__ = ("casts", "pool_spent", "damage", "healing")
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self) -> None:
+        self.casts = 0
+        self.pool_spent = 0
+        self.damage = Distribution()
+        self.healing = Distribution()
+
+    # ------------------------------------------------------------------------ #
+    def merge(self, other: "SpellStats") -> None:
+        self.casts += other.casts
+        self.pool_spent += other.pool_spent
+        self.damage.merge(other.damage)
+        self.healing.merge(other.healing)
+
+
+# ---------------------------------------------------------------------------- #
+class SpecStats:
+    """
+    Damage and healing per turn of every battle of a spec, the turns of the battles it won
+    and the class resource it generated and spent.
+    """
+
+    __slots__ = ("battles", "dps", "hps", "time_to_kill", "resource_gained", "resource_spent")
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self) -> None:
+        self.battles = 0
+        self.dps = Distribution()
+        self.hps = Distribution()
+        self.time_to_kill = Distribution()
+        self.resource_gained = 0
+        self.resource_spent = 0
+
+    # ------------------------------------------------------------------------ #
+    def merge(self, other: "SpecStats") -> None:
+        self.battles += other.battles
+        self.dps.merge(other.dps)
+        self.hps.merge(other.hps)
+        self.time_to_kill.merge(other.time_to_kill)
+        self.resource_gained += other.resource_gained
+        self.resource_spent += other.resource_spent
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class BattleAnalytics:
+    """
+    Streaming aggregate of simulated duels, fed by the events of an event bus.
+    Every duel is framed by begin_duel and end_duel. The event bus and the heroes of a duel are only
+    held between the two, so a finished aggregate can be pickled and sent back from a worker process.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self) -> None:
+        self._specs: dict[tuple[str, str], SpecStats] = {}
+        self._spells: dict[tuple[tuple[str, str], str], SpellStats] = {}
+        self._event_bus: EventBus | None = None
+        self._sides: dict["IBaseHero", int] = {}
+        self._hero_keys: list[tuple[str, str]] = []
+        self._damage = [0, 0]
+        self._healing = [0, 0]
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def specs(self) -> dict[tuple[str, str], SpecStats]:
+        """
+        Statistics of every spec, by hero key. Must not be modified.
+        """
+        return self._specs
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def spells(self) -> dict[tuple[tuple[str, str], str], SpellStats]:
+        """
+        Statistics of every spell, by hero key and spell name. Must not be modified.
+        """
+        return self._spells
+
+    # ------------------------------------------------------------------------ #
+    def begin_duel(
+        self,
+        event_bus: EventBus,
+        attacker_key: tuple[str, str],
+        defender_key: tuple[str, str],
+        attacker: "IBaseHero",
+        defender: "IBaseHero",
+    ) -> None:
+        """
+        Start listening to the events of a duel.
+
+        Args:
+            event_bus (EventBus): bus to which the heroes of the duel publish
+            attacker_key (tuple[str, str]): key of the attacker in the hero registry
+            defender_key (tuple[str, str]): key of the defender in the hero registry
+            attacker (IBaseHero): hero which casts first in every turn
+            defender (IBaseHero): hero which casts second
+        """
+        if self._event_bus is not event_bus:
+            self._unsubscribe()
+            event_bus.subscribe(CastEvent, self._on_casts)
+            event_bus.subscribe(DamageEvent, self._on_damage)
+            event_bus.subscribe(HealEvent, self._on_healing)
+            event_bus.subscribe(ResourceGainEvent, self._on_resource_gain)
+            event_bus.subscribe(ResourceSpendEvent, self._on_resource_spend)
+            self._event_bus = event_bus
+
+        self._sides = {attacker: 0, defender: 1}
+        self._hero_keys = [attacker_key, defender_key]
+        self._damage = [0, 0]
+        self._healing = [0, 0]
+
+    # ------------------------------------------------------------------------ #
+    def end_duel(self, result: "BattleResult") -> None:
+        """
+        Add the damage and healing per turn of both heroes and the time to kill of the winner,
+        then stop listening to the event bus. The events of the duel must have been flushed.
+
+        Args:
+            result (BattleResult): outcome of the duel
+        """
+        turns = max(result.turns, 1)
+        for side, hero_key in enumerate(self._hero_keys):
+            spec = self._get_spec(hero_key)
+            spec.battles += 1
+            spec.dps.add(self._damage[side] / turns)
+            spec.hps.add(self._healing[side] / turns)
+
+        if result.winner is not None:
+            winner_side = 0 if result.winner == "attacker" else 1
+            self._get_spec(self._hero_keys[winner_side]).time_to_kill.add(result.turns)
+
+        self._unsubscribe()
+        self._sides = {}
+        self._hero_keys = []
+
+    # ------------------------------------------------------------------------ #
+    def merge(self, other: "BattleAnalytics") -> None:
+        """
+        Add the battles of another aggregate, for example of a worker process.
+        """
+        for hero_key, spec in other._specs.items():
+            self._get_spec(hero_key).merge(spec)
+        for spell_key, spell in other._spells.items():
+            self._get_spell(*spell_key).merge(spell)
+
+    # ------------------------------------------------------------------------ #
+    def report(self) -> dict[str, Any]:
+        """
+        Build a JSON ready report of all specs and spells. The damage and healing per pool point of a spell
+        are its whole damage and healing, divided by the pool spent on its casts.
+
+        Returns:
+            dict[str, Any]: statistics of every spec and of every spell by spec, keyed by "class:role"
+        """
+        specs = {}
+        for hero_key, spec in sorted(self._specs.items()):
+            specs[":".join(hero_key)] = {
+                "battles": spec.battles,
+                "dps": spec.dps.summary(),
+                "hps": spec.hps.summary(),
+                "time_to_kill": spec.time_to_kill.summary(),
+                "resource_gained": spec.resource_gained,
+                "resource_spent": spec.resource_spent,
+            }
+
+        spells: dict[str, dict[str, Any]] = {}
+        for (hero_key, spell_name), spell in sorted(self._spells.items()):
+            damage = spell.damage.moments.total
+            healing = spell.healing.moments.total
+            spells.setdefault(":".join(hero_key), {})[spell_name] = {
+                "casts": spell.casts,
+                "damage": damage,
+                "hits": spell.damage.summary(),
+                "healing": healing,
+                "heals": spell.healing.summary(),
+                "pool_spent": spell.pool_spent,
+                "damage_per_pool": damage / spell.pool_spent if spell.pool_spent else None,
+                "healing_per_pool": healing / spell.pool_spent if spell.pool_spent else None,
+            }
+
+        return {"specs": specs, "spells": spells}
+
+    # ------------------------------------------------------------------------ #
+    def _get_spec(self, hero_key: tuple[str, str]) -> SpecStats:
+        spec = self._specs.get(hero_key)
+        if spec is None:
+            spec = self._specs[hero_key] = SpecStats()
+        return spec
+
+    # ------------------------------------------------------------------------ #
+    def _get_spell(self, hero_key: tuple[str, str], spell_name: str) -> SpellStats:
+        key = (hero_key, spell_name)
+        spell = self._spells.get(key)
+        if spell is None:
+            spell = self._spells[key] = SpellStats()
+        return spell
+
+    # ------------------------------------------------------------------------ #
+    def _unsubscribe(self) -> None:
+        event_bus = self._event_bus
+        if event_bus is None:
+            return
+
+        event_bus.unsubscribe(CastEvent, self._on_casts)
+        event_bus.unsubscribe(DamageEvent, self._on_damage)
+        event_bus.unsubscribe(HealEvent, self._on_healing)
+        event_bus.unsubscribe(ResourceGainEvent, self._on_resource_gain)
+        event_bus.unsubscribe(ResourceSpendEvent, self._on_resource_spend)
+        self._event_bus = None
+
+    # ------------------------------------------------------------------------ #
+    def _on_casts(self, turn: int, events: list[CastEvent]) -> None:
+        for event in events:
+            side = self._sides.get(event.attacker)
+            if side is None:
+                continue
+            spell = self._get_spell(self._hero_keys[side], event.spell_name)
+            spell.casts += 1
+            if event.result is not None:
+                spell.pool_spent += event.result.spell_cost
+
+    # ------------------------------------------------------------------------ #
+    def _on_damage(self, turn: int, events: list[DamageEvent]) -> None:
+        for event in events:
+            side = self._sides.get(event.attacker)
+            if side is None:
+                continue
+            # Damage over time ticks are named after their effect, so they are added to the spell of the effect
+            spell_name = event.spell_name
+            if not spell_name.startswith("cast_"):
+                spell_name = "cast_" + spell_name
+            self._get_spell(self._hero_keys[side], spell_name).damage.add(event.damage_taken)
+            self._damage[side] += event.damage_taken
+
+    # ------------------------------------------------------------------------ #
+    def _on_healing(self, turn: int, events: list[HealEvent]) -> None:
+        for event in events:
+            side = self._sides.get(event.hero)
+            if side is None:
+                continue
+            self._healing[side] += event.amount
+            if event.spell_name is not None:
+                self._get_spell(self._hero_keys[side], event.spell_name).healing.add(event.amount)
+
+    # ------------------------------------------------------------------------ #
+    def _on_resource_gain(self, turn: int, events: list[ResourceGainEvent]) -> None:
+        for event in events:
+            side = self._sides.get(event.hero)
+            if side is not None:
+                self._get_spec(self._hero_keys[side]).resource_gained += event.amount
+
+    # ------------------------------------------------------------------------ #
+    def _on_resource_spend(self, turn: int, events: list[ResourceSpendEvent]) -> None:
+        for event in events:
+            side = self._sides.get(event.hero)
+            if side is not None:
+                self._get_spec(self._hero_keys[side]).resource_spent += event.amount
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Output                                    #
+# ---------------------------------------------------------------------------- #
+def write_analytics_json(analytics: BattleAnalytics, path: str) -> None:
+    """
+    Write the report of the battle analytics as JSON.
+
+    Args:
+        analytics (BattleAnalytics): aggregate of the simulated duels
+        path (str): path of the output file
+    """
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump(analytics.report(), json_file, indent=2)
@@ -0,0 +1,260 @@
+"""
+Matchup matrix runner, which simulates duels for every pairing of the hero registry.
+The cells are split into chunks of duels and fanned out over a process pool, so the run scales with the
+available cores. Only the hero keys go to the workers and only the aggregated counters come back,
+optionally with the streaming battle analytics of the chunk, which are merged into one.
+"""
+
+import csv
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from Heroes.hero_factory import HeroFactory
+from Simulations.analytics_handler import BattleAnalytics
+from Simulations.simulation_handler import (
+    ATTACKER,
+    DEFAULT_MAX_TURNS,
+    DEFENDER,
+    BattleSimulator,
+    RandomPolicy,
+    RotationPolicy,
+)
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_CHUNK_SIZE = 1000
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class MatrixCell(NamedTuple):
+    """
+    Aggregated outcome of all duels between one attacker and one defender.
+    The win rate is from the point of view of the attacker and the time to kill is the average
+    amount of turns of the duels which had a winner. The wall time is the time the workers spent on the cell.
+    """
+
+    attacker: str
+    defender: str
+    battles: int
+    attacker_wins: int
+    defender_wins: int
+    draws: int
+    win_rate: float
+    time_to_kill: float
+    wall_time: float
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Workers                                   #
+# ---------------------------------------------------------------------------- #
+def _run_chunk(
+    task: tuple[int, tuple[str, str], tuple[str, str], int, str, int, int, bool]
+) -> tuple[int, int, int, int, int, float, BattleAnalytics | None]:
+    """
+    Run a chunk of duels of a single cell. Executed inside the worker processes.
+
+    Args:
+        task (tuple): cell index, attacker key, defender key, amount of duels, policy, seed, turn limit
+            and whether to collect battle analytics
+
+    Returns:
+        tuple: cell index, attacker wins, defender wins, draws, turns of the won duels, wall time
+        and the battle analytics of the chunk or None
+    """
+    cell_index, attacker_key, defender_key, battles, policy, seed, max_turns, with_analytics = task
+    start = time.perf_counter()
+
+    if policy == "random":
+        attacker_policy = RandomPolicy(seed)
+        defender_policy = RandomPolicy(seed + 1)
+    else:
+        attacker_policy = RotationPolicy()
+        defender_policy = RotationPolicy()
+
+    analytics = BattleAnalytics() if with_analytics else None
+    simulator = BattleSimulator(
+        attacker_key, defender_key, attacker_policy, defender_policy, max_turns, analytics=analytics
+    )
+    counters = {ATTACKER: 0, DEFENDER: 0, None: 0}
+    kill_turns = 0
+    for result in simulator.simulate(battles):
+        counters[result.winner] += 1
+        if result.winner is not None:
+            kill_turns += result.turns
+
+    return (
+        cell_index,
+        counters[ATTACKER],
+        counters[DEFENDER],
+        counters[None],
+        kill_turns,
+        time.perf_counter() - start,
+        analytics,
+    )
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class MatchupMatrix:
+    """
+    Runs the same amount of duels for every attacker and defender pairing in the hero registry.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(
+        self,
+        battles_per_cell: int,
+        workers: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        policy: str = "random",
+        seed: int | None = None,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        analytics: bool = False,
+    ) -> None:
+        """
+        Args:
+            battles_per_cell (int): amount of duels of every pairing
+            workers (int | None): amount of worker processes, the number of CPUs by default
+            chunk_size (int): amount of duels sent to a worker at once
+            policy (str): "random" or "rotation"
+            seed (int | None): seed of the random policies
+            max_turns (int): turn limit of every duel
+            analytics (bool): collect battle analytics of all duels into `analytics`
+        """
+        self._battles_per_cell = battles_per_cell
+        self._workers = workers or os.cpu_count() or 1
+        self._chunk_size = max(1, chunk_size)
+        self._policy = policy
+        self._seed = seed
+        self._max_turns = max_turns
+        self._hero_keys = list(HeroFactory._hero_registry)
+        self._with_analytics = analytics
+        self.analytics: BattleAnalytics | None = None
+
+    # ------------------------------------------------------------------------ #
+    def _build_tasks(self) -> list[tuple]:
+        rng = random.Random(self._seed)
+        tasks = []
+        cell_index = 0
+        for attacker_key in self._hero_keys:
+            for defender_key in self._hero_keys:
+                remaining = self._battles_per_cell
+                while remaining > 0:
+                    battles = min(self._chunk_size, remaining)
+                    tasks.append(
+                        (
+                            cell_index,
+                            attacker_key,
+                            defender_key,
+                            battles,
+                            self._policy,
+                            rng.getrandbits(32),
+                            self._max_turns,
+                            self._with_analytics,
+                        )
+                    )
+                    remaining -= battles
+                cell_index += 1
+
+        return tasks
+
+    # ------------------------------------------------------------------------ #
+    def run(self) -> list[MatrixCell]:
+        """
+        Simulate all cells of the matrix.
+
+        Returns:
+            list[MatrixCell]: one cell per attacker and defender pairing, in registry order
+        """
+        tasks = self._build_tasks()
+        totals = [[0, 0, 0, 0, 0.0] for _ in range(len(self._hero_keys) ** 2)]
+        self.analytics = BattleAnalytics() if self._with_analytics else None
+
+        if self._workers == 1:
+            chunk_results = map(_run_chunk, tasks)
+            self._accumulate(totals, chunk_results)
+        else:
+            # Several chunks per submission keep the inter process round trips low
+            map_chunksize = max(1, len(tasks) // (self._workers * 4))
+            with ProcessPoolExecutor(max_workers=self._workers) as executor:
+                chunk_results = executor.map(_run_chunk, tasks, chunksize=map_chunksize)
+                self._accumulate(totals, chunk_results)
+
+        cells = []
+        cell_index = 0
+        for attacker_key in self._hero_keys:
+            for defender_key in self._hero_keys:
+                attacker_wins, defender_wins, draws, kill_turns, wall_time = totals[cell_index]
+                decided = attacker_wins + defender_wins
+                cells.append(
+                    MatrixCell(
+                        ":".join(attacker_key),
+                        ":".join(defender_key),
+                        self._battles_per_cell,
+                        attacker_wins,
+                        defender_wins,
+                        draws,
+                        attacker_wins / self._battles_per_cell if self._battles_per_cell else 0.0,
+                        kill_turns / decided if decided else 0.0,
+                        wall_time,
+                    )
+                )
+                cell_index += 1
+
+        return cells
+
+    # ------------------------------------------------------------------------ #
+    def _accumulate(self, totals: list[list], chunk_results) -> None:
+        for (
+            cell_index,
+            attacker_wins,
+            defender_wins,
+            draws,
+            kill_turns,
+            wall_time,
+            analytics,
+        ) in chunk_results:
+            if analytics is not None:
+                self.analytics.merge(analytics)
+            cell_totals = totals[cell_index]
+            cell_totals[0] += attacker_wins
+            cell_totals[1] += defender_wins
+            cell_totals[2] += draws
+            cell_totals[3] += kill_turns
+            cell_totals[4] += wall_time
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Output                                    #
+# ---------------------------------------------------------------------------- #
+def write_matrix_csv(cells: list[MatrixCell], path: str) -> None:
+    """
+    Write the matrix as a CSV table, one row per cell.
+
+    Args:
+        cells (list[MatrixCell]): cells of the matrix
+        path (str): path of the output file
+    """
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(MatrixCell._fields)
+        writer.writerows(cells)
+
+
+# ---------------------------------------------------------------------------- #
+def write_matrix_json(cells: list[MatrixCell], path: str) -> None:
+    """
+    Write the matrix as a JSON list, one object per cell.
+
+    Args:
+        cells (list[MatrixCell]): cells of the matrix
+        path (str): path of the output file
+    """
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump([cell._asdict() for cell in cells], json_file, indent=2)
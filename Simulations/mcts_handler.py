@@ -0,0 +1,411 @@
+"""
+Computer opponent, which chooses its spells with a Monte Carlo tree search.
+The tree grows with random rollouts of the rest of the duel, played on the compact duel model of the minimax
+opponent. A position of the model is an immutable tuple, so a rollout starts from the position of its tree node
+without copying any hero state, and spells which return None without enough class resource (Final Verdict,
+Shield Block, Rampage, ...) simply spend the turn, like in a battle.
+With several workers the search is root parallel - every worker process grows its own tree from the same position
+for the whole time budget, and the visits of the first moves of all trees are added up.
+"""
+
+import asyncio
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from effects_handler import EffectScheduler
+from Heroes.hero_base_stats import IBaseHero
+from Simulations.minimax_handler import HEALTH_SCORE, DuelModel
+from Simulations.simulation_handler import ISpellPolicy
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_TIME_BUDGET = 0.2  # seconds per move
+DEFAULT_EXPLORATION = 1.4
+DEFAULT_ROLLOUT_DEPTH = 200  # plies, after which a rollout is scored by the health of the heroes
+WORKER_MODEL_CACHE_SIZE = 256  # duel models kept by every worker process
+_NO_SPELL = -1
+
+# Models of the duels searched by this worker process, by duel id
+_worker_models: dict[int, DuelModel] = {}
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class _Node:
+    """
+    Node of the search tree. The score is the sum of the rollout results from the point of view
+    of the hero, for which the search plays - 1 for a win, 0 for a loss.
+    """
+
+    __slots__ = ("position", "children", "untried", "visits", "score")
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, position: tuple | int, spell_ids: tuple[int, ...]) -> None:
+        self.position = position
+        self.children: dict[int, _Node] = {}
+        self.untried = list(spell_ids)
+        self.visits = 0
+        self.score = 0.0
+
+
+# ---------------------------------------------------------------------------- #
+class MonteCarloSearch:
+    """
+    Monte Carlo tree search with UCB1 selection on a duel model, for one of its heroes.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(
+        self,
+        model: DuelModel,
+        side: int,
+        seed: int | None = None,
+        exploration: float = DEFAULT_EXPLORATION,
+        rollout_depth: int = DEFAULT_ROLLOUT_DEPTH,
+    ) -> None:
+        """
+        Args:
+            model (DuelModel): model of the duel
+            side (int): hero for which the search plays, 0 for the attacker and 1 for the defender
+            seed (int | None): seed of the rollouts
+            exploration (float): weight of the exploration term of UCB1
+            rollout_depth (int): plies, after which a rollout is scored by the health of the heroes
+        """
+        self._model = model
+        self._side = side
+        self._rng = random.Random(seed)
+        self._exploration = exploration
+        self._rollout_depth = rollout_depth
+
+    # ------------------------------------------------------------------------ #
+    def run(
+        self, position: tuple, spell_ids: tuple[int, ...], time_budget: float
+    ) -> tuple[dict[int, tuple[int, float]], int]:
+        """
+        Grow a tree from the position, until the time budget is used up.
+
+        Args:
+            position (tuple): position in which the hero is to move
+            spell_ids (tuple[int, ...]): ids of the spells the hero can cast
+            time_budget (float): seconds the search may take
+
+        Returns:
+            tuple[dict[int, tuple[int, float]], int]: visits and summed score of every first move
+            and the amount of rollouts
+        """
+        root = _Node(position, spell_ids)
+        deadline = time.perf_counter() + time_budget
+        rollouts = 0
+        # At least one rollout per move, so every move has a score
+        while rollouts < len(spell_ids) or time.perf_counter() < deadline:
+            self._iterate(root)
+            rollouts += 1
+
+        stats = {spell_id: (child.visits, child.score) for spell_id, child in root.children.items()}
+        return stats, rollouts
+
+    # ------------------------------------------------------------------------ #
+    def _iterate(self, root: _Node) -> None:
+        model = self._model
+        node = root
+        path = [node]
+
+        # Selection - follow the best children of fully expanded nodes
+        while not node.untried and node.children:
+            node = self._select_child(node)
+            path.append(node)
+
+        # Expansion - add one untried move
+        if node.untried:
+            spell_id = node.untried.pop(self._rng.randrange(len(node.untried)))
+            child_position = model.play(node.position, spell_id)
+            child_spells = ()
+            if not isinstance(child_position, int):
+                child_spells = model.get_ready_spells(child_position) or (_NO_SPELL,)
+            child = _Node(child_position, child_spells)
+            node.children[spell_id] = child
+            node = child
+            path.append(node)
+
+        result = self._rollout(node.position)
+        for visited in path:
+            visited.visits += 1
+            visited.score += result
+
+    # ------------------------------------------------------------------------ #
+    def _select_child(self, node: _Node) -> _Node:
+        # The opponent of the searched hero picks the moves which are worst for it
+        maximizing = node.position[2] == self._side
+        log_visits = math.log(node.visits)
+        exploration = self._exploration
+        best_child = None
+        best_value = -math.inf
+        for child in node.children.values():
+            mean = child.score / child.visits
+            if not maximizing:
+                mean = 1.0 - mean
+            value = mean + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_value = value
+                best_child = child
+
+        return best_child
+
+    # ------------------------------------------------------------------------ #
+    def _rollout(self, position: tuple | int) -> float:
+        model = self._model
+        choice = self._rng.choice
+        for _ in range(self._rollout_depth):
+            if isinstance(position, int):
+                return 1.0 if position == self._side else 0.0
+            position = model.play(position, choice(model.get_ready_spells(position) or (_NO_SPELL,)))
+
+        if isinstance(position, int):
+            return 1.0 if position == self._side else 0.0
+        # Unfinished rollouts are scored by the health of the heroes, between 0 and 1
+        return 0.5 + model.evaluate(position, self._side) / (2 * HEALTH_SCORE)
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Workers                                   #
+# ---------------------------------------------------------------------------- #
+def _grow_tree(
+    task: tuple[int, DuelModel | None, int, tuple, tuple[int, ...], float, int]
+) -> tuple[dict[int, tuple[int, float]], int] | None:
+    """
+    Grow a search tree of a single worker. Executed inside the worker processes.
+    The model of a duel is sent with the first move of the duel and kept by the worker, the later moves
+    only send the id of the duel.
+
+    Args:
+        task (tuple): duel id, duel model or None if the worker should have it, searched side, position,
+            ready spell ids, time budget and seed
+
+    Returns:
+        tuple | None: visits and summed score of every first move and the amount of rollouts,
+        None if the model was not sent and the worker does not have it
+    """
+    duel_id, model, side, position, spell_ids, time_budget, seed = task
+    if model is None:
+        model = _worker_models.pop(duel_id, None)
+        if model is None:
+            return None
+    elif len(_worker_models) >= WORKER_MODEL_CACHE_SIZE:
+        # The models are kept in the order of their last use, so the oldest duel is dropped
+        del _worker_models[next(iter(_worker_models))]
+    _worker_models[duel_id] = model
+
+    return MonteCarloSearch(model, side, seed).run(position, spell_ids, time_budget)
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Policies                                   #
+# ---------------------------------------------------------------------------- #
+class MonteCarloPolicy(ISpellPolicy):
+    """
+    Selects the spells of a hero with a Monte Carlo tree search, which takes the given wall clock time
+    per move. The spell with the most visits over the trees of all workers is cast.
+    The worker processes are started with the first move and stay until `close`.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(
+        self,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        workers: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Args:
+            time_budget (float): seconds, which the search of a move may take, 0.2 by default
+            workers (int | None): amount of worker processes, the number of CPUs by default.
+                With 1 worker the search runs in the calling process.
+            seed (int | None): seed of the rollouts
+        """
+        self._time_budget = time_budget
+        self._workers = workers or os.cpu_count() or 1
+        self._rng = random.Random(seed)
+        self._executor: ProcessPoolExecutor | None = None
+        self._duels: dict[IBaseHero, tuple] = {}
+        self._duel_ids = itertools.count()
+        # Duels, whose model was already sent to the workers
+        self._sent_models: set[int] = set()
+        self._rollouts = 0
+        self._search_time = 0.0
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def rollouts(self) -> int:
+        """
+        Amount of rollouts of all moves so far.
+        """
+        return self._rollouts
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def rollouts_per_second(self) -> float:
+        """
+        Rollouts of all workers per second of search, over all moves so far.
+        """
+        return self._rollouts / self._search_time if self._search_time else 0.0
+
+    # ------------------------------------------------------------------------ #
+    def begin_duel(
+        self,
+        hero: IBaseHero,
+        opponent: IBaseHero,
+        scheduler: EffectScheduler,
+        moves_first: bool,
+    ) -> None:
+        attacker, defender = (hero, opponent) if moves_first else (opponent, hero)
+        side = 0 if moves_first else 1
+        self._duels[hero] = (
+            DuelModel(attacker, defender), scheduler, attacker, defender, side, next(self._duel_ids)
+        )
+
+    # ------------------------------------------------------------------------ #
+    def end_duel(self, hero: IBaseHero) -> None:
+        duel = self._duels.pop(hero, None)
+        if duel is not None:
+            self._sent_models.discard(duel[5])
+
+    # ------------------------------------------------------------------------ #
+    def select_spell(self, hero: IBaseHero, spells: tuple[str, ...], turn: int) -> str:
+        """
+        Select the spell with the most visits. Without begin_duel the policy knows nothing about
+        the opponent, so it casts the first spell.
+
+        Args:
+            hero (IBaseHero): the hero which is casting
+            spells (tuple[str, ...]): names of all spells the hero can cast this turn
+            turn (int): current turn of the duel, starting from 0
+
+        Returns:
+            str: name of the selected spell
+        """
+        search = self._start_search(hero, spells)
+        if search is None:
+            return spells[0]
+
+        model, side, spell_ids, tasks = search
+        start = time.perf_counter()
+        if self._workers == 1:
+            trees = [MonteCarloSearch(model, side, tasks[0][6]).run(*tasks[0][3:6])]
+        else:
+            executor = self._get_executor()
+            trees = list(executor.map(_grow_tree, tasks))
+            missing = [
+                self._with_model(task, model) for task, tree in zip(tasks, trees) if tree is None
+            ]
+            trees += executor.map(_grow_tree, missing)
+        self._search_time += time.perf_counter() - start
+
+        return self._finish_search(model, side, spell_ids, trees)
+
+    # ------------------------------------------------------------------------ #
+    async def select_spell_async(self, hero: IBaseHero, spells: tuple[str, ...], turn: int) -> str:
+        """
+        Select the spell with the most visits, while the event loop keeps serving the other duels.
+        The trees grow in the worker processes, or with 1 worker in a worker thread.
+        """
+        search = self._start_search(hero, spells)
+        if search is None:
+            return spells[0]
+
+        model, side, spell_ids, tasks = search
+        start = time.perf_counter()
+        if self._workers == 1:
+            trees = [
+                await asyncio.to_thread(
+                    MonteCarloSearch(model, side, tasks[0][6]).run, *tasks[0][3:6]
+                )
+            ]
+        else:
+            executor = self._get_executor()
+            trees = await asyncio.gather(
+                *(asyncio.wrap_future(executor.submit(_grow_tree, task)) for task in tasks)
+            )
+            missing = [
+                self._with_model(task, model) for task, tree in zip(tasks, trees) if tree is None
+            ]
+            trees += await asyncio.gather(
+                *(asyncio.wrap_future(executor.submit(_grow_tree, task)) for task in missing)
+            )
+        self._search_time += time.perf_counter() - start
+
+        return self._finish_search(model, side, spell_ids, trees)
+
+    # ------------------------------------------------------------------------ #
+    def close(self) -> None:
+        """
+        Stop the worker processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._sent_models.clear()
+
+    # ------------------------------------------------------------------------ #
+    def _start_search(
+        self, hero: IBaseHero, spells: tuple[str, ...]
+    ) -> tuple[DuelModel, int, tuple[int, ...], list[tuple]] | None:
+        duel = self._duels.get(hero)
+        if duel is None or len(spells) == 1:
+            return None
+
+        model, scheduler, attacker, defender, side, duel_id = duel
+        position = model.get_position(scheduler, attacker, defender, side)
+        registry = type(hero).spell_registry
+        spell_ids = tuple(registry.get(spell).spell_id for spell in spells)
+
+        # The model is sent with the first move of the duel only, a worker without it asks for it again
+        sent_model = None if duel_id in self._sent_models else model
+        if self._workers > 1:
+            self._sent_models.add(duel_id)
+        tasks = [
+            (
+                duel_id,
+                sent_model,
+                side,
+                position,
+                spell_ids,
+                self._time_budget,
+                self._rng.getrandbits(32),
+            )
+            for _ in range(self._workers)
+        ]
+        return model, side, spell_ids, tasks
+
+    # ------------------------------------------------------------------------ #
+    def _finish_search(
+        self,
+        model: DuelModel,
+        side: int,
+        spell_ids: tuple[int, ...],
+        trees: list[tuple[dict[int, tuple[int, float]], int] | None],
+    ) -> str:
+        visits = dict.fromkeys(spell_ids, 0)
+        for tree in trees:
+            if tree is None:
+                continue
+            stats, rollouts = tree
+            self._rollouts += rollouts
+            for spell_id, (child_visits, _) in stats.items():
+                visits[spell_id] += child_visits
+
+        return model.spells[side][max(spell_ids, key=visits.__getitem__)].name
+
+    # ------------------------------------------------------------------------ #
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        return self._executor
+
+    # ------------------------------------------------------------------------ #
+    @staticmethod
+    def _with_model(task: tuple, model: DuelModel) -> tuple:
+        return (task[0], model, *task[2:])
@@ -0,0 +1,654 @@
+"""
+Computer opponent, which looks ahead with an alpha-beta search over the spells of both heroes.
+The search plays the duel on a compact model - health, pool, class resource, spell power, mitigation effects,
+remaining cooldowns and damage over time of both heroes - and casts every spell with the real spell methods
+of the specs, so the resource gating of every class follows the same rules as in a battle.
+Positions, which are reached by different orders of casts, are looked up in a transposition table.
+The search deepens one ply at a time, until the time budget of the move is used up, and plays the best
+move of the deepest finished search.
+"""
+
+import asyncio
+import math
+import time
+from typing import NamedTuple
+
+from effects_handler import EffectScheduler
+from Heroes.hero_base_stats import IBaseHero
+from Heroes.hero_factory import get_hero_slots
+from Heroes.hero_layout import get_hero_layout
+from mitigation_handler import ABSORB, FLAT, MITIGATION_KINDS, PERCENT
+from Simulations.simulation_handler import ISpellPolicy
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_TIME_BUDGET = 0.05  # seconds per move
+DEFAULT_MAX_DEPTH = 64  # plies, one ply is the cast of one hero
+MAX_TABLE_SIZE = 1 << 20
+WIN_SCORE = 1_000_000
+HEALTH_SCORE = 1000  # score of the whole health of a hero
+
+_EXACT = 0
+_LOWER_BOUND = 1
+_UPPER_BOUND = 2
+_NO_SPELL = -1
+# How many nodes are searched between two checks of the clock
+_CLOCK_INTERVAL = 255
+
+# Fields of the state of a hero
+_HEALTH = 0
+_SPELL_POWER = 3
+_MITIGATION = 4
+_COOLDOWNS = 5
+_DAMAGE_OVER_TIME = 6
+_BUFFS = 7
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class _TableEntry(NamedTuple):
+    depth: int
+    score: float
+    bound: int
+    spell_id: int
+
+
+# ---------------------------------------------------------------------------- #
+class _SearchTimeout(Exception):
+    pass
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class DuelModel:
+    """
+    Compact model of a duel, on which the search plays its moves.
+    A state of a hero is the tuple (health, pool, class resource, spell power, remaining turns and amount
+    of every mitigation effect, remaining cooldown of every spell, damage over time ticking on the hero,
+    remaining turns and amount of every spell power buff). A position is the tuple
+    (attacker state, defender state, hero to move), which is also its key in the transposition table.
+    Spells are cast on private copies of the heroes, so the heroes of the duel are never changed.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, attacker: IBaseHero, defender: IBaseHero) -> None:
+        """
+        Args:
+            attacker (IBaseHero): hero which casts first in every turn
+            defender (IBaseHero): hero which casts second
+        """
+        self._heroes = (self._copy_hero(attacker), self._copy_hero(defender))
+        self._layouts = tuple(get_hero_layout(type(hero)) for hero in self._heroes)
+        self._max_health = tuple(hero.max_health for hero in self._heroes)
+        self._damage_reduction = tuple(hero.damage_reduction for hero in self._heroes)
+        self._max_damage_reduction = tuple(hero.max_damage_reduction for hero in self._heroes)
+        self.spells = tuple(type(hero).spell_registry.entries for hero in self._heroes)
+        # Damage over time, which each hero places on its opponent
+        self._damage_over_time_spells = tuple(
+            tuple(
+                entry.spell_id
+                for entry in entries
+                if entry.definition.turns_active
+                and (entry.definition.damage_over_time or entry.definition.damage_over_time_initial)
+            )
+            for entries in self.spells
+        )
+        # Mitigation effects, which each hero places on itself
+        self._mitigation_spells = tuple(
+            tuple(
+                entry.spell_id
+                for entry in entries
+                if entry.name in MITIGATION_KINDS and entry.definition.turns_active
+            )
+            for entries in self.spells
+        )
+        self._mitigation_kinds = tuple(
+            tuple(MITIGATION_KINDS[entries[spell_id].name] for spell_id in spell_ids)
+            for entries, spell_ids in zip(self.spells, self._mitigation_spells)
+        )
+        # Buff effects, which each hero places on itself, and the index of each by the name of its spell
+        self._buff_effects = tuple(tuple(type(hero).buff_effects.items()) for hero in self._heroes)
+        self._buff_indexes = tuple(
+            {f"cast_{effect_name}": index for index, (effect_name, _) in enumerate(effects)}
+            for effects in self._buff_effects
+        )
+
+    # ------------------------------------------------------------------------ #
+    def get_position(
+        self, scheduler: EffectScheduler, attacker: IBaseHero, defender: IBaseHero, mover: int
+    ) -> tuple:
+        """
+        Read the position of a running duel.
+
+        Args:
+            scheduler (EffectScheduler): cooldowns and effects of the duel
+            attacker (IBaseHero): hero which casts first in every turn
+            defender (IBaseHero): hero which casts second
+            mover (int): 0 if the attacker casts next, 1 if the defender does
+
+        Returns:
+            tuple: the position
+        """
+        heroes = (attacker, defender)
+        states = []
+        for side, hero in enumerate(heroes):
+            layout = self._layouts[side]
+            opponent_spells = self.spells[1 - side]
+            ready_turns = scheduler.get_cooldown_ends(hero)
+            ticks = scheduler.get_damage_over_time(hero)
+            damage_over_time = []
+            for spell_id in self._damage_over_time_spells[1 - side]:
+                effect_name = opponent_spells[spell_id].name.removeprefix("cast_")
+                last_tick, damage = ticks.get(effect_name, (scheduler.turn, 0))
+                turns = last_tick - scheduler.turn
+                damage_over_time.append((turns, damage) if turns > 0 else (0, 0))
+
+            effects = scheduler.get_mitigation(hero).effects
+            mitigation = []
+            for spell_id in self._mitigation_spells[side]:
+                effect = effects.get(self.spells[side][spell_id].name.removeprefix("cast_"))
+                turns = effect.expiry - scheduler.turn if effect is not None else 0
+                mitigation.append((turns, effect.amount) if turns > 0 else (0, 0))
+
+            expiries = scheduler.get_effect_expiries(hero)
+            buffs = tuple(
+                (
+                    max(expiries.get(effect_name, scheduler.turn) - scheduler.turn, 0),
+                    getattr(hero, slot),
+                )
+                for effect_name, slot in self._buff_effects[side]
+            )
+
+            states.append(
+                (
+                    hero.get_current_health(),
+                    getattr(hero, layout.pool) if layout.pool is not None else 0,
+                    getattr(hero, layout.resource),
+                    hero.spell_power,
+                    tuple(mitigation),
+                    tuple(
+                        max(ready_turns.get(entry.name, 0) - scheduler.turn, 0)
+                        for entry in self.spells[side]
+                    ),
+                    tuple(damage_over_time),
+                    buffs,
+                )
+            )
+
+        return states[0], states[1], mover
+
+    # ------------------------------------------------------------------------ #
+    def get_ready_spells(self, position: tuple) -> tuple[int, ...]:
+        """
+        Get the ids of the spells, which the hero to move can cast.
+        """
+        cooldowns = position[position[2]][_COOLDOWNS]
+        return tuple(spell_id for spell_id, cooldown in enumerate(cooldowns) if not cooldown)
+
+    # ------------------------------------------------------------------------ #
+    def play(self, position: tuple, spell_id: int) -> tuple | int:
+        """
+        Cast a spell of the hero to move. After the defender, the turn ends - the cooldowns run down
+        and the damage over time ticks, like at the start of a turn in a battle.
+
+        Args:
+            position (tuple): position before the cast
+            spell_id (int): id of the spell, _NO_SPELL if the hero can not cast
+
+        Returns:
+            tuple | int: the next position or, if the duel is over, 0 if the attacker won
+            and 1 if the defender won
+        """
+        mover = position[2]
+        caster = position[mover]
+        target = position[1 - mover]
+        if spell_id != _NO_SPELL:
+            caster, target = self._cast(mover, caster, target, spell_id)
+
+        if mover == 0:
+            if target[_HEALTH] <= 0:
+                return 0
+            return caster, target, 1
+
+        attacker, defender = target, caster
+        if attacker[_HEALTH] <= 0:
+            return 1
+
+        attacker = self._end_turn(0, attacker)
+        defender = self._end_turn(1, defender)
+        if defender[_HEALTH] <= 0:
+            return 0
+        if attacker[_HEALTH] <= 0:
+            return 1
+
+        return attacker, defender, 0
+
+    # ------------------------------------------------------------------------ #
+    def evaluate(self, position: tuple, side: int) -> float:
+        """
+        Score a position for one of the heroes - the share of its own health minus the share of the opponent.
+        """
+        return HEALTH_SCORE * (
+            position[side][_HEALTH] / self._max_health[side]
+            - position[1 - side][_HEALTH] / self._max_health[1 - side]
+        )
+
+    # ------------------------------------------------------------------------ #
+    def _cast(self, mover: int, caster: tuple, target: tuple, spell_id: int) -> tuple[tuple, tuple]:
+        hero = self._heroes[mover]
+        layout = self._layouts[mover]
+        health, pool, resource, spell_power, mitigation, cooldowns, damage_over_time, buffs = caster
+        hero._curr_health = health
+        if layout.pool is not None:
+            setattr(hero, layout.pool, pool)
+        setattr(hero, layout.resource, resource)
+        hero.spell_power = spell_power
+        buff_effects = self._buff_effects[mover]
+        for (_, slot), (_, amount) in zip(buff_effects, buffs):
+            setattr(hero, slot, amount)
+
+        spell = self.spells[mover][spell_id]
+        dot_spells = self._damage_over_time_spells[mover]
+        if spell.takes_args:
+            # The only extra argument of a spell is the list of effects active on the target
+            active_effects = [
+                self.spells[mover][dot_spell].name.removeprefix("cast_")
+                for dot_spell, (turns, _) in zip(dot_spells, target[_DAMAGE_OVER_TIME])
+                if turns
+            ]
+            result = spell.method(hero, active_effects)
+        else:
+            result = spell.method(hero)
+
+        if result is not None:
+            if result.cooldown > 0:
+                cooldowns = cooldowns[:spell_id] + (result.cooldown,) + cooldowns[spell_id + 1 :]
+
+            if result.turns_active > 0 and result.damage_reduction > 0:
+                mitigation_spells = self._mitigation_spells[mover]
+                if spell_id in mitigation_spells:
+                    index = mitigation_spells.index(spell_id)
+                    mitigation = (
+                        mitigation[:index]
+                        + ((result.turns_active, result.damage_reduction),)
+                        + mitigation[index + 1 :]
+                    )
+
+            if result.spell_damage > 0 or (result.turns_active > 0 and result.damage_over_time > 0):
+                target_health = target[_HEALTH]
+                target_mitigation = target[_MITIGATION]
+                if result.spell_damage > 0:
+                    damage, target_mitigation = self._mitigate(
+                        1 - mover, target_mitigation, result.spell_damage
+                    )
+                    target_health -= damage
+                target_damage_over_time = target[_DAMAGE_OVER_TIME]
+                if result.turns_active > 0 and result.damage_over_time > 0:
+                    index = dot_spells.index(spell_id)
+                    target_damage_over_time = (
+                        target_damage_over_time[:index]
+                        + ((result.turns_active, result.damage_over_time),)
+                        + target_damage_over_time[index + 1 :]
+                    )
+                target = (
+                    target_health,
+                    *target[1:_MITIGATION],
+                    target_mitigation,
+                    target[_COOLDOWNS],
+                    target_damage_over_time,
+                    target[_BUFFS],
+                )
+
+        if buff_effects:
+            # Casting a buff starts or refreshes its effect
+            buff_index = None
+            if result is not None and result.turns_active > 0:
+                buff_index = self._buff_indexes[mover].get(spell.name)
+            buffs = tuple(
+                (result.turns_active if index == buff_index else turns, getattr(hero, slot))
+                for index, ((_, slot), (turns, _)) in enumerate(zip(buff_effects, buffs))
+            )
+
+        caster = (
+            hero._curr_health,
+            getattr(hero, layout.pool) if layout.pool is not None else 0,
+            getattr(hero, layout.resource),
+            hero.spell_power,
+            mitigation,
+            cooldowns,
+            damage_over_time,
+            buffs,
+        )
+        return caster, target
+
+    # ------------------------------------------------------------------------ #
+    def _mitigate(self, side: int, mitigation: tuple, damage: int) -> tuple[int, tuple]:
+        """
+        Mitigate a hit on a hero, in the same order as its mitigation stack - percentage, flat, absorb.
+
+        Returns:
+            tuple[int, tuple]: damage taken and the mitigation effects with the used up absorb effects
+        """
+        percent = 0
+        flat = self._damage_reduction[side]
+        for kind, (turns, amount) in zip(self._mitigation_kinds[side], mitigation):
+            if turns:
+                if kind == PERCENT:
+                    percent += amount
+                elif kind == FLAT:
+                    flat += amount
+
+        damage = damage * (100 - min(percent, self._max_damage_reduction[side])) // 100 - flat
+        if damage <= 0:
+            return 0, mitigation
+        if ABSORB not in self._mitigation_kinds[side]:
+            return damage, mitigation
+
+        effects = []
+        for kind, (turns, amount) in zip(self._mitigation_kinds[side], mitigation):
+            if kind == ABSORB and turns and damage:
+                absorbed = min(amount, damage)
+                damage -= absorbed
+                amount -= absorbed
+            effects.append((turns, amount))
+        return damage, tuple(effects)
+
+    # ------------------------------------------------------------------------ #
+    def _end_turn(self, side: int, state: tuple) -> tuple:
+        # The mitigation effects expire before the damage over time ticks
+        mitigation = tuple(
+            (turns - 1, amount) if turns > 1 else (0, 0) for turns, amount in state[_MITIGATION]
+        )
+        health = state[_HEALTH]
+        ticks = []
+        for turns, damage in state[_DAMAGE_OVER_TIME]:
+            if turns:
+                tick_damage, mitigation = self._mitigate(side, mitigation, damage)
+                health -= tick_damage
+                turns -= 1
+                if not turns:
+                    damage = 0
+            ticks.append((turns, damage))
+
+        spell_power = state[_SPELL_POWER]
+        buffs = state[_BUFFS]
+        if buffs:
+            buffs, spell_power = self._expire_buffs(side, buffs, spell_power)
+
+        cooldowns = tuple(cooldown - 1 if cooldown else 0 for cooldown in state[_COOLDOWNS])
+        return (
+            health,
+            *state[1:_SPELL_POWER],
+            spell_power,
+            mitigation,
+            cooldowns,
+            tuple(ticks),
+            buffs,
+        )
+
+    # ------------------------------------------------------------------------ #
+    def _expire_buffs(self, side: int, buffs: tuple, spell_power: int) -> tuple[tuple, int]:
+        """
+        Run down the buffs of a hero. An expired buff is taken back by the hero, like in a battle.
+
+        Returns:
+            tuple[tuple, int]: the buffs and the spell power after the expiries
+        """
+        hero = self._heroes[side]
+        remaining = []
+        for (effect_name, slot), (turns, amount) in zip(self._buff_effects[side], buffs):
+            if turns == 1:
+                hero.spell_power = spell_power
+                setattr(hero, slot, amount)
+                hero.expire_effect(effect_name)
+                spell_power = hero.spell_power
+                amount = getattr(hero, slot)
+            remaining.append((turns - 1 if turns else 0, amount))
+
+        return tuple(remaining), spell_power
+
+    # ------------------------------------------------------------------------ #
+    @staticmethod
+    def _copy_hero(hero: IBaseHero) -> IBaseHero:
+        hero_cls = type(hero)
+        copy = hero_cls.__new__(hero_cls)
+        for slot in get_hero_slots(hero_cls):
+            setattr(copy, slot, getattr(hero, slot))
+        # The casts of the search must not be published as events of the duel
+        copy.event_bus = None
+        return copy
+
+
+# ---------------------------------------------------------------------------- #
+class MinimaxSearch:
+    """
+    Alpha-beta search with a transposition table and iterative deepening on a duel model.
+    The table is kept between moves, because the positions of the next move are mostly already in it.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(
+        self,
+        model: DuelModel,
+        side: int,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_table_size: int = MAX_TABLE_SIZE,
+    ) -> None:
+        """
+        Args:
+            model (DuelModel): model of the duel
+            side (int): hero for which the search plays, 0 for the attacker and 1 for the defender
+            time_budget (float): seconds, after which the search of a move stops
+            max_depth (int): plies, after which the search of a move stops
+            max_table_size (int): positions in the transposition table, after which it is cleared
+        """
+        self._model = model
+        self._side = side
+        self._time_budget = time_budget
+        self._max_depth = max_depth
+        self._max_table_size = max_table_size
+        self._table: dict[tuple, _TableEntry] = {}
+        self._deadline = math.inf
+        self._nodes = 0
+        self.depth = 0
+
+    # ------------------------------------------------------------------------ #
+    def select(self, position: tuple, spell_ids: tuple[int, ...]) -> int:
+        """
+        Find the best spell of the hero in the position. The search of the first ply is always finished,
+        the deeper searches only while the time budget lasts.
+
+        Args:
+            position (tuple): position in which the hero is to move
+            spell_ids (tuple[int, ...]): ids of the spells the hero can cast
+
+        Returns:
+            int: id of the best spell
+        """
+        if len(self._table) > self._max_table_size:
+            self._table.clear()
+
+        best_spell = spell_ids[0]
+        self._deadline = math.inf
+        self._nodes = 0
+        self.depth = 0
+        start = time.perf_counter()
+        for depth in range(1, self._max_depth + 1):
+            try:
+                best_spell = self._search_root(position, spell_ids, depth)
+            except _SearchTimeout:
+                break
+
+            self.depth = depth
+            self._deadline = start + self._time_budget
+            if time.perf_counter() >= self._deadline:
+                break
+
+        return best_spell
+
+    # ------------------------------------------------------------------------ #
+    def _search_root(self, position: tuple, spell_ids: tuple[int, ...], depth: int) -> int:
+        entry = self._table.get(position)
+        ordered = spell_ids
+        if entry is not None and entry.spell_id in spell_ids:
+            ordered = (
+                entry.spell_id,
+                *(spell_id for spell_id in spell_ids if spell_id != entry.spell_id),
+            )
+
+        alpha = -math.inf
+        best_spell = ordered[0]
+        for spell_id in ordered:
+            score = self._score_move(position, spell_id, depth, alpha, math.inf, 1)
+            if score > alpha:
+                alpha = score
+                best_spell = spell_id
+
+        self._table[position] = _TableEntry(depth, alpha, _EXACT, best_spell)
+        return best_spell
+
+    # ------------------------------------------------------------------------ #
+    def _score_move(
+        self, position: tuple, spell_id: int, depth: int, alpha: float, beta: float, ply: int
+    ) -> float:
+        child = self._model.play(position, spell_id)
+        if isinstance(child, int):
+            # Faster wins and slower losses are better
+            return WIN_SCORE - ply if child == self._side else ply - WIN_SCORE
+
+        return self._search(child, depth - 1, alpha, beta, ply)
+
+    # ------------------------------------------------------------------------ #
+    def _search(self, position: tuple, depth: int, alpha: float, beta: float, ply: int) -> float:
+        self._nodes += 1
+        if not self._nodes & _CLOCK_INTERVAL and time.perf_counter() >= self._deadline:
+            raise _SearchTimeout
+
+        if depth <= 0:
+            return self._model.evaluate(position, self._side)
+
+        entry = self._table.get(position)
+        best_spell = _NO_SPELL
+        if entry is not None:
+            if entry.depth >= depth:
+                if entry.bound == _EXACT:
+                    return entry.score
+                if entry.bound == _LOWER_BOUND and entry.score >= beta:
+                    return entry.score
+                if entry.bound == _UPPER_BOUND and entry.score <= alpha:
+                    return entry.score
+            best_spell = entry.spell_id
+
+        spell_ids = self._model.get_ready_spells(position) or (_NO_SPELL,)
+        if best_spell in spell_ids and best_spell != spell_ids[0]:
+            spell_ids = (best_spell, *(spell_id for spell_id in spell_ids if spell_id != best_spell))
+
+        original_alpha = alpha
+        original_beta = beta
+        maximizing = position[2] == self._side
+        best_score = -math.inf if maximizing else math.inf
+        for spell_id in spell_ids:
+            score = self._score_move(position, spell_id, depth, alpha, beta, ply + 1)
+            if maximizing:
+                if score > best_score:
+                    best_score = score
+                    best_spell = spell_id
+                alpha = max(alpha, score)
+            else:
+                if score < best_score:
+                    best_score = score
+                    best_spell = spell_id
+                beta = min(beta, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            bound = _UPPER_BOUND
+        elif best_score >= original_beta:
+            bound = _LOWER_BOUND
+        else:
+            bound = _EXACT
+        self._table[position] = _TableEntry(depth, best_score, bound, best_spell)
+        return best_score
+
+
+# ---------------------------------------------------------------------------- #
+class MinimaxPolicy(ISpellPolicy):
+    """
+    Selects the spells of a hero with an alpha-beta search over the spells of both heroes.
+    Every move returns within the time budget, plus the search of the first ply, which is always finished.
+    One policy can play many duels at once, a search is kept for every hero it plays.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(
+        self,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_table_size: int = MAX_TABLE_SIZE,
+    ) -> None:
+        """
+        Args:
+            time_budget (float): seconds, which the search of a move may take, 0.05 by default
+            max_depth (int): plies, after which the search of a move stops
+            max_table_size (int): positions in the transposition table of every duel, after which it is cleared.
+                A server, which plays many duels at once, should keep it much smaller than the default.
+        """
+        self._time_budget = time_budget
+        self._max_depth = max_depth
+        self._max_table_size = max_table_size
+        self._duels: dict[IBaseHero, tuple] = {}
+
+    # ------------------------------------------------------------------------ #
+    def begin_duel(
+        self,
+        hero: IBaseHero,
+        opponent: IBaseHero,
+        scheduler: EffectScheduler,
+        moves_first: bool,
+    ) -> None:
+        attacker, defender = (hero, opponent) if moves_first else (opponent, hero)
+        model = DuelModel(attacker, defender)
+        side = 0 if moves_first else 1
+        search = MinimaxSearch(
+            model, side, self._time_budget, self._max_depth, self._max_table_size
+        )
+        self._duels[hero] = (model, search, scheduler, attacker, defender, side)
+
+    # ------------------------------------------------------------------------ #
+    def end_duel(self, hero: IBaseHero) -> None:
+        self._duels.pop(hero, None)
+
+    # ------------------------------------------------------------------------ #
+    def select_spell(self, hero: IBaseHero, spells: tuple[str, ...], turn: int) -> str:
+        """
+        Select the best spell of the hero. Without begin_duel the policy knows nothing about
+        the opponent, so it casts the first spell.
+
+        Args:
+            hero (IBaseHero): the hero which is casting
+            spells (tuple[str, ...]): names of all spells the hero can cast this turn
+            turn (int): current turn of the duel, starting from 0
+
+        Returns:
+            str: name of the selected spell
+        """
+        duel = self._duels.get(hero)
+        if duel is None:
+            return spells[0]
+
+        model, search, scheduler, attacker, defender, side = duel
+        position = model.get_position(scheduler, attacker, defender, side)
+        registry = type(hero).spell_registry
+        spell_ids = tuple(registry.get(spell).spell_id for spell in spells)
+        return model.spells[side][search.select(position, spell_ids)].name
+
+    # ------------------------------------------------------------------------ #
+    async def select_spell_async(self, hero: IBaseHero, spells: tuple[str, ...], turn: int) -> str:
+        """
+        Select the best spell of the hero in a worker thread, so the event loop keeps serving
+        the other duels during the search.
+        """
+        return await asyncio.to_thread(self.select_spell, hero, spells, turn)
@@ -0,0 +1,316 @@
+"""
+Rotation optimizer, which finds the spell sequence of a spec that deals the most damage in a given amount of casts.
+Every cast is made by the real spell methods of the spec, so the class resource gating (holy power, rage, chi,
+fire stacks, insanity, maelstrom), cooldowns and damage over time follow the same rules as in a battle.
+The search is a depth first search over the compact state of the hero - class resource, spell power,
+remaining cooldowns, damage over time on the target and spell power buffs - with a transposition cache,
+so a state which is reached by different sequences is expanded only once.
+"""
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from Heroes.hero_factory import HeroFactory
+from Heroes.hero_layout import get_hero_layout
+
+if TYPE_CHECKING:
+    from Heroes.hero_base_stats import IBaseHero
+
+# --------------------------------- Constants -------------------------------- #
+# Turn in which every spell is on cooldown and the hero casts nothing
+_NO_CAST = -1
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class RotationPlan(NamedTuple):
+    """
+    Best spell sequence found for a spec. Turns in which every spell is on cooldown are None.
+    The damage is dealt to a target without damage reduction and counts the damage over time ticks,
+    which land within the casts of the sequence.
+    """
+
+    hero_key: tuple[str, str]
+    spells: tuple[str | None, ...]
+    damage: int
+
+
+# ---------------------------------------------------------------------------- #
+class _Cast(NamedTuple):
+    damage: int
+    resource: int
+    spell_power: int
+    cooldown: int
+    turns_active: int
+    damage_over_time: int
+    buffs: tuple[int, ...]  # amount of every buff of the hero after the cast
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class RotationOptimizer:
+    """
+    Searches the best spell sequence of a spec. A state of the search is the tuple
+    (class resource, spell power, remaining cooldown of every spell, damage over time on the target,
+    remaining turns and amount of every spell power buff).
+    Mana, energy and health are left out - they never change the damage of a cast - so sequences which
+    only differ in the order of independent casts end in the same state.
+    The transposition cache is kept between calls of `optimize`, so the states of earlier searches are not expanded again.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, hero_key: tuple[str, str]) -> None:
+        """
+        Args:
+            hero_key (tuple[str, str]): key of the spec in the hero registry, for example ("paladin", "retribution")
+
+        Raises:
+            ValueError: if the spec is unknown
+        """
+        self._hero_key = hero_key
+        self._hero = HeroFactory().create_hero(*hero_key)
+        hero_cls = type(self._hero)
+        self._resource = get_hero_layout(hero_cls).resource
+        self._spells = hero_cls.spell_registry.entries
+        # Only the damage over time of these spells is tracked on the target
+        self._damage_over_time_spells = tuple(
+            entry.spell_id
+            for entry in self._spells
+            if entry.definition.turns_active
+            and (entry.definition.damage_over_time or entry.definition.damage_over_time_initial)
+        )
+        self._effect_names = tuple(
+            self._spells[spell_id].name.removeprefix("cast_")
+            for spell_id in self._damage_over_time_spells
+        )
+        # Buff effects of the hero and the index of each by the name of its spell
+        self._buff_effects = tuple(hero_cls.buff_effects.items())
+        self._buff_indexes = {
+            f"cast_{effect_name}": index
+            for index, (effect_name, _) in enumerate(self._buff_effects)
+        }
+        # The casts of the search change the hero, so the start state is taken before any of them
+        self._start = (
+            getattr(self._hero, self._resource),
+            self._hero.spell_power,
+            (0,) * len(self._spells),
+            ((0, 0),) * len(self._damage_over_time_spells),
+            tuple((0, getattr(self._hero, slot)) for _, slot in self._buff_effects),
+        )
+        self._casts: dict[tuple, _Cast] = {}
+        self._cache: dict[tuple, tuple[int, int]] = {}
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def cache_size(self) -> int:
+        """
+        Amount of states in the transposition cache.
+        """
+        return len(self._cache)
+
+    # ------------------------------------------------------------------------ #
+    def optimize(self, casts: int) -> RotationPlan:
+        """
+        Find the spell sequence which deals the most damage in the given amount of casts,
+        starting from a freshly created hero. Ties go to the spell with the lower id.
+
+        Args:
+            casts (int): length of the sequence, one cast per turn
+
+        Raises:
+            ValueError: if the amount of casts is not positive
+
+        Returns:
+            RotationPlan: the best sequence and its damage
+        """
+        if casts < 1:
+            raise ValueError(f"The amount of casts must be positive: {casts}")
+
+        state = self._start
+        damage = self._search(state, casts)
+
+        # Follow the best choices stored in the cache
+        spells = []
+        for remaining in range(casts, 0, -1):
+            spell_id = self._cache[(state, remaining)][1]
+            spells.append(None if spell_id == _NO_CAST else self._spells[spell_id].name)
+            _, state = self._play(state, spell_id, remaining)
+
+        return RotationPlan(self._hero_key, tuple(spells), damage)
+
+    # ------------------------------------------------------------------------ #
+    def _search(self, state: tuple, remaining: int) -> int:
+        key = (state, remaining)
+        entry = self._cache.get(key)
+        if entry is not None:
+            return entry[0]
+
+        cooldowns = state[2]
+        best_damage = -1
+        best_spell = _NO_CAST
+        for spell_id, cooldown in enumerate(cooldowns):
+            if cooldown:
+                continue
+            damage, next_state = self._play(state, spell_id, remaining)
+            if next_state is not None:
+                damage += self._search(next_state, remaining - 1)
+            if damage > best_damage:
+                best_damage = damage
+                best_spell = spell_id
+
+        if best_spell == _NO_CAST:
+            best_damage, next_state = self._play(state, _NO_CAST, remaining)
+            if next_state is not None:
+                best_damage += self._search(next_state, remaining - 1)
+
+        self._cache[key] = (best_damage, best_spell)
+        return best_damage
+
+    # ------------------------------------------------------------------------ #
+    def _play(self, state: tuple, spell_id: int, remaining: int) -> tuple[int, tuple | None]:
+        """
+        Play one turn - cast the spell and tick the damage over time at the start of the next turn.
+
+        Returns:
+            tuple[int, tuple | None]: damage dealt and the state of the next turn,
+            which is None after the last cast
+        """
+        resource, spell_power, cooldowns, damage_over_time, buffs = state
+        damage = 0
+        if spell_id != _NO_CAST:
+            cast = self._cast(resource, spell_power, spell_id, damage_over_time, buffs)
+            damage = cast.damage
+            resource = cast.resource
+            spell_power = cast.spell_power
+            if buffs:
+                # Casting a buff starts or refreshes its effect
+                buff_index = self._buff_indexes.get(self._spells[spell_id].name)
+                if not cast.turns_active:
+                    buff_index = None
+                buffs = tuple(
+                    (cast.turns_active if index == buff_index else turns, amount)
+                    for index, ((turns, _), amount) in enumerate(zip(buffs, cast.buffs))
+                )
+            if cast.cooldown > 0:
+                cooldowns = cooldowns[:spell_id] + (cast.cooldown,) + cooldowns[spell_id + 1 :]
+            if cast.damage_over_time > 0:
+                # Casting it again refreshes the effect and drops the ticks of the previous cast
+                index = self._damage_over_time_spells.index(spell_id)
+                damage_over_time = (
+                    damage_over_time[:index]
+                    + ((cast.turns_active, cast.damage_over_time),)
+                    + damage_over_time[index + 1 :]
+                )
+
+        if remaining == 1:
+            return damage, None
+
+        ticks = []
+        for turns, tick_damage in damage_over_time:
+            if turns:
+                damage += tick_damage
+                turns -= 1
+                if not turns:
+                    tick_damage = 0
+            ticks.append((turns, tick_damage))
+
+        if buffs:
+            buffs, spell_power = self._expire_buffs(buffs, spell_power)
+
+        cooldowns = tuple(cooldown - 1 if cooldown else 0 for cooldown in cooldowns)
+        return damage, (resource, spell_power, cooldowns, tuple(ticks), buffs)
+
+    # ------------------------------------------------------------------------ #
+    def _expire_buffs(self, buffs: tuple, spell_power: int) -> tuple[tuple, int]:
+        """
+        Run down the buffs at the start of the next turn. An expired buff is taken back by the hero,
+        like in a battle.
+
+        Returns:
+            tuple[tuple, int]: the buffs and the spell power after the expiries
+        """
+        hero: "IBaseHero" = self._hero
+        remaining = []
+        for (effect_name, slot), (turns, amount) in zip(self._buff_effects, buffs):
+            if turns == 1:
+                hero.spell_power = spell_power
+                setattr(hero, slot, amount)
+                hero.expire_effect(effect_name)
+                spell_power = hero.spell_power
+                amount = getattr(hero, slot)
+            remaining.append((turns - 1 if turns else 0, amount))
+
+        return tuple(remaining), spell_power
+
+    # ------------------------------------------------------------------------ #
+    def _cast(
+        self,
+        resource: int,
+        spell_power: int,
+        spell_id: int,
+        damage_over_time: tuple[tuple[int, int], ...],
+        buffs: tuple[tuple[int, int], ...],
+    ) -> _Cast:
+        spell = self._spells[spell_id]
+        active_effects = None
+        if spell.takes_args:
+            # The only extra argument of a spell is the list of effects active on the target
+            active_effects = tuple(
+                effect_name
+                for effect_name, (turns, _) in zip(self._effect_names, damage_over_time)
+                if turns
+            )
+
+        buff_amounts = tuple(amount for _, amount in buffs)
+        key = (resource, spell_power, spell_id, active_effects, buff_amounts)
+        cast = self._casts.get(key)
+        if cast is None:
+            hero: "IBaseHero" = self._hero
+            setattr(hero, self._resource, resource)
+            hero.spell_power = spell_power
+            for (_, slot), amount in zip(self._buff_effects, buff_amounts):
+                setattr(hero, slot, amount)
+            if active_effects is None:
+                result = spell.method(hero)
+            else:
+                result = spell.method(hero, list(active_effects))
+
+            buff_amounts = tuple(getattr(hero, slot) for _, slot in self._buff_effects)
+            if result is None:
+                cast = _Cast(
+                    0, getattr(hero, self._resource), hero.spell_power, 0, 0, 0, buff_amounts
+                )
+            else:
+                cast = _Cast(
+                    result.spell_damage,
+                    getattr(hero, self._resource),
+                    hero.spell_power,
+                    result.cooldown,
+                    result.turns_active,
+                    result.damage_over_time if result.turns_active > 0 else 0,
+                    buff_amounts,
+                )
+            self._casts[key] = cast
+
+        return cast
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def optimize_rotation(hero_key: tuple[str, str], casts: int) -> RotationPlan:
+    """
+    Find the spell sequence of a spec which deals the most damage in the given amount of casts.
+
+    Args:
+        hero_key (tuple[str, str]): key of the spec in the hero registry, for example ("monk", "windwalker")
+        casts (int): length of the sequence
+
+    Raises:
+        ValueError: if the spec is unknown or the amount of casts is not positive
+
+    Returns:
+        RotationPlan: the best sequence and its damage
+    """
+    return RotationOptimizer(hero_key).optimize(casts)
@@ -0,0 +1,333 @@
+"""
+Headless battle engine, which runs complete duels between two heroes without any terminal I/O.
+The spells of each hero are picked by a spell selection policy, so thousands of duels can be simulated
+for balance work.
+"""
+
+import random
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, NamedTuple
+
+from battles_handler import Attacking, EventBus
+from effects_handler import EffectScheduler
+from Heroes.hero_base_stats import IBaseHero
+from Heroes.hero_factory import HeroFactory
+from Heroes.hero_selection import parse_hero_key  # noqa: F401 - part of the simulation API
+
+if TYPE_CHECKING:
+    from Simulations.analytics_handler import BattleAnalytics
+    from Storage.battle_log import BattleRecorder
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_MAX_TURNS = 500
+ATTACKER = "attacker"
+DEFENDER = "defender"
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class BattleResult(NamedTuple):
+    """
+    Outcome of a single duel.
+    The winner is "attacker", "defender" or None, if the duel reached the turn limit.
+    """
+
+    winner: str | None
+    turns: int
+    attacker_health: int
+    defender_health: int
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Policies                                   #
+# ---------------------------------------------------------------------------- #
+class ISpellPolicy(ABC):
+    """
+    Base interface for all spell selection policies.
+    """
+
+    # ------------------------------------------------------------------------ #
+    @abstractmethod
+    def select_spell(self, hero: IBaseHero, spells: tuple[str, ...], turn: int) -> str:
+        """
+        Select the spell which the hero will cast this turn.
+
+        Args:
+            hero (IBaseHero): the hero which is casting
+            spells (tuple[str, ...]): names of all spells the hero can cast this turn
+            turn (int): current turn of the duel, starting from 0
+
+        Raises:
+            NotImplementedError: if the abstract method is not implemented in the child class, raise an Exception.
+
+        Returns:
+            str: name of the selected spell
+        """
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------------ #
+    async def select_spell_async(self, hero: IBaseHero, spells: tuple[str, ...], turn: int) -> str:
+        """
+        Select the spell from a coroutine of an event loop, like select_spell.
+        Policies which search for long override it, so the search does not block the other coroutines.
+
+        Args:
+            hero (IBaseHero): the hero which is casting
+            spells (tuple[str, ...]): names of all spells the hero can cast this turn
+            turn (int): current turn of the duel, starting from 0
+
+        Returns:
+            str: name of the selected spell
+        """
+        return self.select_spell(hero, spells, turn)
+
+    # ------------------------------------------------------------------------ #
+    def begin_duel(
+        self,
+        hero: IBaseHero,
+        opponent: IBaseHero,
+        scheduler: EffectScheduler,
+        moves_first: bool,
+    ) -> None:
+        """
+        Called before the first turn of every duel, in which the policy selects the spells of the hero.
+        Policies which look ahead use it to see the opponent and the cooldowns and effects of the duel.
+
+        Args:
+            hero (IBaseHero): the hero, whose spells the policy selects
+            opponent (IBaseHero): the other hero of the duel
+            scheduler (EffectScheduler): cooldowns and effects of the duel
+            moves_first (bool): True if the hero is the attacker and casts first in every turn
+        """
+
+    # ------------------------------------------------------------------------ #
+    def end_duel(self, hero: IBaseHero) -> None:
+        """
+        Called when a duel, started with begin_duel, is over or abandoned.
+
+        Args:
+            hero (IBaseHero): the hero, whose spells the policy selected
+        """
+
+
+# ---------------------------------------------------------------------------- #
+class RotationPolicy(ISpellPolicy):
+    """
+    Casts all spells of the hero one after another, in alphabetical order.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def select_spell(self, hero: IBaseHero, spells: tuple[str, ...], turn: int) -> str:
+        return spells[turn % len(spells)]
+
+
+# ---------------------------------------------------------------------------- #
+class RandomPolicy(ISpellPolicy):
+    """
+    Casts a random spell every turn. Passing a seed makes the duels reproducible.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, seed: int | None = None) -> None:
+        self._rng = random.Random(seed)
+
+    # ------------------------------------------------------------------------ #
+    def select_spell(self, hero: IBaseHero, spells: tuple[str, ...], turn: int) -> str:
+        return spells[int(self._rng.random() * len(spells))]
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Helpers                                   #
+# ---------------------------------------------------------------------------- #
+def get_spell_names(hero_cls: type) -> tuple[str, ...]:
+    """
+    Get the names of all spells of a hero class, in alphabetical order, which is also the order of their ids.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+
+    Returns:
+        tuple[str, ...]: names of all "cast_*" methods of the class
+    """
+    return hero_cls.spell_registry.names
+
+
+# ---------------------------------------------------------------------------- #
+def summarize_results(results: Iterable[BattleResult]) -> dict[str, float]:
+    """
+    Aggregate the results of many duels, without keeping them in memory.
+
+    Args:
+        results (Iterable[BattleResult]): results of the duels
+
+    Returns:
+        dict: amount of battles, wins of each side, draws and average turns per battle
+    """
+    summary = {"battles": 0, ATTACKER: 0, DEFENDER: 0, "draws": 0, "average_turns": 0.0}
+    total_turns = 0
+    for result in results:
+        summary["battles"] += 1
+        total_turns += result.turns
+        if result.winner is None:
+            summary["draws"] += 1
+        else:
+            summary[result.winner] += 1
+
+    if summary["battles"]:
+        summary["average_turns"] = total_turns / summary["battles"]
+
+    return summary
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class BattleSimulator:
+    """
+    Runs complete duels between two heroes from the hero registry. The attacker always casts first
+    and both heroes cast one spell per turn, until one of them dies or the turn limit is reached.
+    The policies choose only from the spells, which are not on cooldown.
+    With a battle recorder, every duel is written to the battle log. With an event bus, the events of both
+    heroes are published to it and delivered at the end of every turn. With battle analytics, every duel
+    is added to them, through the given event bus or an own one.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(
+        self,
+        attacker_key: tuple[str, str],
+        defender_key: tuple[str, str],
+        attacker_policy: ISpellPolicy | None = None,
+        defender_policy: ISpellPolicy | None = None,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        recorder: "BattleRecorder | None" = None,
+        event_bus: EventBus | None = None,
+        analytics: "BattleAnalytics | None" = None,
+    ) -> None:
+        # Heroes of a finished duel are recycled for the next one
+        self._hero_factory = HeroFactory(pool_size=1)
+        self._attacker_key = attacker_key
+        self._defender_key = defender_key
+        self._attacker_policy = attacker_policy or RotationPolicy()
+        self._defender_policy = defender_policy or RotationPolicy()
+        self._max_turns = max_turns
+        self._recorder = recorder
+        self._analytics = analytics
+        if analytics is not None and event_bus is None:
+            event_bus = EventBus()
+        self._event_bus = event_bus
+
+    # ------------------------------------------------------------------------ #
+    def run_duel(self) -> BattleResult:
+        """
+        Run a single duel with freshly created heroes.
+
+        Returns:
+            BattleResult: outcome of the duel
+        """
+        attacker = self._hero_factory.create_hero(*self._attacker_key)
+        defender = self._hero_factory.create_hero(*self._defender_key)
+        attacker_spells = get_spell_names(type(attacker))
+        defender_spells = get_spell_names(type(defender))
+        attacker_spells_with_args = type(attacker).spell_registry.spells_with_args
+        defender_spells_with_args = type(defender).spell_registry.spells_with_args
+
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.begin_duel(self._attacker_key, self._defender_key, attacker, defender)
+
+        event_bus = self._event_bus
+        if event_bus is not None:
+            event_bus.attach(attacker, defender)
+        analytics = self._analytics
+        if analytics is not None:
+            analytics.begin_duel(
+                event_bus, self._attacker_key, self._defender_key, attacker, defender
+            )
+
+        scheduler = EffectScheduler(recorder)
+        attacking = Attacking(attacker, defender, scheduler, recorder)
+        counter_attacking = Attacking(defender, attacker, scheduler, recorder)
+        self._attacker_policy.begin_duel(attacker, defender, scheduler, True)
+        self._defender_policy.begin_duel(defender, attacker, scheduler, False)
+        select_attacker_spell = self._attacker_policy.select_spell
+        select_defender_spell = self._defender_policy.select_spell
+
+        winner = None
+        turn = 0
+        while turn < self._max_turns:
+            # Damage over time ticks at the start of the turn and can end the duel before any cast
+            if recorder is not None:
+                recorder.start_turn(turn)
+            scheduler.start_turn(turn)
+            if not defender.is_alive():
+                winner = ATTACKER
+                break
+            if not attacker.is_alive():
+                winner = DEFENDER
+                break
+
+            spells = scheduler.get_ready_spells(attacker, attacker_spells)
+            if spells:
+                spell = select_attacker_spell(attacker, spells, turn)
+                if spell in attacker_spells_with_args:
+                    attacking.attack(spell, scheduler.get_active_effects(defender))
+                else:
+                    attacking.attack(spell)
+                if not defender.is_alive():
+                    winner = ATTACKER
+                    if event_bus is not None:
+                        event_bus.flush(turn)
+                    turn += 1
+                    break
+
+            spells = scheduler.get_ready_spells(defender, defender_spells)
+            if spells:
+                spell = select_defender_spell(defender, spells, turn)
+                if spell in defender_spells_with_args:
+                    counter_attacking.attack(spell, scheduler.get_active_effects(attacker))
+                else:
+                    counter_attacking.attack(spell)
+            if event_bus is not None:
+                event_bus.flush(turn)
+            turn += 1
+            if not attacker.is_alive():
+                winner = DEFENDER
+                break
+
+        if recorder is not None:
+            recorder.end_duel(winner, turn)
+        if event_bus is not None:
+            # Damage over time, which ended the duel at the start of a turn
+            event_bus.flush(turn)
+            event_bus.detach(attacker, defender)
+        self._attacker_policy.end_duel(attacker)
+        self._defender_policy.end_duel(defender)
+
+        result = BattleResult(
+            winner,
+            turn,
+            attacker.get_current_health(),
+            defender.get_current_health(),
+        )
+        if analytics is not None:
+            analytics.end_duel(result)
+        self._hero_factory.release_hero(attacker)
+        self._hero_factory.release_hero(defender)
+        return result
+
+    # ------------------------------------------------------------------------ #
+    def simulate(self, battles: int) -> Iterator[BattleResult]:
+        """
+        Run the given amount of duels one after another.
+
+        Args:
+            battles (int): amount of duels to run
+
+        Yields:
+            BattleResult: outcome of every duel
+        """
+        for _ in range(battles):
+            yield self.run_duel()
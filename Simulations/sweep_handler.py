@@ -0,0 +1,490 @@
+"""
+Balance sweep harness, which evaluates overrides of the spell coefficients of the specs, for example
+the 135% attack power of Blade of Justice, over a grid or a random search.
+Every config is evaluated with a full matchup matrix in a process pool. All configs use the same seed,
+so their differences come from the coefficients and not from the random spell selection.
+Results are cached on disk, keyed by a hash of the config, so repeated or overlapping sweeps never
+evaluate the same config twice.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import NamedTuple
+
+from Heroes.hero_factory import HeroFactory
+from Heroes.hero_selection import parse_hero_key
+from Heroes.spec_data import SpellDefinition, load_spec_definitions
+from Simulations.matrix_handler import MatchupMatrix
+from Simulations.simulation_handler import DEFAULT_MAX_TURNS
+from Spells.spell_registry import SpellRegistry
+from Spells.spell_table import clear_spell_tables
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_BATTLES_PER_CELL = 100
+DEFAULT_CACHE_DIR = ".sweep_cache"
+CACHE_VERSION = 1  # bump when the evaluation changes, so old results are not reused
+
+# Overrides by spec "class:role", spell name and field of its definition, for example
+# {"paladin:retribution": {"cast_blade_of_justice": {"attack_power": 150}}}
+Overrides = dict[str, dict[str, dict[str, int]]]
+# The same nesting with the candidate values of every field
+SearchSpace = dict[str, dict[str, dict[str, list[int]]]]
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class SweepResult(NamedTuple):
+    """
+    Outcome of a single config. The win rate of a spec counts all its duels as attacker and as defender.
+    The spread is the standard deviation of the win rates, so a lower spread means better balance.
+    """
+
+    config_hash: str
+    overrides: Overrides
+    win_rates: dict[str, float]
+    spread: float
+    time_to_kill: float
+    wall_time: float
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Overrides                                  #
+# ---------------------------------------------------------------------------- #
+def normalize_overrides(overrides: Overrides) -> Overrides:
+    """
+    Validate the overrides and bring them into a canonical form - sorted, without the values
+    equal to the current definitions, so configs with the same effect share the same hash.
+
+    Args:
+        overrides (Overrides): new values by spec, spell name and definition field
+
+    Raises:
+        ValueError: if a spec, spell or field is unknown or a value is not a non-negative integer
+
+    Returns:
+        Overrides: the canonical overrides
+    """
+    normalized: Overrides = {}
+    for spec in sorted(overrides):
+        hero_cls = HeroFactory._hero_registry[parse_hero_key(spec)]
+        for spell_name in sorted(overrides[spec]):
+            definition = hero_cls.spell_definitions.get(spell_name)
+            if definition is None:
+                raise ValueError(f"Unknown spell of {spec}: {spell_name}")
+
+            for field, value in sorted(overrides[spec][spell_name].items()):
+                if field not in SpellDefinition._fields:
+                    raise ValueError(f"Unknown field of a spell definition: {field}")
+                if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                    raise ValueError(
+                        f"The value of {spec} {spell_name} {field} must be a non-negative integer: {value}"
+                    )
+                if getattr(definition, field) != value:
+                    normalized.setdefault(spec, {}).setdefault(spell_name, {})[field] = value
+
+    return normalized
+
+
+# ---------------------------------------------------------------------------- #
+@contextmanager
+def apply_overrides(overrides: Overrides) -> Iterator[None]:
+    """
+    Replace the spell definitions of the specs for the duration of the block. The spell registries,
+    compiled spell tables and hero prototypes are rebuilt on entry and on exit.
+    Heroes created inside the block must not be used after it.
+
+    Args:
+        overrides (Overrides): new values by spec, spell name and definition field
+    """
+    patched = []
+    try:
+        for spec, spells in overrides.items():
+            hero_cls = HeroFactory._hero_registry[parse_hero_key(spec)]
+            definitions = dict(hero_cls.spell_definitions)
+            for spell_name, fields in spells.items():
+                definitions[spell_name] = definitions[spell_name]._replace(**fields)
+
+            patched.append((hero_cls, hero_cls.__dict__.get("spell_definitions")))
+            hero_cls.spell_definitions = definitions
+            hero_cls.spell_registry = SpellRegistry(hero_cls)
+        clear_spell_tables()
+        HeroFactory.clear_prototypes()
+        yield
+
+    finally:
+        for hero_cls, definitions in reversed(patched):
+            if definitions is None:
+                del hero_cls.spell_definitions
+            else:
+                hero_cls.spell_definitions = definitions
+            hero_cls.spell_registry = SpellRegistry(hero_cls)
+        if patched:
+            clear_spell_tables()
+            HeroFactory.clear_prototypes()
+
+
+# ---------------------------------------------------------------------------- #
+def grid_configs(space: SearchSpace) -> list[Overrides]:
+    """
+    Build every combination of the candidate values of the search space.
+
+    Args:
+        space (SearchSpace): candidate values by spec, spell name and definition field
+
+    Returns:
+        list[Overrides]: one config per combination
+    """
+    axes = _get_axes(space)
+    candidates = [axis[3] for axis in axes]
+    return [_build_config(axes, values) for values in itertools.product(*candidates)]
+
+
+# ---------------------------------------------------------------------------- #
+def random_configs(space: SearchSpace, samples: int, seed: int | None = None) -> list[Overrides]:
+    """
+    Draw distinct random combinations of the candidate values of the search space.
+
+    Args:
+        space (SearchSpace): candidate values by spec, spell name and definition field
+        samples (int): amount of configs, at most the size of the whole grid
+        seed (int | None): seed of the draws
+
+    Returns:
+        list[Overrides]: the drawn configs
+    """
+    axes = _get_axes(space)
+    grid_size = 1
+    for axis in axes:
+        grid_size *= len(set(axis[3]))
+
+    rng = random.Random(seed)
+    seen = set()
+    configs = []
+    while len(configs) < min(samples, grid_size):
+        values = tuple(rng.choice(axis[3]) for axis in axes)
+        if values not in seen:
+            seen.add(values)
+            configs.append(_build_config(axes, values))
+
+    return configs
+
+
+# ---------------------------------------------------------------------------- #
+def _get_axes(space: SearchSpace) -> list[tuple[str, str, str, list[int]]]:
+    axes = []
+    for spec, spells in space.items():
+        for spell_name, fields in spells.items():
+            for field, values in fields.items():
+                if not values:
+                    raise ValueError(f"No candidate values for {spec} {spell_name} {field}")
+                axes.append((spec, spell_name, field, list(values)))
+
+    return axes
+
+
+# ---------------------------------------------------------------------------- #
+def _build_config(
+    axes: list[tuple[str, str, str, list[int]]], values: tuple[int, ...]
+) -> Overrides:
+    config: Overrides = {}
+    for (spec, spell_name, field, _), value in zip(axes, values):
+        config.setdefault(spec, {}).setdefault(spell_name, {})[field] = value
+
+    return config
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Workers                                   #
+# ---------------------------------------------------------------------------- #
+def _evaluate(task: tuple[str, Overrides, int, str, int, int]) -> SweepResult:
+    """
+    Evaluate a single config. Executed inside the worker processes.
+
+    Args:
+        task (tuple): config hash, overrides, duels per pairing, policy, seed and turn limit
+
+    Returns:
+        SweepResult: outcome of the config
+    """
+    config_hash, overrides, battles_per_cell, policy, seed, max_turns = task
+    start = time.perf_counter()
+
+    with apply_overrides(overrides):
+        matrix = MatchupMatrix(
+            battles_per_cell, workers=1, policy=policy, seed=seed, max_turns=max_turns
+        )
+        cells = matrix.run()
+
+    wins: dict[str, int] = {}
+    battles: dict[str, int] = {}
+    kill_turns = 0.0
+    decided = 0
+    for cell in cells:
+        wins[cell.attacker] = wins.get(cell.attacker, 0) + cell.attacker_wins
+        wins[cell.defender] = wins.get(cell.defender, 0) + cell.defender_wins
+        battles[cell.attacker] = battles.get(cell.attacker, 0) + cell.battles
+        battles[cell.defender] = battles.get(cell.defender, 0) + cell.battles
+        kill_turns += cell.time_to_kill * (cell.attacker_wins + cell.defender_wins)
+        decided += cell.attacker_wins + cell.defender_wins
+
+    win_rates = {spec: wins[spec] / battles[spec] if battles[spec] else 0.0 for spec in wins}
+    return SweepResult(
+        config_hash,
+        overrides,
+        win_rates,
+        statistics.pstdev(win_rates.values()),
+        kill_turns / decided if decided else 0.0,
+        time.perf_counter() - start,
+    )
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class SweepCache:
+    """
+    Results of evaluated configs, one JSON file per config hash in a directory.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, directory: str) -> None:
+        """
+        Args:
+            directory (str): directory of the result files, created on the first write
+        """
+        self._directory = directory
+
+    # ------------------------------------------------------------------------ #
+    def get(self, config_hash: str) -> SweepResult | None:
+        """
+        Read the result of a config.
+
+        Args:
+            config_hash (str): hash of the config
+
+        Returns:
+            SweepResult | None: the cached result or None if the config was not evaluated yet
+        """
+        try:
+            with open(self._get_path(config_hash), encoding="utf-8") as result_file:
+                return SweepResult(**json.load(result_file))
+        except (OSError, ValueError, TypeError):
+            # A missing or damaged file is evaluated again
+            return None
+
+    # ------------------------------------------------------------------------ #
+    def put(self, result: SweepResult) -> None:
+        """
+        Write the result of a config. The file is replaced at once, so an interrupted sweep
+        leaves no partial results behind.
+
+        Args:
+            result (SweepResult): outcome of the config
+        """
+        os.makedirs(self._directory, exist_ok=True)
+        path = self._get_path(result.config_hash)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as result_file:
+            json.dump(result._asdict(), result_file)
+        os.replace(temporary_path, path)
+
+    # ------------------------------------------------------------------------ #
+    def _get_path(self, config_hash: str) -> str:
+        return os.path.join(self._directory, f"{config_hash}.json")
+
+
+# ---------------------------------------------------------------------------- #
+class BalanceSweep:
+    """
+    Evaluates configs of spell coefficient overrides, each with a full matchup matrix, over a process pool.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(
+        self,
+        battles_per_cell: int = DEFAULT_BATTLES_PER_CELL,
+        workers: int | None = None,
+        policy: str = "random",
+        seed: int = 0,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        cache_dir: str | None = DEFAULT_CACHE_DIR,
+    ) -> None:
+        """
+        Args:
+            battles_per_cell (int): amount of duels of every pairing of every config
+            workers (int | None): amount of worker processes, the number of CPUs by default
+            policy (str): "random" or "rotation"
+            seed (int): seed of the random policies, shared by all configs
+            max_turns (int): turn limit of every duel
+            cache_dir (str | None): directory of the result cache, None disables the cache
+        """
+        self._battles_per_cell = battles_per_cell
+        self._workers = workers or os.cpu_count() or 1
+        self._policy = policy
+        self._seed = seed
+        self._max_turns = max_turns
+        self._cache = SweepCache(cache_dir) if cache_dir is not None else None
+        self.cache_hits = 0
+        self.evaluated = 0
+
+    # ------------------------------------------------------------------------ #
+    def get_config_hash(self, overrides: Overrides, definitions_digest: str | None = None) -> str:
+        """
+        Hash a config together with the settings of the sweep and the current spell definitions,
+        so a changed spell or setting never reuses an old result.
+
+        Args:
+            overrides (Overrides): canonical overrides of the config
+            definitions_digest (str | None): digest of the current spell definitions, computed if not given
+
+        Returns:
+            str: hex digest of the config
+        """
+        payload = {
+            "version": CACHE_VERSION,
+            "overrides": overrides,
+            "battles_per_cell": self._battles_per_cell,
+            "policy": self._policy,
+            "seed": self._seed,
+            "max_turns": self._max_turns,
+            "definitions": definitions_digest or get_definitions_digest(),
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    # ------------------------------------------------------------------------ #
+    def run(self, configs: list[Overrides]) -> list[SweepResult]:
+        """
+        Evaluate the configs, reading the already evaluated ones from the cache.
+        Configs with the same canonical overrides are evaluated once.
+
+        Args:
+            configs (list[Overrides]): overrides of every config
+
+        Raises:
+            ValueError: if a config has an unknown spec, spell or field or an invalid value
+
+        Returns:
+            list[SweepResult]: one result per distinct config, the most balanced first
+        """
+        definitions_digest = get_definitions_digest()
+        results: dict[str, SweepResult] = {}
+        pending = set()
+        tasks = []
+        for overrides in configs:
+            overrides = normalize_overrides(overrides)
+            config_hash = self.get_config_hash(overrides, definitions_digest)
+            if config_hash in results or config_hash in pending:
+                continue
+
+            cached = self._cache.get(config_hash) if self._cache is not None else None
+            if cached is not None:
+                results[config_hash] = cached
+                self.cache_hits += 1
+            else:
+                pending.add(config_hash)
+                tasks.append(
+                    (
+                        config_hash,
+                        overrides,
+                        self._battles_per_cell,
+                        self._policy,
+                        self._seed,
+                        self._max_turns,
+                    )
+                )
+
+        if self._workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                self._store(results, _evaluate(task))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self._workers, len(tasks))) as executor:
+                # Results are cached as they arrive, so an interrupted sweep keeps its progress
+                for future in as_completed([executor.submit(_evaluate, task) for task in tasks]):
+                    self._store(results, future.result())
+
+        return sorted(results.values(), key=lambda result: (result.spread, result.config_hash))
+
+    # ------------------------------------------------------------------------ #
+    def _store(self, results: dict[str, SweepResult], result: SweepResult) -> None:
+        results[result.config_hash] = result
+        self.evaluated += 1
+        if self._cache is not None:
+            self._cache.put(result)
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def get_definitions_digest() -> str:
+    """
+    Hash the definitions of all specs - their hero class, stats and spell numbers - so a cached result
+    is never reused after a change of the spec data.
+
+    Returns:
+        str: hex digest of the definitions
+    """
+    registry = HeroFactory._hero_registry
+    definitions = {
+        ":".join(key): {
+            "module": spec.module,
+            "class": spec.class_name,
+            "stats": spec.stats,
+            # The spells are read from the classes, which hold the definitions in effect
+            "spells": {
+                spell_name: list(definition)
+                for spell_name, definition in registry[key].spell_definitions.items()
+            },
+        }
+        for key, spec in load_spec_definitions().items()
+    }
+    encoded = json.dumps(definitions, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+# ---------------------------------------------------------------------------- #
+def load_search_space(path: str) -> SearchSpace:
+    """
+    Read a search space from a JSON file. A single value of a field is treated as one candidate.
+
+    Args:
+        path (str): path of the JSON file
+
+    Returns:
+        SearchSpace: candidate values by spec, spell name and definition field
+    """
+    with open(path, encoding="utf-8") as space_file:
+        space = json.load(space_file)
+
+    return {
+        spec: {
+            spell_name: {
+                field: values if isinstance(values, list) else [values]
+                for field, values in fields.items()
+            }
+            for spell_name, fields in spells.items()
+        }
+        for spec, spells in space.items()
+    }
+
+
+# ---------------------------------------------------------------------------- #
+def write_sweep_json(results: list[SweepResult], path: str) -> None:
+    """
+    Write the results of a sweep as a JSON list, one object per config.
+
+    Args:
+        results (list[SweepResult]): results of the sweep
+        path (str): path of the output file
+    """
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump([result._asdict() for result in results], json_file, indent=2)
@@ -0,0 +1,542 @@
+"""
+Vectorized battle engine, which runs thousands of duels between the same two heroes in lockstep.
+The state of all duels is stored as NumPy arrays, one array per stat (struct of arrays), and every call of
+`step` advances all running duels by one turn. Spells are applied to all duels which cast them at once,
+with masks in place of the per hero branches of the spell handlers. Cooldowns, effects, mitigation and damage
+over time follow the rules of the EffectScheduler, so the results match the object based engine
+in `simulation_handler` exactly.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from Heroes.hero_base_stats import IBaseHero
+from Heroes.hero_factory import HeroFactory
+from Heroes.hero_layout import GATE_CONSUME, GATE_EXACT_RESET, get_hero_layout
+from Heroes.spec_data import SpellDefinition, load_spec_definitions
+from mitigation_handler import ABSORB, FLAT, MITIGATION_KINDS, PERCENT
+from Simulations.simulation_handler import (
+    ATTACKER,
+    DEFAULT_MAX_TURNS,
+    DEFENDER,
+    BattleResult,
+    get_spell_names,
+)
+
+# --------------------------------- Constants -------------------------------- #
+_WINNER_NONE = 0
+_WINNER_ATTACKER = 1
+_WINNER_DEFENDER = 2
+_WINNERS = {_WINNER_NONE: None, _WINNER_ATTACKER: ATTACKER, _WINNER_DEFENDER: DEFENDER}
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class SpellBehaviour(NamedTuple):
+    """
+    Parts of a spell, which are written in its cast method instead of its definition. Spells with a resource
+    cost in their definition are gated by the class resource, the rest of the rules are listed here.
+    Spells with the default behaviour are cast directly: pay the cost, generate resource, heal and deal damage.
+    """
+
+    gated_cooldown: bool = False  # the cooldown starts even without enough class resource
+    pool_gated: bool = False  # cast only if the cost is at least the current pool (Vivify)
+    empowered_by_resource: bool = False  # double damage when the class resource is full (fire stacks)
+    empowered_by_effect: str = ""  # double damage while the spell's effect is active on the target
+    health_cost: bool = False  # the cost is paid with health (Flame Shock)
+    resource_removal: int = 0
+    spell_power_increase: int = 0  # percent of the spell power, a buff effect of the hero
+
+
+# ---------------------------------------------------------------------------- #
+_DIRECT_CAST = SpellBehaviour()
+
+# Every spell of the spec definitions has an entry, which is checked on import, so a new spell
+# cannot be cast directly by mistake
+_SPELL_BEHAVIOURS: dict[str, SpellBehaviour] = {
+    # Paladin
+    "cast_blade_of_justice": _DIRECT_CAST,
+    "cast_blessed_hammer": _DIRECT_CAST,
+    "cast_consecration": _DIRECT_CAST,
+    "cast_crusader_strike": _DIRECT_CAST,
+    "cast_divine_protection": _DIRECT_CAST,
+    "cast_divine_shield": _DIRECT_CAST,
+    "cast_final_verdict": _DIRECT_CAST,
+    "cast_judgement": _DIRECT_CAST,
+    "cast_shield_of_the_righteous": _DIRECT_CAST,
+    "cast_wake_of_ashes": _DIRECT_CAST,
+    "cast_word_of_glory": _DIRECT_CAST,
+    # Warrior
+    "cast_bladestorm": _DIRECT_CAST,
+    "cast_bloodbath": _DIRECT_CAST,
+    "cast_champions_spear": _DIRECT_CAST,
+    "cast_charge": _DIRECT_CAST,
+    "cast_ignore_pain": _DIRECT_CAST,
+    "cast_raging_blow": _DIRECT_CAST,
+    "cast_rampage": _DIRECT_CAST,
+    "cast_sheild_slam": _DIRECT_CAST,
+    "cast_shield_block": _DIRECT_CAST,
+    "cast_shield_charge": _DIRECT_CAST,
+    # Priest
+    "cast_devouring_plague": _DIRECT_CAST,
+    "cast_flash_heal": SpellBehaviour(resource_removal=20),
+    "cast_mind_blast": _DIRECT_CAST,
+    "cast_power_word_shield": _DIRECT_CAST,
+    "cast_shadow_word_death": _DIRECT_CAST,
+    # Mage
+    "cast_arcane_intellect": SpellBehaviour(spell_power_increase=10),
+    "cast_fire_blast": SpellBehaviour(empowered_by_resource=True),
+    "cast_fireball": SpellBehaviour(empowered_by_resource=True),
+    "cast_flamestrike": SpellBehaviour(empowered_by_resource=True),
+    "cast_polymorph": _DIRECT_CAST,
+    # Monk
+    "cast_blackout_kick": SpellBehaviour(gated_cooldown=True),
+    "cast_breath_of_fire": _DIRECT_CAST,
+    "cast_chi_burst": _DIRECT_CAST,
+    "cast_fists_of_fury": SpellBehaviour(gated_cooldown=True),
+    "cast_keg_smash": _DIRECT_CAST,
+    "cast_rising_sun_kick": SpellBehaviour(gated_cooldown=True),
+    "cast_rushing_jade_wind": SpellBehaviour(gated_cooldown=True),
+    "cast_spinning_crane_kick": _DIRECT_CAST,
+    "cast_tiger_palm": _DIRECT_CAST,
+    "cast_vivify": SpellBehaviour(pool_gated=True),
+    "cast_whirling_dragon_punch": _DIRECT_CAST,
+    # Shaman
+    "cast_feral_spirit": _DIRECT_CAST,
+    "cast_flame_shock": SpellBehaviour(health_cost=True),
+    "cast_lava_burst": SpellBehaviour(empowered_by_effect="cast_flame_shock"),
+    "cast_lava_lash": _DIRECT_CAST,
+    "cast_lighting_bolt": _DIRECT_CAST,
+    "cast_primordial_wave": _DIRECT_CAST,
+    "cast_stormstrike": _DIRECT_CAST,
+    "cast_tempest": _DIRECT_CAST,
+}
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Helpers                                   #
+# ---------------------------------------------------------------------------- #
+def _percent(values: np.ndarray, percent: int) -> np.ndarray | int:
+    """
+    Vectorized version of the rounding used by the spell tables - ceil(value * percent / 100).
+    """
+    if not percent:
+        return 0
+
+    return np.ceil(values * percent / 100).astype(np.int64)
+
+
+# ---------------------------------------------------------------------------- #
+def _check_spell_behaviours() -> None:
+    """
+    Check that the behaviours cover exactly the spells of the spec definitions and that the rules
+    which depend on the definitions of the spells can apply to them.
+
+    Raises:
+        ValueError: if a spell has no behaviour, a behaviour has no spell or a rule does not fit its spell
+    """
+    definitions = {
+        spell: definition
+        for spec in load_spec_definitions().values()
+        for spell, definition in spec.spells.items()
+    }
+    if set(definitions) != set(_SPELL_BEHAVIOURS):
+        raise ValueError(
+            "The vectorized spell behaviours do not match the spec definitions - "
+            f"missing {sorted(set(definitions) - set(_SPELL_BEHAVIOURS))}, "
+            f"unknown {sorted(set(_SPELL_BEHAVIOURS) - set(definitions))}"
+        )
+
+    for spell, behaviour in _SPELL_BEHAVIOURS.items():
+        definition = definitions[spell]
+        if behaviour.gated_cooldown and not definition.resource_cost:
+            raise ValueError(f"{spell} has a gated cooldown, but no resource cost")
+        if behaviour.empowered_by_effect and behaviour.empowered_by_effect not in definitions:
+            raise ValueError(f"{spell} is empowered by the unknown {behaviour.empowered_by_effect}")
+        if behaviour.spell_power_increase and not definition.turns_active:
+            raise ValueError(f"{spell} increases the spell power, but has no effect to end it")
+
+
+_check_spell_behaviours()
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class HeroArrays:
+    """
+    State of one side of all duels, one array per stat. Every duel starts from the stats of the given hero.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, hero: IBaseHero, duels: int) -> None:
+        hero_cls = type(hero)
+        layout = get_hero_layout(hero_cls)
+
+        self.spells = get_spell_names(hero_cls)
+        self.definitions = tuple(hero_cls.spell_definitions[spell] for spell in self.spells)
+        self.behaviours = tuple(_SPELL_BEHAVIOURS[spell] for spell in self.spells)
+        self.pays_pool = layout.pool is not None
+        self.resource_gate = layout.resource_gate
+
+        def full(value: int, spells: int = 0) -> np.ndarray:
+            return np.full((duels, spells) if spells else duels, value, dtype=np.int64)
+
+        self.health = full(hero.get_current_health())
+        self.max_health = full(hero.max_health)
+        self.pool = full(getattr(hero, layout.pool) if self.pays_pool else 0)
+        self.max_pool = full(hero.max_secondary_pool)
+        self.resource = full(getattr(hero, layout.resource))
+        self.max_resource = full(getattr(hero, layout.max_resource))
+        self.spell_power = full(hero.spell_power)
+        self.attack_power = full(hero.attack_power)
+        self.damage_reduction = full(hero.get_current_damage_reduction())
+        self.max_damage_reduction = full(hero.max_damage_reduction)
+
+        # Turn in which each spell is ready again and last turn of its effect, one column per spell
+        spells = len(self.spells)
+        self.ready_turn = full(0, spells)
+        self.effect_end = full(-1, spells)
+        self.damage_over_time = full(0, spells)
+        # Amount of the mitigation effect of each spell, what is left of it for absorb effects
+        self.mitigation = full(0, spells)
+        # Spell power added by the active buff effect of each spell, taken back when the effect ends
+        self.buff = full(0, spells)
+        self.buff_spells = tuple(
+            self.spells.index(f"cast_{effect_name}") for effect_name in hero_cls.buff_effects
+        )
+        if not all(self.behaviours[index].spell_power_increase for index in self.buff_spells):
+            raise ValueError(f"The buff effects of {hero_cls.__name__} have no vectorized behaviour")
+        self.mitigation_spells = {
+            kind: tuple(
+                spell_index
+                for spell_index, spell in enumerate(self.spells)
+                if MITIGATION_KINDS.get(spell) == kind and self.definitions[spell_index].turns_active
+            )
+            for kind in (FLAT, PERCENT, ABSORB)
+        }
+        self.damage_over_time_spells = tuple(
+            spell_index
+            for spell_index, definition in enumerate(self.definitions)
+            if definition.turns_active
+            and (definition.damage_over_time or definition.damage_over_time_initial)
+        )
+
+    # ------------------------------------------------------------------------ #
+    def spend_resource(self, rows: np.ndarray, cost: np.ndarray | int) -> np.ndarray:
+        """
+        Vectorized is_specific_stat_spent for the given duels.
+
+        Args:
+            rows (np.ndarray): indexes of the duels
+            cost (np.ndarray | int): amount of class resource to check
+
+        Returns:
+            np.ndarray: mask of the duels in which the check passed
+        """
+        resource = self.resource[rows]
+        if self.resource_gate == GATE_CONSUME:
+            passed = resource >= cost
+            self.resource[rows] = np.where(passed, resource - cost, resource)
+        else:
+            passed = resource == cost
+            if self.resource_gate == GATE_EXACT_RESET:
+                self.resource[rows] = np.where(passed, 0, resource)
+
+        return passed
+
+
+# ---------------------------------------------------------------------------- #
+class VectorizedBattle:
+    """
+    Runs many duels between the same attacker and defender at once. The attacker always casts first
+    and both heroes cast one spell per turn, exactly like BattleSimulator. Spells are chosen per duel
+    by their index in `attacker_spells` and `defender_spells`.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(
+        self,
+        attacker_key: tuple[str, str],
+        defender_key: tuple[str, str],
+        duels: int,
+        max_turns: int = DEFAULT_MAX_TURNS,
+    ) -> None:
+        hero_factory = HeroFactory()
+        self._attacker = HeroArrays(hero_factory.create_hero(*attacker_key), duels)
+        self._defender = HeroArrays(hero_factory.create_hero(*defender_key), duels)
+        self._duels = duels
+        self._max_turns = max_turns
+        self._turn = 0
+        self._running = np.ones(duels, dtype=bool)
+        self._winners = np.zeros(duels, dtype=np.int8)
+        self._turns = np.zeros(duels, dtype=np.int64)
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def attacker_spells(self) -> tuple[str, ...]:
+        return self._attacker.spells
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def defender_spells(self) -> tuple[str, ...]:
+        return self._defender.spells
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def attacker(self) -> HeroArrays:
+        return self._attacker
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def defender(self) -> HeroArrays:
+        return self._defender
+
+    # ------------------------------------------------------------------------ #
+    def is_running(self) -> bool:
+        """
+        Check if any duel is still running.
+
+        Returns:
+            bool: True if at least one duel has no winner and has not reached the turn limit
+        """
+        return bool(self._running.any())
+
+    # ------------------------------------------------------------------------ #
+    def step(self, attacker_rolls: np.ndarray, defender_rolls: np.ndarray) -> None:
+        """
+        Advance all running duels by one turn. Each hero casts the spell at the position of its roll
+        among the spells, which are not on cooldown, like RandomPolicy does.
+
+        Args:
+            attacker_rolls (np.ndarray): number in [0, 1) for every duel, which chooses the attacker spell
+            defender_rolls (np.ndarray): number in [0, 1) for every duel, which chooses the defender spell
+        """
+        rows = np.flatnonzero(self._running)
+        if not rows.size:
+            return
+
+        # Buffs expire at the start of the turn, before the damage over time ticks
+        self._expire_buffs(self._attacker, rows)
+        self._expire_buffs(self._defender, rows)
+        # Damage over time ticks at the start of the turn and can end the duel before any cast
+        self._tick(self._attacker, self._defender, rows)
+        self._tick(self._defender, self._attacker, rows)
+        defender_dead = self._defender.health[rows] <= 0
+        self._finish(rows[defender_dead], _WINNER_ATTACKER, self._turn)
+        rows = rows[~defender_dead]
+        attacker_dead = self._attacker.health[rows] <= 0
+        self._finish(rows[attacker_dead], _WINNER_DEFENDER, self._turn)
+        rows = rows[~attacker_dead]
+
+        self._cast(self._attacker, self._defender, attacker_rolls, rows)
+        defender_dead = self._defender.health[rows] <= 0
+        self._finish(rows[defender_dead], _WINNER_ATTACKER, self._turn + 1)
+
+        rows = rows[~defender_dead]
+        self._cast(self._defender, self._attacker, defender_rolls, rows)
+        self._turn += 1
+        attacker_dead = self._attacker.health[rows] <= 0
+        self._finish(rows[attacker_dead], _WINNER_DEFENDER, self._turn)
+
+        if self._turn >= self._max_turns:
+            self._finish(np.flatnonzero(self._running), _WINNER_NONE, self._turn)
+
+    # ------------------------------------------------------------------------ #
+    def run_random(self, seed: int | None = None) -> list[BattleResult]:
+        """
+        Run all duels to the end with uniformly random spell choices among the ready spells.
+
+        Args:
+            seed (int | None): seed of the random spell choices
+
+        Returns:
+            list[BattleResult]: outcome of every duel
+        """
+        rng = np.random.default_rng(seed)
+        while self.is_running():
+            self.step(rng.random(self._duels), rng.random(self._duels))
+
+        return self.results()
+
+    # ------------------------------------------------------------------------ #
+    def results(self) -> list[BattleResult]:
+        """
+        Get the outcome of every duel. Duels which are still running have no winner.
+
+        Returns:
+            list[BattleResult]: outcome of every duel, in duel order
+        """
+        turns = np.where(self._running, self._turn, self._turns)
+        return [
+            BattleResult(_WINNERS[winner], turn, attacker_health, defender_health)
+            for winner, turn, attacker_health, defender_health in zip(
+                self._winners.tolist(),
+                turns.tolist(),
+                self._attacker.health.tolist(),
+                self._defender.health.tolist(),
+            )
+        ]
+
+    # ------------------------------------------------------------------------ #
+    def _finish(self, rows: np.ndarray, winner: int, turn: int) -> None:
+        self._running[rows] = False
+        self._winners[rows] = winner
+        self._turns[rows] = turn
+
+    # ------------------------------------------------------------------------ #
+    def _expire_buffs(self, hero: HeroArrays, rows: np.ndarray) -> None:
+        for spell_index in hero.buff_spells:
+            expired = rows[hero.effect_end[rows, spell_index] == self._turn]
+            if expired.size:
+                hero.spell_power[expired] -= hero.buff[expired, spell_index]
+                hero.buff[expired, spell_index] = 0
+
+    # ------------------------------------------------------------------------ #
+    def _tick(self, caster: HeroArrays, target: HeroArrays, rows: np.ndarray) -> None:
+        turn = self._turn
+        for spell_index in caster.damage_over_time_spells:
+            effect_end = caster.effect_end[rows, spell_index]
+            turns_active = caster.definitions[spell_index].turns_active
+            ticking = rows[(effect_end >= turn) & (effect_end - turns_active < turn)]
+            if ticking.size:
+                target.health[ticking] -= self._mitigate(
+                    target, ticking, caster.damage_over_time[ticking, spell_index]
+                )
+
+    # ------------------------------------------------------------------------ #
+    def _mitigate(self, target: HeroArrays, rows: np.ndarray, damage: np.ndarray | int) -> np.ndarray:
+        """
+        Vectorized Defending.deflect - reduce the damage by the percentage, flat and absorb effects
+        active on the target, in the same order as its mitigation stack, and use up the absorb effects.
+        """
+        turn = self._turn
+        percent = 0
+        flat = target.damage_reduction[rows]
+        for spell_index in target.mitigation_spells[PERCENT]:
+            active = target.effect_end[rows, spell_index] > turn
+            percent = percent + np.where(active, target.mitigation[rows, spell_index], 0)
+        for spell_index in target.mitigation_spells[FLAT]:
+            active = target.effect_end[rows, spell_index] > turn
+            flat = flat + np.where(active, target.mitigation[rows, spell_index], 0)
+
+        damage_taken = 100 - np.minimum(percent, target.max_damage_reduction[rows])
+        damage = np.maximum(damage * damage_taken // 100 - flat, 0)
+        for spell_index in target.mitigation_spells[ABSORB]:
+            active = target.effect_end[rows, spell_index] > turn
+            absorbed = np.where(active, np.minimum(target.mitigation[rows, spell_index], damage), 0)
+            target.mitigation[rows, spell_index] -= absorbed
+            damage = damage - absorbed
+
+        return damage
+
+    # ------------------------------------------------------------------------ #
+    def _cast(self, caster: HeroArrays, target: HeroArrays, rolls: np.ndarray, rows: np.ndarray) -> None:
+        ready = caster.ready_turn[rows] <= self._turn
+        ready_count = ready.sum(axis=1)
+        position = (rolls[rows] * ready_count).astype(np.int64)
+        chosen = (ready.cumsum(axis=1) > position[:, None]).argmax(axis=1)
+        chosen[ready_count == 0] = -1
+
+        for spell_index in range(len(caster.spells)):
+            spell_rows = rows[chosen == spell_index]
+            if spell_rows.size:
+                self._apply_spell(caster, target, spell_index, spell_rows)
+
+    # ------------------------------------------------------------------------ #
+    def _apply_spell(
+        self, caster: HeroArrays, target: HeroArrays, spell_index: int, rows: np.ndarray
+    ) -> None:
+        """
+        Apply a single spell to all duels in which it was cast, in the same order as its cast method,
+        then start its cooldown and effect like EffectScheduler.track_spell.
+        """
+        spell = caster.spells[spell_index]
+        definition = caster.definitions[spell_index]
+        behaviour = caster.behaviours[spell_index]
+        cast_rows = rows
+        if definition.resource_cost:
+            rows = rows[caster.spend_resource(rows, definition.resource_cost)]
+            if not behaviour.gated_cooldown:
+                cast_rows = rows
+
+        cost = _percent(caster.max_pool[rows], definition.cost) + definition.flat_cost
+        if behaviour.pool_gated:
+            passed = cost >= caster.pool[rows]
+            rows = rows[passed]
+            cost = cost[passed] if isinstance(cost, np.ndarray) else cost
+
+        if rows.size:
+            self._apply_result(caster, target, definition, behaviour, rows, cost)
+            if behaviour.spell_power_increase:
+                # A refreshed buff does not stack
+                buffed = rows[caster.buff[rows, spell_index] == 0]
+                bonus = _percent(caster.spell_power[buffed], behaviour.spell_power_increase)
+                caster.buff[buffed, spell_index] = bonus
+                caster.spell_power[buffed] += bonus
+
+        if cast_rows.size:
+            turn = self._turn
+            if definition.cooldown:
+                caster.ready_turn[cast_rows, spell_index] = turn + definition.cooldown
+            if definition.turns_active:
+                caster.effect_end[cast_rows, spell_index] = turn + definition.turns_active
+                if spell in MITIGATION_KINDS:
+                    attack_power = caster.attack_power[cast_rows]
+                    caster.mitigation[cast_rows, spell_index] = np.minimum(
+                        definition.damage_reduction
+                        + _percent(attack_power, definition.damage_reduction_attack_power),
+                        caster.max_damage_reduction[cast_rows],
+                    )
+                if spell_index in caster.damage_over_time_spells:
+                    initial_damage = _percent(caster.spell_power[cast_rows], definition.initial_damage)
+                    caster.damage_over_time[cast_rows, spell_index] = _percent(
+                        caster.spell_power[cast_rows], definition.damage_over_time
+                    ) + _percent(initial_damage, definition.damage_over_time_initial)
+
+    # ------------------------------------------------------------------------ #
+    def _apply_result(
+        self,
+        caster: HeroArrays,
+        target: HeroArrays,
+        definition: SpellDefinition,
+        behaviour: SpellBehaviour,
+        rows: np.ndarray,
+        cost: np.ndarray | int,
+    ) -> None:
+        spell_power = caster.spell_power[rows]
+        if definition.heal_spell_power or definition.heal_max_health:
+            healing = _percent(spell_power, definition.heal_spell_power) + _percent(
+                caster.max_health[rows], definition.heal_max_health
+            )
+            caster.health[rows] = np.minimum(caster.health[rows] + healing, caster.max_health[rows])
+
+        if definition.generation:
+            caster.resource[rows] = np.minimum(
+                caster.resource[rows] + definition.generation, caster.max_resource[rows]
+            )
+
+        attack_power = caster.attack_power[rows]
+        damage = _percent(attack_power, definition.attack_power) + _percent(
+            spell_power, definition.spell_power
+        )
+        if behaviour.empowered_by_resource:
+            empowered = caster.spend_resource(rows, caster.max_resource[rows])
+            damage = np.where(empowered, damage * 2, damage)
+        elif behaviour.empowered_by_effect:
+            effect_index = caster.spells.index(behaviour.empowered_by_effect)
+            empowered = caster.effect_end[rows, effect_index] > self._turn
+            damage = np.where(empowered, damage * 2, damage)
+
+        if behaviour.health_cost:
+            caster.health[rows] -= cost
+        elif caster.pays_pool:
+            caster.pool[rows] -= cost
+
+        if behaviour.resource_removal:
+            caster.resource[rows] = np.maximum(caster.resource[rows] - behaviour.resource_removal, 0)
+
+        if isinstance(damage, np.ndarray) or damage:
+            target.health[rows] -= self._mitigate(target, rows, damage)
@@ -5,6 +5,7 @@ Handler library, that contains all Mage spells.
 import math
 
 from Heroes.hero_base_stats import IBaseHero
+from Spells.spell_records import SpellResult
 
 
 # ---------------------------------------------------------------------------- #
@@ -21,6 +22,10 @@ class FireMageSpells(IBaseHero):
         IBaseHero (cls): Base class for all heroes, containing base stats and methods.
     """
 
+    __slots__ = ("_curr_fire_stacks", "_max_fire_stacks", "_curr_mana", "_arcane_intellect_bonus")
+
+    buff_effects = {"arcane_intellect": "_arcane_intellect_bonus"}
+
     # ------------------------------------------------------------------------ #
     def get_name(self) -> str:
         return "Fire Mage"
@@ -32,126 +37,117 @@ class FireMageSpells(IBaseHero):
         self._max_fire_stacks = 8
         self._curr_health = self.max_health
         self._curr_mana = self.max_secondary_pool
+        # Spell power added by the active Arcane Intellect
+        self._arcane_intellect_bonus = 0
 
     # ------------------------------------------------------------------------ #
-    def cast_fireball(self) -> dict[str, int]:
+    def cast_fireball(self) -> SpellResult:
         """
         Hurl a fireball to the target, dealing significant fire damage. Heals you for 1% of your max health.
         Generated 1 fire stack.
 
         Returns:
-            tuple: damage of the spell, cooldown of the spell
+            SpellResult: damage of the spell, cooldown of the spell
         """
-        generated_fire_stack = 1
-        spell_damage = math.ceil(self.spell_power * 155 / 100)
-        heal_amount = math.ceil(self.max_health * 1 / 100)
-        self.heal_up(heal_amount)
-        self.add_specific_stat(generated_fire_stack)
+        spell = self._spell_table["cast_fireball"]
+        self.heal_up(spell.healing)
+        self.add_specific_stat(spell.generation)
 
+        result = spell.result
         if self.is_specific_stat_spent(self._max_fire_stacks):
-            spell_damage = (math.ceil(self.spell_power * 155 / 100)) * 2
+            result = spell.empowered
 
-        self.spell_attributes["cooldown"] = 3
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 2 / 100
-        )
-        self.spell_attributes["spell_damage"] = spell_damage
-        self._curr_mana -= self.spell_attributes["spell_cost"]
+        self._curr_mana -= result.spell_cost
 
-        return self.spell_attributes
+        return result
 
     # ------------------------------------------------------------------------ #
-    def cast_fire_blast(self) -> dict[str, int]:
+    def cast_fire_blast(self) -> SpellResult:
         """
         Blast the target with fire, decreasing their damage reduction by 15% for 3 turns.
         Generates 1 fire stack.
 
         Returns:
-            tuple: damage of the spell, amount of damage reduction to be applied,
+            SpellResult: damage of the spell, amount of damage reduction to be applied,
             turns for which the effect is active
         """
-        generated_fire_stack = 1
-        spell_damage = math.ceil(self.spell_power * 82 / 100)
-        self.add_specific_stat(generated_fire_stack)
+        spell = self._spell_table["cast_fire_blast"]
+        self.add_specific_stat(spell.generation)
 
+        result = spell.result
         if self.is_specific_stat_spent(self._max_fire_stacks):
-            spell_damage = (math.ceil(self.spell_power * 82 / 100)) * 2
+            result = spell.empowered
 
-        self.spell_attributes["turns_active"] = 3
-        self.spell_attributes["damage_reduction"] = 15
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 1 / 100
-        )
-        self.spell_attributes["spell_damage"] = spell_damage
-        self._curr_mana -= self.spell_attributes["spell_cost"]
+        self._curr_mana -= result.spell_cost
 
-        return self.spell_attributes
+        return result
 
     # ------------------------------------------------------------------------ #
-    def cast_flamestrike(self) -> dict[str, int]:
+    def cast_flamestrike(self) -> SpellResult:
         """
         Ignite the ground under the feet of your target, making them take damage over time for 3 turns.
         Cooldown - 5 turns. Generates 1 fire stack.
 
         Returns:
-            tuple: damage of the spell, cooldown of the spell, turns for which the spell is active
+            SpellResult: damage of the spell, cooldown of the spell, turns for which the spell is active
         """
-        generated_fire_stack = 1
-        spell_damage = math.ceil(self.spell_power * 57 / 100)
-        self.add_specific_stat(generated_fire_stack)
+        spell = self._spell_table["cast_flamestrike"]
+        self.add_specific_stat(spell.generation)
 
+        result = spell.result
         if self.is_specific_stat_spent(self._max_fire_stacks):
-            spell_damage = (math.ceil(self.spell_power * 57 / 100)) * 2
+            result = spell.empowered
 
-        self.spell_attributes["turns_active"] = 3
-        self.spell_attributes["cooldown"] = 5
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 1 / 100
-        )
-        self.spell_attributes["spell_damage"] = spell_damage
-        self._curr_mana -= self.spell_attributes["spell_cost"]
+        self._curr_mana -= result.spell_cost
 
-        return self.spell_attributes
+        return result
 
     # ------------------------------------------------------------------------ #
-    def cast_polymorph(self) -> dict[str, int]:
+    def cast_polymorph(self) -> SpellResult:
         """
         Pacify the target for 2 turns, making them unable to cast any spells.
         Any damage suffered by the target will break the effect.
         Cooldown - 5 turns.
 
         Returns:
-            tuple: cooldown of the spell, turns for which the spell is active
+            SpellResult: cooldown of the spell, turns for which the spell is active
         """
-        self.spell_attributes["turns_active"] = 2
-        self.spell_attributes["cooldown"] = 5
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 1 / 100
-        )
-        self._curr_mana -= self.spell_attributes["spell_cost"]
+        spell = self._spell_table["cast_polymorph"]
+        self._curr_mana -= spell.result.spell_cost
 
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_arcane_intellect(self) -> dict[str, int]:
+    def cast_arcane_intellect(self) -> SpellResult:
         """
         Your arcane understanding, increases your spell power by 10% for 4 turns
         and restoring 20% of you max mana
         .
         Cooldown - 4 turns.
+        Casting it again while it is active refreshes the effect, the buff does not stack.
 
         Returns:
-            tuple: cooldown of the spell, turns for which the spell is active
+            SpellResult: cooldown of the spell, turns for which the spell is active
         """
-        self.spell_attributes["turns_active"] = 4
-        self.spell_attributes["cooldown"] = 4
-        self.spell_power += math.ceil(self.spell_power * 10 / 100)
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 4 / 100
-        )
-        self._curr_mana -= self.spell_attributes["spell_cost"]
+        spell = self._spell_table["cast_arcane_intellect"]
+        if not self._arcane_intellect_bonus:
+            self._arcane_intellect_bonus = math.ceil(self.spell_power * 10 / 100)
+            self.spell_power += self._arcane_intellect_bonus
+        self._curr_mana -= spell.result.spell_cost
 
-        return self.spell_attributes
+        return spell.result
+
+    # ------------------------------------------------------------------------ #
+    def expire_effect(self, effect_name: str) -> None:
+        """
+        Take back the spell power of Arcane Intellect, when its effect expires.
+
+        Args:
+            effect_name (str): name of the expired effect
+        """
+        if effect_name == "arcane_intellect" and self._arcane_intellect_bonus:
+            self.spell_power -= self._arcane_intellect_bonus
+            self._arcane_intellect_bonus = 0
 
     # ------------------------------------------------------------------------ #
     def heal_up(self, heal_amount: int) -> None:
@@ -162,11 +158,16 @@ class FireMageSpells(IBaseHero):
         Args:
             heal_amount (int): value of the incoming heal
         """
+        health = self._curr_health
         self._curr_health += heal_amount
 
         if self._curr_health > self.max_health:
             self._curr_health = self.max_health
 
+        events = self.event_bus
+        if events is not None and events.publish_heal is not None:
+            events.publish_heal(self, events.casting, self._curr_health - health)
+
     # ------------------------------------------------------------------------ #
     def add_specific_stat(self, stat_value: int = 0) -> None:
         """
@@ -177,11 +178,16 @@ class FireMageSpells(IBaseHero):
             stat_value (int, optional): Adds the generated fire stacks to the currently available.
         """
 
+        resource = self._curr_fire_stacks
         self._curr_fire_stacks += stat_value
 
         if self._curr_fire_stacks >= self._max_fire_stacks:
             self._curr_fire_stacks = self._max_fire_stacks
 
+        events = self.event_bus
+        if events is not None and events.publish_resource_gain is not None:
+            events.publish_resource_gain(self, self._curr_fire_stacks - resource)
+
     # ------------------------------------------------------------------------ #
     def is_specific_stat_spent(self, stat_value: int) -> bool:
         """
@@ -196,15 +202,9 @@ class FireMageSpells(IBaseHero):
 
         if self._curr_fire_stacks == stat_value:
             self._curr_fire_stacks = 0
+            events = self.event_bus
+            if events is not None and events.publish_resource_spend is not None:
+                events.publish_resource_spend(self, stat_value)
             return True
         else:
             return False
-
-    # ------------------------------------------------------------------------ #
-    def create_hero(self, hero_instance: IBaseHero):
-        if isinstance(hero_instance, FireMageSpells):
-            hero_instance.max_health = 700
-            hero_instance.max_secondary_pool = 900
-            hero_instance.spell_power = 110
-
-        return hero_instance
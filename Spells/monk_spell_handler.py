@@ -1,6 +1,5 @@
-import math
-
 from Heroes.hero_base_stats import IBaseHero
+from Spells.spell_records import SpellResult
 
 
 # ---------------------------------------------------------------------------- #
@@ -12,6 +11,8 @@ class MonkCommonSpells(IBaseHero):
     This class contains the common spells and abilities of the Monk.
     """
 
+    __slots__ = ("_curr_chi", "_max_chi", "_curr_energy")
+
     # ------------------------------------------------------------------------ #
     def __init__(self) -> None:
         super().__init__()
@@ -20,20 +21,6 @@ class MonkCommonSpells(IBaseHero):
         self._curr_health = self.max_health
         self._curr_energy = self.max_secondary_pool
 
-    # ------------------------------------------------------------------------ #
-    def create_hero(self, hero_instance: IBaseHero):
-        if isinstance(hero_instance, WindwalkerMonkSpells):
-            hero_instance.max_health = 800
-            hero_instance.max_secondary_pool = 300
-            hero_instance.attack_power = 65
-
-        elif isinstance(hero_instance, BrewmasterMonkSpells):
-            hero_instance.max_health = 1100
-            hero_instance.max_secondary_pool = 200
-            hero_instance.attack_power = 45
-
-        return hero_instance
-
     # ------------------------------------------------------------------------ #
     def is_specific_stat_spent(self, stat_value: int) -> bool:
         """
@@ -47,6 +34,9 @@ class MonkCommonSpells(IBaseHero):
         """
         if self._curr_chi >= stat_value:
             self._curr_chi -= stat_value
+            events = self.event_bus
+            if events is not None and events.publish_resource_spend is not None:
+                events.publish_resource_spend(self, stat_value)
             return True
 
         return False
@@ -60,10 +50,15 @@ class MonkCommonSpells(IBaseHero):
         Args:
             chi_generated (int): The amount of chi generated by the spell.
         """
+        resource = self._curr_chi
         self._curr_chi += stat_value
 
         self._curr_chi = min(self._curr_chi, self._max_chi)
 
+        events = self.event_bus
+        if events is not None and events.publish_resource_gain is not None:
+            events.publish_resource_gain(self, self._curr_chi - resource)
+
     # ------------------------------------------------------------------------ #
     def heal_up(self, heal_amount: int) -> None:
         """
@@ -72,24 +67,27 @@ class MonkCommonSpells(IBaseHero):
         Args:
             heal_ammount (int): The amount of health to heal.
         """
+        health = self._curr_health
         self._curr_health += heal_amount
 
         self._curr_health = min(self._curr_health, self.max_health)
 
+        events = self.event_bus
+        if events is not None and events.publish_heal is not None:
+            events.publish_heal(self, events.casting, self._curr_health - health)
+
     # ------------------------------------------------------------------------ #
-    def cast_spinning_crane_kick(self) -> dict[str, int]:
+    def cast_spinning_crane_kick(self) -> SpellResult:
         """
         Spin while kicking in the air, dealing damage to all enemies in the area.
 
         Returns:
-            _type_: _description_
+            SpellResult: spell damage, spell cost, cooldown
         """
-        self.spell_attributes["cooldown"] = 2
-        self.spell_attributes["spell_cost"] = 40
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 40 / 100)
-        self._curr_energy -= self.spell_attributes["spell_cost"]
+        spell = self._spell_table["cast_spinning_crane_kick"]
+        self._curr_energy -= spell.result.spell_cost
 
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
     def cast_vivify(self) -> None:
@@ -99,12 +97,10 @@ class MonkCommonSpells(IBaseHero):
         The spell costs 30 energy and heals for 258% of the spell power.
         The spell can only be cast if the player has enough energy to cast it.
         """
-
-        energy_cost = 30
-        amount_to_heal = math.ceil(self.spell_power * 258 / 100)
-        if energy_cost >= self._curr_energy:
-            self._curr_energy -= energy_cost
-            self.heal_up(amount_to_heal)
+        spell = self._spell_table["cast_vivify"]
+        if spell.result.spell_cost >= self._curr_energy:
+            self._curr_energy -= spell.result.spell_cost
+            self.heal_up(spell.healing)
 
 
 # ---------------------------------------------------------------------------- #
@@ -120,75 +116,65 @@ class WindwalkerMonkSpells(MonkCommonSpells):
         CommonSpellsMixin (cls): _mixin class for common spells
     """
 
+    __slots__ = ()
+
     # ------------------------------------------------------------------------ #
     def get_name(self) -> str:
         return "Windwalker Monk"
 
     # ------------------------------------------------------------------------ #
-    def cast_tiger_palm(self) -> dict[str, int]:
+    def cast_tiger_palm(self) -> SpellResult:
         """
         Strike with the palm of you hand, dealing physical damage to the target. Generates 2 chi.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
         """
-        generated_chi = 2
-        self.spell_attributes["cooldown"] = 1
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 12 / 100
-        )
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 28 / 100)
-        self._curr_energy -= self.spell_attributes["spell_cost"]
-        self.add_specific_stat(generated_chi)
+        spell = self._spell_table["cast_tiger_palm"]
+        self._curr_energy -= spell.result.spell_cost
+        self.add_specific_stat(spell.generation)
 
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_rising_sun_kick(self) -> dict[str, int]:
+    def cast_rising_sun_kick(self) -> SpellResult:
         """
-        Kick upwards, dealing damage to the target, dealing physical damage
+        Kick upwards, dealing damage to the target, dealing physical damage.
+        Without enough chi the kick only goes on cooldown, without dealing damage.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
         """
-        self.spell_attributes["cooldown"] = 1
-        chi_cost = 2
-        if self.is_specific_stat_spent(chi_cost):
-            self.spell_attributes["spell_damage"] = math.ceil(
-                self.attack_power * 28 / 100
-            )
+        spell = self._spell_table["cast_rising_sun_kick"]
+        if self.is_specific_stat_spent(spell.resource_cost):
+            return spell.result
 
-        return self.spell_attributes
+        return spell.no_resource
 
     # ------------------------------------------------------------------------ #
-    def cast_fists_of_fury(self) -> dict[str, int]:
+    def cast_fists_of_fury(self) -> SpellResult:
         """
         Pummel all targets in front of you, dealing physical damage.
+        Without enough chi the spell only goes on cooldown, without dealing damage.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
         """
-        chi_cost = 3
-        self.spell_attributes["cooldown"] = 2
-        if self.is_specific_stat_spent(chi_cost):
-            self.spell_attributes["spell_damage"] = math.ceil(
-                self.attack_power * 138 / 100
-            )
+        spell = self._spell_table["cast_fists_of_fury"]
+        if self.is_specific_stat_spent(spell.resource_cost):
+            return spell.result
 
-        return self.spell_attributes
+        return spell.no_resource
 
     # ------------------------------------------------------------------------ #
-    def cast_whirling_dragon_punch(self) -> dict[str, int]:
+    def cast_whirling_dragon_punch(self) -> SpellResult:
         """
         Perform a devastationg whirling upward stike, dealing damage to all targets in front of you.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
         """
-        self.spell_attributes["cooldown"] = 5
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 230 / 100)
-
-        return self.spell_attributes
+        return self._spell_table["cast_whirling_dragon_punch"].result
 
 
 # ---------------------------------------------------------------------------- #
@@ -204,85 +190,73 @@ class BrewmasterMonkSpells(MonkCommonSpells):
         CommonSpellsMixin (cls): _mixin class for common spells
     """
 
+    __slots__ = ()
+
     # ------------------------------------------------------------------------ #
     def get_name(self) -> str:
         return "Brewmaster Monk"
 
     # ------------------------------------------------------------------------ #
-    def cast_rushing_jade_wind(self) -> dict[str, int]:
+    def cast_rushing_jade_wind(self) -> SpellResult:
         """
         Summon a swirling wind around you, dealing damage to all enemies in the area.
+        Without enough chi the spell only goes on cooldown, without dealing damage.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
         """
-        chi_cost = 1
-        self.spell_attributes["cooldown"] = 1
-        if self.is_specific_stat_spent(chi_cost):
-            self.spell_attributes["spell_damage"] = math.ceil(
-                self.attack_power * 14 / 100
-            )
+        spell = self._spell_table["cast_rushing_jade_wind"]
+        if self.is_specific_stat_spent(spell.resource_cost):
+            return spell.result
 
-        return self.spell_attributes
+        return spell.no_resource
 
     # ------------------------------------------------------------------------ #
-    def cast_chi_burst(self) -> dict[str, int]:
+    def cast_chi_burst(self) -> SpellResult:
         """
         Launch a burst of chi energy, dealing damage to all enemies in the area.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
         """
-        self.spell_attributes["cooldown"] = 7
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 280 / 100)
-
-        return self.spell_attributes
+        return self._spell_table["cast_chi_burst"].result
 
     # ------------------------------------------------------------------------ #
-    def cast_keg_smash(self) -> dict[str, int]:
+    def cast_keg_smash(self) -> SpellResult:
         """
         Smash the target with your keg, dealing damage to the target and reducing the damage taken by 30% for 1 turn.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
         """
         # TODO: reset the damage reduction after 1 turn
 
-        spell_cost = 40
-        self.spell_attributes["spell_cost"] = spell_cost
-        self.spell_attributes["cooldown"] = 3
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 100 / 100)
-        self._curr_energy -= spell_cost
-        self.spell_attributes["damage_reduction"] = 30
+        spell = self._spell_table["cast_keg_smash"]
+        self._curr_energy -= spell.result.spell_cost
 
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_blackout_kick(self) -> dict[str, int]:
+    def cast_blackout_kick(self) -> SpellResult:
         """
         Kick the target with a blast of chi, dealing damage to the target.
+        Without enough chi the kick only goes on cooldown, without dealing damage.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
         """
-        chi_cost = 3
-        self.spell_attributes["cooldown"] = 1
-        if self.is_specific_stat_spent(chi_cost):
-            self.spell_attributes["spell_damage"] = math.ceil(
-                self.attack_power * 85 / 100
-            )
+        spell = self._spell_table["cast_blackout_kick"]
+        if self.is_specific_stat_spent(spell.resource_cost):
+            return spell.result
 
-        return self.spell_attributes
+        return spell.no_resource
 
     # ------------------------------------------------------------------------ #
-    def cast_breath_of_fire(self) -> dict[str, int]:
+    def cast_breath_of_fire(self) -> SpellResult:
         """
         Breath fire on the target, dealing fire damage infront of the hero.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
         """
-        self.spell_attributes["cooldown"] = 5
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 54 / 100)
-
-        return self.spell_attributes
+        return self._spell_table["cast_breath_of_fire"].result
@@ -1,6 +1,5 @@
-import math
-
 from Heroes.hero_base_stats import IBaseHero
+from Spells.spell_records import SpellResult
 
 
 # ---------------------------------------------------------------------------- #
@@ -12,6 +11,8 @@ class ShamanCommonSpells(IBaseHero):
     This class contains the common spells and abilities of the Shaman.
     """
 
+    __slots__ = ("_curr_maelstrom_stacks", "_max_maelstrom_stacks", "_curr_mana")
+
     # ------------------------------------------------------------------------ #
     def __init__(self):
         super().__init__()
@@ -20,16 +21,6 @@ class ShamanCommonSpells(IBaseHero):
         self._curr_health = self.max_health
         self._curr_mana = self.max_secondary_pool
 
-    # ------------------------------------------------------------------------ #
-    def create_hero(self, hero_instance: IBaseHero):
-        if isinstance(hero_instance, EnhancementShamanSpells):
-            hero_instance.max_health = 850
-            hero_instance.max_secondary_pool = 300
-            hero_instance.attack_power = 35
-            hero_instance.spell_power = 60
-
-        return hero_instance
-
     # ------------------------------------------------------------------------ #
     @staticmethod
     def __is_flame_shock_active(active_spells: list[str]) -> bool:
@@ -39,86 +30,65 @@ class ShamanCommonSpells(IBaseHero):
         return False
 
     # ------------------------------------------------------------------------ #
-    def cast_lighting_bolt(self) -> dict[str, int]:
+    def cast_lighting_bolt(self) -> SpellResult:
         """
         Hurls a bolt of lightning at the target, dealing nature damage.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
 
         """
-        self.spell_attributes["cooldown"] = 1
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 4 / 100
-        )
-        self.spell_attributes["spell_damage"] = math.ceil(self.spell_power * 131 / 100)
-        self._curr_mana -= self.spell_attributes["spell_cost"]
+        spell = self._spell_table["cast_lighting_bolt"]
+        self._curr_mana -= spell.result.spell_cost
 
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_flame_shock(self) -> dict[str, int]:
+    def cast_flame_shock(self) -> SpellResult:
         """
         Sears the target with fire, causing initial damage and then dealing damage over time.
 
         Returns:
-            tuple: initial spell damage, damage over time, cooldown, turns active
+            SpellResult: initial spell damage, damage over time, cooldown, turns active
 
         """
-        self.spell_attributes["cooldown"] = 5
-        self.spell_attributes["turns_active"] = 3
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 5 / 100
-        )
-        self.spell_attributes["initial_spell_damage"] = math.ceil(
-            self.spell_power * 30 / 100
-        )
-        self.spell_attributes["damage_over_time"] = math.ceil(
-            self.spell_power * 120 / 100
-        )
-        self._curr_health -= self.spell_attributes["spell_cost"]
-
-        return self.spell_attributes
+        spell = self._spell_table["cast_flame_shock"]
+        self._curr_health -= spell.result.spell_cost
+
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_primordial_wave(self) -> dict[str, int]:
+    def cast_primordial_wave(self) -> SpellResult:
         """
         Blast the target with a Primordial Wave of energy, dealing elemental damage.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
 
         """
-        self.spell_attributes["cooldown"] = 7
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 5 / 100
-        )
-        self.spell_attributes["spell_damage"] = math.ceil(self.spell_power * 525 / 100)
-        self._curr_mana -= self.spell_attributes["spell_cost"]
+        spell = self._spell_table["cast_primordial_wave"]
+        self._curr_mana -= spell.result.spell_cost
 
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_lava_burst(self, active_spells: list[str]) -> dict[str, int]:
+    def cast_lava_burst(self, active_spells: list[str]) -> SpellResult:
         """
         Hurls a molten lava ball towards the target, dealing fire damage. Lava Burst will
         always critically strike if the target is affected by Flame Shock.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
 
         """
-        self.spell_attributes["cooldown"] = 2
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 5 / 100
-        )
-        self.spell_attributes["spell_damage"] = math.ceil(self.spell_power * 140 / 100)
-        self._curr_mana -= self.spell_attributes["spell_cost"]
-
+        spell = self._spell_table["cast_lava_burst"]
+        result = spell.result
         if self.__is_flame_shock_active(active_spells):
-            self.spell_attributes["spell_damage"] *= 2
+            result = spell.empowered
 
-        return self.spell_attributes
+        self._curr_mana -= result.spell_cost
+
+        return result
 
     # ------------------------------------------------------------------------ #
     def heal_up(self, heal_amount: int) -> None:
@@ -129,11 +99,16 @@ class ShamanCommonSpells(IBaseHero):
         Args:
             heal_amount (int): value of the incoming heal
         """
+        health = self._curr_health
         self._curr_health += heal_amount
 
         if self._curr_health > self.max_health:
             self._curr_health = self.max_health
 
+        events = self.event_bus
+        if events is not None and events.publish_heal is not None:
+            events.publish_heal(self, events.casting, self._curr_health - health)
+
     # ------------------------------------------------------------------------ #
     def add_specific_stat(self, stat_value: int = 0) -> None:
         """
@@ -144,11 +119,16 @@ class ShamanCommonSpells(IBaseHero):
             stat_value (int): Add the maelstrom stack to the amount currently available.
         """
 
+        resource = self._curr_maelstrom_stacks
         self._curr_maelstrom_stacks += stat_value
 
         if self._curr_maelstrom_stacks >= self._max_maelstrom_stacks:
             self._curr_maelstrom_stacks = self._max_maelstrom_stacks
 
+        events = self.event_bus
+        if events is not None and events.publish_resource_gain is not None:
+            events.publish_resource_gain(self, self._curr_maelstrom_stacks - resource)
+
     # ------------------------------------------------------------------------ #
     def is_specific_stat_spent(self, stat_value: int) -> bool:
         """
@@ -162,6 +142,9 @@ class ShamanCommonSpells(IBaseHero):
         """
         if self._curr_maelstrom_stacks >= stat_value:
             self._curr_maelstrom_stacks -= stat_value
+            events = self.event_bus
+            if events is not None and events.publish_resource_spend is not None:
+                events.publish_resource_spend(self, stat_value)
             return True
         else:
             return False
@@ -174,86 +157,65 @@ class EnhancementShamanSpells(ShamanCommonSpells):
     This class contains the spells and abilities of the Enhancement Shaman.
     """
 
+    __slots__ = ()
+
     # ------------------------------------------------------------------------ #
     def get_name(self) -> str:
         return "Enhancement Shaman"
 
     # ------------------------------------------------------------------------ #
-    def cast_stormstrike(self) -> dict[str, int]:
+    def cast_stormstrike(self) -> SpellResult:
         """
         Energizes both weapons with lightning and delivers a massive blow to your target,
         dealing Physical damage.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
 
         """
+        spell = self._spell_table["cast_stormstrike"]
+        self._curr_mana -= spell.result.spell_cost
 
-        self.spell_attributes["cooldown"] = 2
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 5 / 100
-        )
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 400 / 100)
-        self._curr_mana -= self.spell_attributes["spell_cost"]
-
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_lava_lash(self) -> dict[str, int]:
+    def cast_lava_lash(self) -> SpellResult:
         """
         Charges your off-hand weapon with lava and burns your target, dealing Fire damage.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
 
         """
+        spell = self._spell_table["cast_lava_lash"]
+        self._curr_mana -= spell.result.spell_cost
 
-        self.spell_attributes["cooldown"] = 2
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 3 / 100
-        )
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 240 / 100)
-        self._curr_mana -= self.spell_attributes["spell_cost"]
-
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_tempest(self) -> dict[str, int]:
+    def cast_tempest(self) -> SpellResult:
         """
         Calls down a tremendous lightning strike, dealing Nature damage to you target.
 
         Returns:
-            tuple: spell damage, cooldown
+            SpellResult: spell damage, cooldown
 
         """
+        spell = self._spell_table["cast_tempest"]
+        self._curr_mana -= spell.result.spell_cost
 
-        self.spell_attributes["cooldown"] = 5
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 3 / 100
-        )
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 310 / 100)
-        self._curr_mana -= self.spell_attributes["spell_cost"]
-
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_feral_spirit(self) -> dict[str, int]:
+    def cast_feral_spirit(self) -> SpellResult:
         """
         Summon two Spirit Wolves to fight by your side for 4 turns.
 
         Returns:
-            tuple: spell damage, cooldown, turns active
+            SpellResult: spell damage, cooldown, turns active
 
         """
+        spell = self._spell_table["cast_feral_spirit"]
+        self._curr_mana -= spell.result.spell_cost
 
-        self.spell_attributes["cooldown"] = 8
-        self.spell_attributes["turns_active"] = 4
-        self.spell_attributes["spell_cost"] = math.ceil(
-            self.max_secondary_pool * 5 / 100
-        )
-        self.spell_attributes["spell_damage"] = math.ceil(
-            self.attack_power * 80 / 100
-        ) + math.ceil(self.spell_power * 80 / 100)
-        self._curr_mana -= self.spell_attributes["spell_cost"]
-
-        return self.spell_attributes
+        return spell.result
@@ -0,0 +1,24 @@
+"""
+Immutable records, which are returned by the cast methods of all heroes.
+"""
+
+from typing import NamedTuple
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class SpellResult(NamedTuple):
+    """
+    Result of a single cast. Every spell fills only the fields it uses, the rest stay zero.
+    The records are shared between casts, so they must never be modified.
+    """
+
+    spell_cost: int = 0
+    spell_damage: int = 0
+    cooldown: int = 0
+    turns_active: int = 0
+    damage_reduction: int = 0
+    initial_spell_damage: int = 0
+    health_leech: int = 0
+    damage_over_time: int = 0
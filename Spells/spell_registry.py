@@ -0,0 +1,100 @@
+"""
+Per spec registry of the spells, which is built once when a hero class is defined.
+Every "cast_*" method gets an integer id and an entry with the unbound method and its metadata,
+so a spell can be dispatched by id or by name with a single dict lookup.
+"""
+
+import inspect
+import sys
+from collections.abc import Callable
+from typing import NamedTuple
+
+from Heroes.spec_data import SpellDefinition
+
+# --------------------------------- Constants -------------------------------- #
+SPELL_PREFIX = "cast_"
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class SpellEntry(NamedTuple):
+    """
+    A single spell of a spec. The method is unbound, so it is called with the hero as first argument.
+    Spells which take extra arguments, like Lava Burst with the active effects of the target, are marked.
+    """
+
+    spell_id: int
+    name: str
+    method: Callable
+    takes_args: bool
+    definition: SpellDefinition
+    cooldown: int
+    resource_cost: int
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class SpellRegistry:
+    """
+    All spells of a spec, in alphabetical order. The id of a spell is its position in that order.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, hero_cls: type) -> None:
+        definitions = getattr(hero_cls, "spell_definitions", {})
+        names = sorted(name for name in dir(hero_cls) if name.startswith(SPELL_PREFIX))
+
+        entries = []
+        for spell_id, name in enumerate(names):
+            name = sys.intern(name)
+            method = getattr(hero_cls, name)
+            definition = definitions.get(name, SpellDefinition())
+            entries.append(
+                SpellEntry(
+                    spell_id,
+                    name,
+                    method,
+                    # Instrumented spells are wrapped, the arguments are those of the original
+                    inspect.unwrap(method).__code__.co_argcount > 1,
+                    definition,
+                    definition.cooldown,
+                    definition.resource_cost,
+                )
+            )
+
+        self.entries: tuple[SpellEntry, ...] = tuple(entries)
+        self.names: tuple[str, ...] = tuple(entry.name for entry in entries)
+        self.spells_with_args: frozenset[str] = frozenset(
+            entry.name for entry in entries if entry.takes_args
+        )
+        # Ids and names are kept apart, so a key such as True is never taken for the id 1
+        self._by_id: dict[int, SpellEntry] = {entry.spell_id: entry for entry in entries}
+        self._by_name: dict[str, SpellEntry] = {entry.name: entry for entry in entries}
+
+    # ------------------------------------------------------------------------ #
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ------------------------------------------------------------------------ #
+    def __contains__(self, spell: int | str) -> bool:
+        return self.get(spell) is not None
+
+    # ------------------------------------------------------------------------ #
+    def get(self, spell: int | str) -> SpellEntry | None:
+        """
+        Get a spell by its id or name.
+
+        Args:
+            spell (int | str): id of the spell or name of its method, for example "cast_judgement"
+
+        Returns:
+            SpellEntry | None: the spell or None if the spec has no such spell or the key is neither
+            an id nor a name
+        """
+        if isinstance(spell, str):
+            return self._by_name.get(spell)
+        if isinstance(spell, bool):
+            return None
+        return self._by_id.get(spell)
@@ -0,0 +1,129 @@
+"""
+Compiled per-spec spell tables, built from the declarative spell definitions of the spec data.
+Every spec describes the numbers of its spells once, in the spec definitions data file. When a hero
+is created, or when one of its stats changes, the definitions are compiled into ready spell results,
+so casting only has to look them up.
+"""
+
+import math
+from typing import TYPE_CHECKING, NamedTuple
+
+from Heroes.spec_data import SpellDefinition
+from Spells.spell_records import SpellResult
+
+if TYPE_CHECKING:
+    from Heroes.hero_base_stats import IBaseHero
+
+# --------------------------------- Constants -------------------------------- #
+MAX_COMPILED_TABLES = 4096
+
+_compiled_tables: dict[tuple, dict[str, "CompiledSpell"]] = {}
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class CompiledSpell(NamedTuple):
+    """
+    Spell definition compiled for the current stats of a hero.
+    Besides the normal result, it holds the result with doubled damage (fire stacks or Flame Shock)
+    and the result of a cast without enough class resource, which only triggers the cooldown.
+    """
+
+    result: SpellResult
+    empowered: SpellResult
+    no_resource: SpellResult
+    healing: int
+    generation: int
+    resource_cost: int
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def _percent(value: int, percent: int) -> int:
+    return math.ceil(value * percent / 100) if percent else 0
+
+
+# ---------------------------------------------------------------------------- #
+def compile_spell(definition: SpellDefinition, hero: "IBaseHero") -> CompiledSpell:
+    """
+    Compile a single spell definition for the current stats of the hero.
+
+    Args:
+        definition (SpellDefinition): numbers of the spell
+        hero (IBaseHero): hero which casts the spell
+
+    Returns:
+        CompiledSpell: ready results of the spell
+    """
+    initial_damage = _percent(hero.spell_power, definition.initial_damage)
+    result = SpellResult(
+        spell_cost=_percent(hero.max_secondary_pool, definition.cost) + definition.flat_cost,
+        spell_damage=_percent(hero.attack_power, definition.attack_power)
+        + _percent(hero.spell_power, definition.spell_power),
+        cooldown=definition.cooldown,
+        turns_active=definition.turns_active,
+        damage_reduction=min(
+            definition.damage_reduction
+            + _percent(hero.attack_power, definition.damage_reduction_attack_power),
+            hero.max_damage_reduction,
+        ),
+        initial_spell_damage=initial_damage,
+        health_leech=_percent(initial_damage, definition.health_leech),
+        damage_over_time=_percent(hero.spell_power, definition.damage_over_time)
+        + _percent(initial_damage, definition.damage_over_time_initial),
+    )
+
+    return CompiledSpell(
+        result=result,
+        empowered=result._replace(spell_damage=result.spell_damage * 2),
+        no_resource=SpellResult(cooldown=definition.cooldown),
+        healing=_percent(hero.spell_power, definition.heal_spell_power)
+        + _percent(hero.max_health, definition.heal_max_health),
+        generation=definition.generation,
+        resource_cost=definition.resource_cost,
+    )
+
+
+# ---------------------------------------------------------------------------- #
+def compile_spell_table(hero: "IBaseHero") -> dict[str, CompiledSpell]:
+    """
+    Compile the spell definitions of the hero's spec for its current stats.
+    Heroes of the same spec with the same stats share the same table, so it is built only once.
+
+    Args:
+        hero (IBaseHero): hero for which the table is compiled
+
+    Returns:
+        dict[str, CompiledSpell]: compiled spells by spell name. Must not be modified.
+    """
+    hero_cls = type(hero)
+    key = (
+        hero_cls,
+        hero.max_health,
+        hero.max_secondary_pool,
+        hero.spell_power,
+        hero.attack_power,
+        hero.max_damage_reduction,
+    )
+    table = _compiled_tables.get(key)
+    if table is None:
+        if len(_compiled_tables) >= MAX_COMPILED_TABLES:
+            _compiled_tables.clear()
+        table = {
+            spell_name: compile_spell(definition, hero)
+            for spell_name, definition in hero_cls.spell_definitions.items()
+        }
+        _compiled_tables[key] = table
+
+    return table
+
+
+# ---------------------------------------------------------------------------- #
+def clear_spell_tables() -> None:
+    """
+    Drop all compiled spell tables, so they are compiled again from the current spell definitions.
+    Needed after the definitions of a spec were changed, for example by a balance sweep.
+    """
+    _compiled_tables.clear()
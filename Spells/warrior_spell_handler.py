@@ -1,6 +1,5 @@
-import math
-
 from Heroes.hero_base_stats import IBaseHero
+from Spells.spell_records import SpellResult
 
 
 # ---------------------------------------------------------------------------- #
@@ -12,6 +11,8 @@ class WarriorCommonSpells(IBaseHero):
     This class contains the common spells and abilities of the Warrior.
     """
 
+    __slots__ = ("_curr_rage", "_max_rage")
+
     # ------------------------------------------------------------------------ #
     def __init__(self) -> None:
         super().__init__()
@@ -19,24 +20,13 @@ class WarriorCommonSpells(IBaseHero):
         self._curr_health = self.max_health
         self._max_rage = self.max_secondary_pool
 
-    # ------------------------------------------------------------------------ #
-    def create_hero(self, hero_instance: IBaseHero):
-        if isinstance(hero_instance, FuryWarriorSpells):
-            hero_instance.max_health = 1000
-            hero_instance.max_secondary_pool = 200
-            hero_instance.attack_power = 70
-
-        elif isinstance(hero_instance, ProtectionWarriorSpells):
-            hero_instance.max_health = 1500
-            hero_instance.max_secondary_pool = 200
-            hero_instance.attack_power = 50
-
-        return hero_instance
-
     # ------------------------------------------------------------------------ #
     def is_specific_stat_spent(self, stat_value: int) -> bool:
         if self._curr_rage >= stat_value:
             self._curr_rage -= stat_value
+            events = self.event_bus
+            if events is not None and events.publish_resource_spend is not None:
+                events.publish_resource_spend(self, stat_value)
             return True
 
         return False
@@ -52,11 +42,16 @@ class WarriorCommonSpells(IBaseHero):
             heal_ammount (float): amount of incoming heal
         """
 
+        health = self._curr_health
         if self._curr_health + heal_amount > self.max_health:
             self._curr_health = self.max_health
         else:
             self._curr_health += heal_amount
 
+        events = self.event_bus
+        if events is not None and events.publish_heal is not None:
+            events.publish_heal(self, events.casting, self._curr_health - health)
+
     # ------------------------------------------------------------------------ #
     def add_specific_stat(self, stat_value: int) -> None:
         """
@@ -67,11 +62,16 @@ class WarriorCommonSpells(IBaseHero):
             stat_value (int): amount of generated rage
         """
 
+        resource = self._curr_rage
         if self._curr_rage + stat_value > self._max_rage:
             self._curr_rage = self._max_rage
         else:
             self._curr_rage += stat_value
 
+        events = self.event_bus
+        if events is not None and events.publish_resource_gain is not None:
+            events.publish_resource_gain(self, self._curr_rage - resource)
+
 
 # ---------------------------------------------------------------------------- #
 class FuryWarriorSpells(WarriorCommonSpells):
@@ -81,85 +81,66 @@ class FuryWarriorSpells(WarriorCommonSpells):
     It inherits from the IBaseHero class and implements the spells and abilities of the Fury Warrior.
     """
 
+    __slots__ = ()
+
     # ------------------------------------------------------------------------ #
     def get_name(self) -> str:
         return "Fury Warrior"
 
     # ------------------------------------------------------------------------ #
-    def cast_bladestorm(self) -> dict[str, int]:
+    def cast_bladestorm(self) -> SpellResult:
         """
         Become and unstoppable storm of destructive force, striking your enemy,
         dealing Physiscal damage.
 
         Returns:
-            dict: spell damage, cooldown
+            SpellResult: spell damage, cooldown
         """
-        rage_generated = 10
-        self.add_specific_stat(rage_generated)
-
-        self.spell_attributes["spell_cost"] = 0
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 140 / 100)
-        self.spell_attributes["cooldown"] = 8
+        spell = self._spell_table["cast_bladestorm"]
+        self.add_specific_stat(spell.generation)
 
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_rampage(self) -> dict[str, int] | None:
+    def cast_rampage(self) -> SpellResult | None:
         """
         Enrages you and unleashes a flurry of brutal attacks, dealing Physical damage.
         The spell requires 80 rage to cast.
 
         Returns:
-            dict: spell_cost, spell_damage
+            SpellResult: spell_cost, spell_damage
         """
+        spell = self._spell_table["cast_rampage"]
 
-        self.spell_attributes["spell_cost"] = 80
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 230 / 100)
-
-        return (
-            self.spell_attributes
-            if self.is_specific_stat_spent(self.spell_attributes["spell_cost"])
-            else None
-        )
+        return spell.result if self.is_specific_stat_spent(spell.resource_cost) else None
 
     # ------------------------------------------------------------------------ #
-    def cast_bloodbath(self) -> dict[str, int]:
+    def cast_bloodbath(self) -> SpellResult:
         """
         Assault the target in a bloodthirsty craze, dealing Physical damage and
         restoring 3% of your health.
 
         Returns:
-            dict: spell_cost, spell_damage, cooldown
+            SpellResult: spell_cost, spell_damage, cooldown
         """
-        rage_generated = 8
-        health_restored = math.ceil(self.max_health * 3 / 100)
-
-        self.add_specific_stat(rage_generated)
-        self.heal_up(health_restored)
-
-        self.spell_attributes["spell_cost"] = 0
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 390 / 100)
-        self.spell_attributes["cooldown"] = 3
+        spell = self._spell_table["cast_bloodbath"]
+        self.add_specific_stat(spell.generation)
+        self.heal_up(spell.healing)
 
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_raging_blow(self) -> dict[str, int]:
+    def cast_raging_blow(self) -> SpellResult:
         """
         A might blow with both weapons, that deals Physical damage.
 
         Returns:
-            dict: spell_cost, spell_damage, cooldown
+            SpellResult: spell_cost, spell_damage, cooldown
         """
+        spell = self._spell_table["cast_raging_blow"]
+        self.add_specific_stat(spell.generation)
 
-        rage_generated = 12
-        self.add_specific_stat(rage_generated)
-
-        self.spell_attributes["spell_cost"] = 0
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 400 / 100)
-        self.spell_attributes["cooldown"] = 4
-
-        return self.spell_attributes
+        return spell.result
 
 
 # ---------------------------------------------------------------------------- #
@@ -170,118 +151,92 @@ class ProtectionWarriorSpells(WarriorCommonSpells):
     It inherits from the IBaseHero class and implements the spells and abilities of the Protection Warrior.
     """
 
+    __slots__ = ()
+
     # ------------------------------------------------------------------------ #
     def get_name(self) -> str:
         return "Protection Warrior"
 
     # ------------------------------------------------------------------------ #
-    def cast_charge(self) -> dict[str, int]:
+    def cast_charge(self) -> SpellResult:
         """
         Charge to an enemy dealing physical damage and generating 20 rage.
 
         Returns:
-            dict: spell_cost, spell_damage, cooldown
+            SpellResult: spell_cost, spell_damage, cooldown
         """
+        spell = self._spell_table["cast_charge"]
+        self.add_specific_stat(spell.generation)
 
-        rage_generated = 20
-        self.add_specific_stat(rage_generated)
-
-        self.spell_attributes["spell_cost"] = 0
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 50 / 100)
-        self.spell_attributes["cooldown"] = 7
-
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_shield_block(self) -> dict[str, int] | None:
+    def cast_shield_block(self) -> SpellResult | None:
         """
         Raise your shield, blocking 100% of incoming damage for 2 turns.
 
         Returns:
-            dict: spell_cost, damage_reduction, cooldown
+            SpellResult: spell_cost, damage_reduction, cooldown, turns_active
         """
-        spell_cost = 30
-
-        if self.is_specific_stat_spent(spell_cost):
-            self.spell_attributes["spell_cost"] = 30
-            self.spell_attributes["damage_reduction"] = self.max_damage_reduction
-            self.spell_attributes["cooldown"] = 2
+        spell = self._spell_table["cast_shield_block"]
 
-            return self.spell_attributes
+        if self.is_specific_stat_spent(spell.resource_cost):
+            return spell.result
 
         return None
 
     # ------------------------------------------------------------------------ #
-    def cast_champions_spear(self) -> dict[str, int]:
+    def cast_champions_spear(self) -> SpellResult:
         """
         Throw a spear at the target, dealing Physical damage and generating 10 rage.
 
         Returns:
-            dict: spell_damage, cooldown
+            SpellResult: spell_damage, cooldown
         """
+        spell = self._spell_table["cast_champions_spear"]
+        self.add_specific_stat(spell.generation)
 
-        rage_generated = 10
-        self.add_specific_stat(rage_generated)
-
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 240 / 100)
-        self.spell_attributes["cooldown"] = 10
-
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_shield_charge(self) -> dict[str, int]:
+    def cast_shield_charge(self) -> SpellResult:
         """
         Charge to an enemy with your shield, dealing Physical damage and generating 20 rage.
 
         Returns:
-            dict: spell_cost, spell_damage, cooldown
+            SpellResult: spell_cost, spell_damage, cooldown
         """
+        spell = self._spell_table["cast_shield_charge"]
+        self.add_specific_stat(spell.generation)
 
-        rage_generated = 20
-        self.add_specific_stat(rage_generated)
-
-        self.spell_attributes["spell_cost"] = 0
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 420 / 100)
-        self.spell_attributes["cooldown"] = 8
-
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_sheild_slam(self) -> dict[str, int]:
+    def cast_sheild_slam(self) -> SpellResult:
         """
         Slams the target with your shield, dealing Physical damage and generating 15 rage.
 
         Returns:
-            dict: spell_cost, spell_damage, cooldown
+            SpellResult: spell_cost, spell_damage, cooldown
         """
+        spell = self._spell_table["cast_sheild_slam"]
+        self.add_specific_stat(spell.generation)
 
-        rage_generated = 15
-        self.add_specific_stat(rage_generated)
-
-        self.spell_attributes["spell_cost"] = 0
-        self.spell_attributes["spell_damage"] = math.ceil(self.attack_power * 130 / 100)
-        self.spell_attributes["cooldown"] = 2
-
-        return self.spell_attributes
+        return spell.result
 
     # ------------------------------------------------------------------------ #
-    def cast_ignore_pain(self) -> dict[str, int] | None:
+    def cast_ignore_pain(self) -> SpellResult | None:
         """
         Fight through the pain, ingoring 50% of incoming damage for 1 turn.
         This spell costs 35 rage to cast.
 
         Returns:
-            dict: spell_cost, damage_reduction, cooldown, turns_active
+            SpellResult: spell_cost, damage_reduction, cooldown, turns_active
         """
-        spell_cost = 35
-
-        if self.is_specific_stat_spent(spell_cost):
-            self.spell_attributes["spell_cost"] = 35
-            self.spell_attributes["damage_reduction"] = 50
-            self.spell_attributes["cooldown"] = 0
-            self.spell_attributes["turns_active"] = 1
+        spell = self._spell_table["cast_ignore_pain"]
 
-            return self.spell_attributes
+        if self.is_specific_stat_spent(spell.resource_cost):
+            return spell.result
 
         return None
 
@@ -0,0 +1,417 @@
+"""
+Compact binary battle log. Every action of a duel is stored as a fixed width, struct packed record
+in an append-only file, together with the change of health, pool and class resource of both heroes.
+Each duel starts with a header record, which holds the initial state of both heroes, the outcome
+and the amount of records of the duel, so the replayer rebuilds the final state of a duel by summing
+the columns of its records, without running any spell logic.
+The file starts with a digest of the spec keys and spell names, since the records store only their ids.
+"""
+
+import array
+import hashlib
+import json
+import mmap
+import operator
+import struct
+import sys
+from collections.abc import Callable, Iterator
+from typing import NamedTuple
+
+from Heroes.hero_base_stats import IBaseHero
+from Heroes.hero_factory import HeroFactory
+from Heroes.hero_layout import get_hero_layout
+from Spells.spell_records import SpellResult
+
+# --------------------------------- Constants -------------------------------- #
+FILE_MAGIC = b"WOWLOG\x00\x02"
+FILE_HEADER_SIZE = len(FILE_MAGIC) + hashlib.sha256().digest_size
+# turn, kind, role, spec id, spell id, damage, mitigation and the state columns of both heroes
+RECORD = struct.Struct("<i4B8i")
+RECORD_WORDS = RECORD.size // 4
+STATE_COLUMN = 4
+
+KIND_DUEL = 0
+KIND_CAST = 1
+KIND_TICK = 2
+
+ROLE_ATTACKER = 0
+ROLE_DEFENDER = 1
+
+SPEC_KEYS: tuple[tuple[str, str], ...] = tuple(HeroFactory._hero_registry)
+SPEC_IDS: dict[tuple[str, str], int] = {key: spec_id for spec_id, key in enumerate(SPEC_KEYS)}
+
+_WINNER_CODES = {None: 0, "attacker": 1, "defender": 2}
+_WINNERS = {code: winner for winner, code in _WINNER_CODES.items()}
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class BattleLogRecord(NamedTuple):
+    """
+    A single record of the log. For the header of a duel the role holds the winner code, the spec and spell
+    ids hold the attacker and defender spec ids, the damage holds the amount of records of the duel and
+    the state columns hold the initial state. For actions the state columns hold the changes.
+    """
+
+    turn: int
+    kind: int
+    role: int
+    spec_id: int
+    spell_id: int
+    damage: int
+    mitigation: int
+    attacker_health: int
+    attacker_pool: int
+    attacker_resource: int
+    defender_health: int
+    defender_pool: int
+    defender_resource: int
+
+
+# ---------------------------------------------------------------------------- #
+class HeroState(NamedTuple):
+    health: int
+    pool: int
+    resource: int
+
+
+# ---------------------------------------------------------------------------- #
+class ReplayedDuel(NamedTuple):
+    """
+    Outcome and final state of a duel, rebuilt from the log.
+    """
+
+    attacker: tuple[str, str]
+    defender: tuple[str, str]
+    winner: str | None
+    turns: int
+    attacker_state: HeroState
+    defender_state: HeroState
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Helpers                                   #
+# ---------------------------------------------------------------------------- #
+def get_spec_table_digest(include_spells: bool = True) -> bytes:
+    """
+    Hash the tables, which turn the stored ids back into names - the spec keys and the spell names
+    of every spec. A file written with other tables would be decoded to the wrong specs and spells.
+
+    Args:
+        include_spells (bool): hash the spell names as well, stores of outcomes keep only the spec ids
+
+    Returns:
+        bytes: SHA-256 digest of the tables
+    """
+    registry = HeroFactory._hero_registry
+    table = [
+        [":".join(key), list(registry[key].spell_registry.names) if include_spells else []]
+        for key in SPEC_KEYS
+    ]
+    return hashlib.sha256(json.dumps(table, separators=(",", ":")).encode()).digest()
+
+
+# ---------------------------------------------------------------------------- #
+def check_file_header(header: bytes, magic: bytes, digest: bytes, path: str) -> None:
+    """
+    Check that a file was written by this version with the current spec tables.
+
+    Args:
+        header (bytes): first bytes of the file
+        magic (bytes): magic of the file type
+        digest (bytes): digest of the current spec tables
+        path (str): path of the file, for the error message
+
+    Raises:
+        ValueError: if the file has another type or was written with other spec tables
+    """
+    if header[: len(magic)] != magic:
+        raise ValueError(f"Not a {magic[:6].decode()} file of this version: {path}")
+    if header[len(magic) : len(magic) + len(digest)] != digest:
+        raise ValueError(f"{path} was written with other specs or spells, its ids can not be read")
+
+
+# ---------------------------------------------------------------------------- #
+def get_state_getter(hero: IBaseHero) -> Callable[[IBaseHero], tuple[int, int, int]]:
+    """
+    Get a function, which reads the health, pool and class resource of a hero.
+    Heroes without a pool always report a pool of zero.
+
+    Args:
+        hero (IBaseHero): hero, whose state will be read
+
+    Returns:
+        Callable: returns the state of the hero as (health, pool, resource)
+    """
+    layout = get_hero_layout(type(hero))
+    if layout.pool is not None:
+        return operator.attrgetter("_curr_health", layout.pool, layout.resource)
+
+    get_health_and_resource = operator.attrgetter("_curr_health", layout.resource)
+
+    def get_state(hero: IBaseHero) -> tuple[int, int, int]:
+        health, resource = get_health_and_resource(hero)
+        return health, 0, resource
+
+    return get_state
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class BattleRecorder:
+    """
+    Writes the battle log. The records of a duel are collected in memory and appended to the file
+    together with the duel header, once the duel is over.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, path: str) -> None:
+        digest = get_spec_table_digest()
+        self._file = open(path, "ab", buffering=1 << 20)
+        if self._file.tell() == 0:
+            self._file.write(FILE_MAGIC + digest)
+        else:
+            # Records are only appended to a log with the same ids
+            with open(path, "rb") as log_file:
+                header = log_file.read(FILE_HEADER_SIZE)
+            try:
+                check_file_header(header, FILE_MAGIC, digest, path)
+            except ValueError:
+                self._file.close()
+                raise
+
+        self._buffer = bytearray()
+        self._records = 0
+        self._turn = 0
+        self._attacker: IBaseHero | None = None
+        self._defender: IBaseHero | None = None
+        self._spec_ids = (0, 0)
+        self._initial_state: tuple[int, ...] = ()
+        self._get_attacker_state = None
+        self._get_defender_state = None
+
+    # ------------------------------------------------------------------------ #
+    def __enter__(self) -> "BattleRecorder":
+        return self
+
+    # ------------------------------------------------------------------------ #
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------------ #
+    def close(self) -> None:
+        self._file.close()
+
+    # ------------------------------------------------------------------------ #
+    def begin_duel(
+        self,
+        attacker_key: tuple[str, str],
+        defender_key: tuple[str, str],
+        attacker: IBaseHero,
+        defender: IBaseHero,
+    ) -> None:
+        """
+        Start recording a new duel.
+
+        Args:
+            attacker_key (tuple[str, str]): key of the attacker in the hero registry
+            defender_key (tuple[str, str]): key of the defender in the hero registry
+            attacker (IBaseHero): the attacker
+            defender (IBaseHero): the defender
+        """
+        self._buffer.clear()
+        self._records = 0
+        self._turn = 0
+        self._attacker = attacker
+        self._defender = defender
+        self._spec_ids = (SPEC_IDS[attacker_key], SPEC_IDS[defender_key])
+        self._get_attacker_state = get_state_getter(attacker)
+        self._get_defender_state = get_state_getter(defender)
+        self._initial_state = self.snapshot()
+
+    # ------------------------------------------------------------------------ #
+    def start_turn(self, turn: int) -> None:
+        self._turn = turn
+
+    # ------------------------------------------------------------------------ #
+    def snapshot(self) -> tuple[int, ...]:
+        """
+        Read the state of both heroes.
+
+        Returns:
+            tuple[int, ...]: health, pool and class resource of the attacker, then of the defender
+        """
+        return self._get_attacker_state(self._attacker) + self._get_defender_state(self._defender)
+
+    # ------------------------------------------------------------------------ #
+    def record_cast(
+        self, caster: IBaseHero, spell_id: int, result: SpellResult | None, before: tuple[int, ...]
+    ) -> None:
+        """
+        Record a cast spell. Casts without a result are recorded as well, since they can still
+        change the state of the caster, for example Word of Glory.
+
+        Args:
+            caster (IBaseHero): hero which cast the spell
+            spell_id (int): id of the spell in the spell registry of the caster
+            result (SpellResult | None): result of the cast
+            before (tuple[int, ...]): snapshot taken before the cast
+        """
+        damage = result.spell_damage if result is not None else 0
+        self._record(KIND_CAST, caster is self._defender, spell_id, damage, before)
+
+    # ------------------------------------------------------------------------ #
+    def record_tick(
+        self, target: IBaseHero, effect_name: str, damage: int, before: tuple[int, ...]
+    ) -> None:
+        """
+        Record a damage over time tick.
+
+        Args:
+            target (IBaseHero): hero which took the damage
+            effect_name (str): name of the effect, for example "flame_shock"
+            damage (int): damage of the tick before mitigation
+            before (tuple[int, ...]): snapshot taken before the tick
+        """
+        caster = self._attacker if target is self._defender else self._defender
+        spell = type(caster).spell_registry.get(f"cast_{effect_name}")
+        self._record(KIND_TICK, caster is self._defender, spell.spell_id, damage, before)
+
+    # ------------------------------------------------------------------------ #
+    def end_duel(self, winner: str | None, turns: int) -> None:
+        """
+        Append the duel to the log.
+
+        Args:
+            winner (str | None): "attacker", "defender" or None for a draw
+            turns (int): amount of turns of the duel
+        """
+        header = RECORD.pack(
+            turns,
+            KIND_DUEL,
+            _WINNER_CODES[winner],
+            self._spec_ids[0],
+            self._spec_ids[1],
+            self._records + 1,
+            0,
+            *self._initial_state,
+        )
+        self._file.write(header)
+        self._file.write(self._buffer)
+        self._buffer.clear()
+
+    # ------------------------------------------------------------------------ #
+    def _record(
+        self, kind: int, is_defender: bool, spell_id: int, damage: int, before: tuple[int, ...]
+    ) -> None:
+        after = self.snapshot()
+        deltas = tuple(map(operator.sub, after, before))
+        role = ROLE_DEFENDER if is_defender else ROLE_ATTACKER
+        # Damage taken is the loss of health of the opponent, the rest was mitigated
+        damage_taken = -deltas[0 if is_defender else 3]
+        mitigation = damage - damage_taken if damage > 0 else 0
+        self._buffer += RECORD.pack(
+            self._turn, kind, role, self._spec_ids[role], spell_id, damage, mitigation, *deltas
+        )
+        self._records += 1
+
+
+# ---------------------------------------------------------------------------- #
+class BattleLogReader:
+    """
+    Reads a battle log through a memory map.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as log_file:
+            self._map = mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            check_file_header(self._map[:FILE_HEADER_SIZE], FILE_MAGIC, get_spec_table_digest(), path)
+        except ValueError:
+            self._map.close()
+            raise
+
+        self._data = memoryview(self._map)[FILE_HEADER_SIZE:]
+        if len(self._data) % RECORD.size:
+            self._data.release()
+            self._map.close()
+            raise ValueError(f"Battle log ends with an incomplete record: {path}")
+
+        # The records are little-endian, so only a little-endian host reads the words in place
+        if sys.byteorder == "little":
+            self._words = self._data.cast("i")
+        else:
+            words = struct.unpack(f"<{len(self._data) // 4}i", self._data)
+            self._words = memoryview(array.array("i", words))
+
+    # ------------------------------------------------------------------------ #
+    def __enter__(self) -> "BattleLogReader":
+        return self
+
+    # ------------------------------------------------------------------------ #
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------------ #
+    def __len__(self) -> int:
+        return len(self._data) // RECORD.size
+
+    # ------------------------------------------------------------------------ #
+    def close(self) -> None:
+        self._words.release()
+        self._data.release()
+        self._map.close()
+
+    # ------------------------------------------------------------------------ #
+    def iter_records(self) -> Iterator[BattleLogRecord]:
+        """
+        Decode every record of the log, for auditing.
+
+        Yields:
+            BattleLogRecord: records in the order they were written
+        """
+        # Records are decoded one at a time, so no buffer export outlives a partially consumed iterator
+        make = BattleLogRecord._make
+        unpack_from = RECORD.unpack_from
+        for offset in range(0, len(self._data), RECORD.size):
+            yield make(unpack_from(self._data, offset))
+
+    # ------------------------------------------------------------------------ #
+    def replay(self) -> Iterator[ReplayedDuel]:
+        """
+        Rebuild the outcome and the final state of every duel in the log.
+
+        Raises:
+            ValueError: if the duel headers do not match the records
+
+        Yields:
+            ReplayedDuel: duels in the order they were written
+        """
+        words = self._words
+        total_words = len(words)
+        position = 0
+        while position < total_words:
+            turns, packed, records = words[position], words[position + 1], words[position + 2]
+            if packed & 0xFF != KIND_DUEL or records < 1:
+                raise ValueError(f"Corrupt battle log at record {position // RECORD_WORDS}")
+
+            end = position + records * RECORD_WORDS
+            if end > total_words:
+                raise ValueError(f"Corrupt battle log at record {position // RECORD_WORDS}")
+            state = [
+                words[position + column] + sum(words[position + RECORD_WORDS + column : end : RECORD_WORDS])
+                for column in range(STATE_COLUMN, RECORD_WORDS)
+            ]
+            yield ReplayedDuel(
+                SPEC_KEYS[(packed >> 16) & 0xFF],
+                SPEC_KEYS[(packed >> 24) & 0xFF],
+                _WINNERS[(packed >> 8) & 0xFF],
+                turns,
+                HeroState(*state[:3]),
+                HeroState(*state[3:]),
+            )
+            position = end
@@ -0,0 +1,282 @@
+"""
+Store of battle outcomes in a memory-mapped file of fixed width records.
+The records are written in page sized extents, which hold the outcomes of a single pairing of an attacker
+and a defender spec only. A small sidecar index lists the extents of every pairing, so a query reads only
+the pages of the matching pairing, no matter how many other outcomes the store holds.
+The index starts with a digest of the spec keys, since the extents store only their ids.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator
+
+from Simulations.simulation_handler import ATTACKER, DEFENDER, BattleResult
+from Storage.battle_log import SPEC_IDS, SPEC_KEYS, check_file_header, get_spec_table_digest
+
+# --------------------------------- Constants -------------------------------- #
+INDEX_MAGIC = b"WOWIDX\x00\x02"
+INDEX_HEADER_SIZE = len(INDEX_MAGIC) + hashlib.sha256().digest_size
+INDEX_SUFFIX = ".idx"
+# winner code, turns, attacker health and defender health
+RECORD = struct.Struct("<B3xIii")
+# attacker spec id, defender spec id, amount of records of the extent and its offset in the data file
+EXTENT = struct.Struct("<BB2xIQ")
+PAGE_SIZE = mmap.PAGESIZE
+RECORDS_PER_EXTENT = PAGE_SIZE // RECORD.size
+
+ANY = "any"
+_WINNER_CODES = {None: 0, ATTACKER: 1, DEFENDER: 2}
+_WINNERS = {code: winner for winner, code in _WINNER_CODES.items()}
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Helpers                                   #
+# ---------------------------------------------------------------------------- #
+def get_index_path(path: str) -> str:
+    """
+    Get the path of the sidecar index of a store.
+
+    Args:
+        path (str): path of the data file of the store
+
+    Returns:
+        str: path of the index, the data path with the ".idx" suffix
+    """
+    return path + INDEX_SUFFIX
+
+
+# ---------------------------------------------------------------------------- #
+def read_index(path: str) -> dict[tuple[tuple[str, str], tuple[str, str]], list[tuple[int, int]]]:
+    """
+    Read the sidecar index of a store.
+
+    Args:
+        path (str): path of the data file of the store
+
+    Raises:
+        ValueError: if the index file is not an index of a results store or was written with other specs
+
+    Returns:
+        dict: offset and amount of records of every extent, by attacker and defender key
+    """
+    index_path = get_index_path(path)
+    if not os.path.exists(index_path):
+        return {}
+
+    with open(index_path, "rb") as index_file:
+        data = index_file.read()
+
+    check_file_header(data, INDEX_MAGIC, get_spec_table_digest(include_spells=False), index_path)
+    if (len(data) - INDEX_HEADER_SIZE) % EXTENT.size:
+        raise ValueError(f"Results store index ends with an incomplete extent: {index_path}")
+
+    index = {}
+    for attacker_id, defender_id, records, offset in EXTENT.iter_unpack(data[INDEX_HEADER_SIZE:]):
+        key = (SPEC_KEYS[attacker_id], SPEC_KEYS[defender_id])
+        index.setdefault(key, []).append((offset, records))
+
+    return index
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class ResultsWriter:
+    """
+    Appends battle outcomes to a store. The outcomes of every pairing are buffered until a full extent
+    is collected. Closing the writer writes the remaining extents, padded to a full page, and only then
+    the new entries of the index, so a reader never sees an extent, which was not completely written.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._file = open(path, "ab")
+        self._offset = self._file.seek(0, os.SEEK_END)
+        if self._offset % PAGE_SIZE:
+            self._file.close()
+            raise ValueError(f"Results store is not page aligned: {path}")
+        # Outcomes are only appended to a store with the same spec ids
+        try:
+            read_index(path)
+        except ValueError:
+            self._file.close()
+            raise
+
+        self._buffers: dict[tuple[int, int], bytearray] = {}
+        self._extents = bytearray()
+
+    # ------------------------------------------------------------------------ #
+    def __enter__(self) -> "ResultsWriter":
+        return self
+
+    # ------------------------------------------------------------------------ #
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------------ #
+    def append(
+        self, attacker_key: tuple[str, str], defender_key: tuple[str, str], result: BattleResult
+    ) -> None:
+        """
+        Append the outcome of a single duel.
+
+        Args:
+            attacker_key (tuple[str, str]): key of the attacker in the hero registry
+            defender_key (tuple[str, str]): key of the defender in the hero registry
+            result (BattleResult): outcome of the duel
+        """
+        spec_ids = (SPEC_IDS[attacker_key], SPEC_IDS[defender_key])
+        buffer = self._buffers.get(spec_ids)
+        if buffer is None:
+            buffer = self._buffers[spec_ids] = bytearray()
+
+        buffer += RECORD.pack(
+            _WINNER_CODES[result.winner], result.turns, result.attacker_health, result.defender_health
+        )
+        if len(buffer) == RECORDS_PER_EXTENT * RECORD.size:
+            self._write_extent(spec_ids, buffer)
+
+    # ------------------------------------------------------------------------ #
+    def record(
+        self,
+        attacker_key: tuple[str, str],
+        defender_key: tuple[str, str],
+        results: Iterable[BattleResult],
+    ) -> Iterator[BattleResult]:
+        """
+        Append the outcomes of many duels, while passing them on, for example to summarize_results.
+
+        Args:
+            attacker_key (tuple[str, str]): key of the attacker in the hero registry
+            defender_key (tuple[str, str]): key of the defender in the hero registry
+            results (Iterable[BattleResult]): outcomes of the duels
+
+        Yields:
+            BattleResult: every appended outcome
+        """
+        for result in results:
+            self.append(attacker_key, defender_key, result)
+            yield result
+
+    # ------------------------------------------------------------------------ #
+    def close(self) -> None:
+        """
+        Write the remaining outcomes and their index entries and close the store.
+        """
+        for spec_ids, buffer in self._buffers.items():
+            if buffer:
+                self._write_extent(spec_ids, buffer)
+
+        self._file.close()
+        if not self._extents:
+            return
+
+        index_path = get_index_path(self._path)
+        with open(index_path, "ab") as index_file:
+            if index_file.tell() == 0:
+                index_file.write(INDEX_MAGIC + get_spec_table_digest(include_spells=False))
+            index_file.write(self._extents)
+        self._extents.clear()
+
+    # ------------------------------------------------------------------------ #
+    def _write_extent(self, spec_ids: tuple[int, int], buffer: bytearray) -> None:
+        records = len(buffer) // RECORD.size
+        self._file.write(buffer)
+        self._file.write(bytes(PAGE_SIZE - len(buffer)))
+        self._extents += EXTENT.pack(*spec_ids, records, self._offset)
+        self._offset += PAGE_SIZE
+        buffer.clear()
+
+
+# ---------------------------------------------------------------------------- #
+class ResultsStore:
+    """
+    Reads the outcomes of a store through a memory map.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, path: str) -> None:
+        self._index = read_index(path)
+        self._map = None
+        if os.path.getsize(path):
+            with open(path, "rb") as data_file:
+                self._map = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # ------------------------------------------------------------------------ #
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    # ------------------------------------------------------------------------ #
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------------ #
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    # ------------------------------------------------------------------------ #
+    def pairings(self) -> list[tuple[tuple[str, str], tuple[str, str]]]:
+        """
+        Get all pairings with at least one stored outcome.
+
+        Returns:
+            list[tuple]: attacker and defender key of every pairing
+        """
+        return list(self._index)
+
+    # ------------------------------------------------------------------------ #
+    def count(self, attacker_key: tuple[str, str], defender_key: tuple[str, str]) -> int:
+        """
+        Get the amount of stored outcomes of a pairing, from the index only.
+
+        Args:
+            attacker_key (tuple[str, str]): key of the attacker in the hero registry
+            defender_key (tuple[str, str]): key of the defender in the hero registry
+
+        Returns:
+            int: amount of outcomes
+        """
+        return sum(records for _, records in self._index.get((attacker_key, defender_key), ()))
+
+    # ------------------------------------------------------------------------ #
+    def query(
+        self,
+        attacker_key: tuple[str, str],
+        defender_key: tuple[str, str],
+        winner: str | None = ANY,
+        turns_below: int | None = None,
+    ) -> Iterator[BattleResult]:
+        """
+        Get the stored outcomes of a pairing, for example all losses of the attacker under 10 turns with
+        query(("warrior", "fury"), ("priest", "shadow"), winner="defender", turns_below=10).
+        Only the pages of the pairing are read.
+
+        Args:
+            attacker_key (tuple[str, str]): key of the attacker in the hero registry
+            defender_key (tuple[str, str]): key of the defender in the hero registry
+            winner (str | None): only outcomes with this winner, None for draws, "any" for all outcomes
+            turns_below (int | None): only outcomes of duels, which took less turns
+
+        Yields:
+            BattleResult: matching outcomes, in the order they were stored
+        """
+        extents = self._index.get((attacker_key, defender_key))
+        if not extents:
+            return
+
+        winner_code = None if winner == ANY else _WINNER_CODES[winner]
+        unpack_from = RECORD.unpack_from
+        data = self._map
+        for offset, records in extents:
+            for record_offset in range(offset, offset + records * RECORD.size, RECORD.size):
+                code, turns, attacker_health, defender_health = unpack_from(data, record_offset)
+                if winner_code is not None and code != winner_code:
+                    continue
+                if turns_below is not None and turns >= turns_below:
+                    continue
+                yield BattleResult(_WINNERS[code], turns, attacker_health, defender_health)
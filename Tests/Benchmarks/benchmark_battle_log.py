@@ -0,0 +1,95 @@
+"""
+Benchmark of the binary battle log - the cost of recording duels and the speed of replaying them
+compared with simulating the same duels again.
+Run from the root of the repository with: python -m Tests.Benchmarks.benchmark_battle_log
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from Simulations.simulation_handler import BattleSimulator, RandomPolicy, parse_hero_key
+from Storage.battle_log import BattleLogReader, BattleRecorder
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_BATTLES = 2000
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def simulate(
+    attacker_key: tuple[str, str],
+    defender_key: tuple[str, str],
+    battles: int,
+    recorder: BattleRecorder | None = None,
+) -> float:
+    """
+    Simulate the duels with fixed seeds.
+
+    Args:
+        attacker_key (tuple[str, str]): key of the attacker in the hero registry
+        defender_key (tuple[str, str]): key of the defender in the hero registry
+        battles (int): amount of duels
+        recorder (BattleRecorder | None): records the duels, if given
+
+    Returns:
+        float: elapsed time in seconds
+    """
+    simulator = BattleSimulator(
+        attacker_key, defender_key, RandomPolicy(1), RandomPolicy(2), recorder=recorder
+    )
+    start = time.perf_counter()
+    for _ in simulator.simulate(battles):
+        pass
+    return time.perf_counter() - start
+
+
+# ---------------------------------------------------------------------------- #
+def replay(path: str) -> tuple[float, int]:
+    """
+    Replay all duels of a battle log.
+
+    Args:
+        path (str): path of the battle log
+
+    Returns:
+        tuple[float, int]: elapsed time in seconds and amount of replayed duels
+    """
+    start = time.perf_counter()
+    with BattleLogReader(path) as reader:
+        duels = sum(1 for _ in reader.replay())
+    return time.perf_counter() - start, duels
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark recording and replaying the battle log")
+    parser.add_argument("--battles", type=int, default=DEFAULT_BATTLES, help="Amount of duels")
+    parser.add_argument("--attacker", type=parse_hero_key, default=("paladin", "retribution"))
+    parser.add_argument("--defender", type=parse_hero_key, default=("warrior", "protection"))
+    args = parser.parse_args()
+
+    handle, path = tempfile.mkstemp(suffix=".bin")
+    os.close(handle)
+    os.remove(path)
+    try:
+        simulated = simulate(args.attacker, args.defender, args.battles)
+        with BattleRecorder(path) as recorder:
+            recorded = simulate(args.attacker, args.defender, args.battles, recorder)
+        replayed, duels = replay(path)
+        size = os.path.getsize(path)
+    finally:
+        os.remove(path)
+
+    print(f"simulate {args.battles:>8,} duels {simulated:8.3f} s")
+    print(f"record   {args.battles:>8,} duels {recorded:8.3f} s ({recorded / simulated - 1:+.0%})")
+    print(f"replay   {duels:>8,} duels {replayed:8.3f} s ({simulated / replayed:.1f}x faster)")
+    print(f"log size {size / 1024:,.0f} KiB, {size / duels:,.0f} bytes per duel")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Memory benchmark, which measures how many bytes a single hero of every spec takes, stored in
+__slots__ and, as a baseline, with the same attributes in an instance __dict__.
+Run from the root of the repository with: python -m Tests.Benchmarks.benchmark_hero_memory
+"""
+
+import gc
+import tracemalloc
+
+from Heroes.hero_base_stats import IBaseHero
+from Heroes.hero_factory import HeroFactory
+
+# --------------------------------- Constants -------------------------------- #
+HEROES_PER_SPEC = 10000
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class DictHero:
+    """
+    Baseline hero, which holds the attributes of a hero in an instance __dict__, like the heroes before __slots__.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, hero: IBaseHero) -> None:
+        for cls in type(hero).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if hasattr(hero, slot):
+                    setattr(self, slot, getattr(hero, slot))
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def measure_bytes_per_hero(
+    hero_key: tuple[str, str], amount: int = HEROES_PER_SPEC, with_dict: bool = False
+) -> float:
+    """
+    Create the given amount of heroes and measure the memory they hold.
+
+    Args:
+        hero_key (tuple[str, str]): key of the hero in the hero registry
+        amount (int): amount of heroes to create
+        with_dict (bool): measure the baseline heroes, which hold their attributes in a __dict__
+
+    Returns:
+        float: average amount of bytes per hero
+    """
+    hero_factory = HeroFactory()
+    prototype = hero_factory.create_hero(*hero_key)
+    DictHero(prototype)
+    gc.collect()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    if with_dict:
+        heroes = [DictHero(prototype) for _ in range(amount)]
+    else:
+        heroes = [hero_factory.create_hero(*hero_key) for _ in range(amount)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del heroes
+
+    return (after - before) / amount
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+def main() -> None:
+    slots_total = dict_total = 0.0
+    print(f"{'spec':<22} {'__slots__':>9} {'__dict__':>9}  bytes/hero")
+    for hero_key in HeroFactory._hero_registry:
+        slots_bytes = measure_bytes_per_hero(hero_key)
+        dict_bytes = measure_bytes_per_hero(hero_key, with_dict=True)
+        slots_total += slots_bytes
+        dict_total += dict_bytes
+        print(f"{':'.join(hero_key):<22} {slots_bytes:9.1f} {dict_bytes:9.1f}")
+
+    specs = len(HeroFactory._hero_registry)
+    print(f"{'average':<22} {slots_total / specs:9.1f} {dict_total / specs:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark of the start up cost of the command line. Runs the info-only commands with "python -X importtime"
+and compares them with importing every command and spec module up front, like main.py used to.
+Run from the root of the repository with: python -m Tests.Benchmarks.benchmark_import_time
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import NamedTuple
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_REPEATS = 15
+EAGER_IMPORTS = (
+    "import main, battles_handler, instrumentation_handler, server_handler, "
+    "Simulations.matrix_handler, Storage.battle_log, Storage.results_store, "
+    "Spells.mage_spell_handler, Spells.monk_spell_handler, Spells.paladin_spell_handler, "
+    "Spells.priest_spell_handler, Spells.shaman_spell_handler, Spells.warrior_spell_handler"
+)
+COMMANDS = {
+    "main.py --show-classes": ["main.py", "--show-classes"],
+    "main.py --show-roles": ["main.py", "--show-roles"],
+    "eager imports": ["-c", EAGER_IMPORTS],
+}
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class ImportTiming(NamedTuple):
+    """
+    Start up cost of a command. The times are medians in seconds.
+    """
+
+    name: str
+    wall_time: float
+    import_time: float
+    modules: int
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def parse_importtime(output: str) -> tuple[float, list[str]]:
+    """
+    Parse the report of "python -X importtime".
+
+    Args:
+        output (str): standard error of the interpreter
+
+    Returns:
+        tuple[float, list[str]]: cumulative import time of the top level imports in seconds
+            and the names of all imported modules
+    """
+    total_us = 0
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        modules.append(name.strip())
+        # Nested imports are indented, their time is part of the top level import
+        if not name.startswith("  ", 1):
+            total_us += int(cumulative)
+
+    return total_us / 1e6, modules
+
+
+# ---------------------------------------------------------------------------- #
+def measure(name: str, arguments: list[str], repeats: int) -> ImportTiming:
+    """
+    Run a command in a fresh interpreter several times.
+
+    Args:
+        name (str): name of the command
+        arguments (list[str]): arguments of the interpreter
+        repeats (int): amount of runs
+
+    Returns:
+        ImportTiming: median wall and import time and the amount of imported modules
+    """
+    wall_times = []
+    import_times = []
+    modules = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", *arguments],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        wall_times.append(time.perf_counter() - start)
+        import_time, modules = parse_importtime(completed.stderr)
+        import_times.append(import_time)
+
+    return ImportTiming(
+        name, statistics.median(wall_times), statistics.median(import_times), len(modules)
+    )
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the start up cost of the command line")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Runs per command")
+    args = parser.parse_args()
+
+    timings = [measure(name, arguments, args.repeats) for name, arguments in COMMANDS.items()]
+    for timing in timings:
+        print(
+            f"{timing.name:<24} wall {timing.wall_time * 1e3:8.1f} ms "
+            f"imports {timing.import_time * 1e3:8.1f} ms "
+            f"modules {timing.modules:4}"
+        )
+
+    eager = timings[-1]
+    for timing in timings[:-1]:
+        print(f"{timing.name}: {eager.import_time / timing.import_time:.1f}x less import time than eager")
+
+
+if __name__ == "__main__":
+    main()
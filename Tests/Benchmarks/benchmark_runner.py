@@ -0,0 +1,137 @@
+"""
+Small benchmark runner with warmup and repeats, which reports the median and the 95th percentile
+time per operation and writes machine readable JSON results, so runs can be compared release to release.
+"""
+
+import json
+import math
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any, NamedTuple
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_NUMBER = 1000
+DEFAULT_REPEATS = 15
+DEFAULT_WARMUP = 3
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class BenchmarkResult(NamedTuple):
+    """
+    Timings of a single benchmark. The times are in seconds per operation.
+    """
+
+    name: str
+    number: int
+    repeats: int
+    median: float
+    p95: float
+    minimum: float
+    ops_per_second: float
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def percentile(values: list[float], percent: float) -> float:
+    """
+    Nearest rank percentile of the values.
+
+    Args:
+        values (list[float]): measured values
+        percent (float): percentile, between 0 and 100
+
+    Returns:
+        float: the value at the given percentile
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * percent / 100))
+    return ordered[rank - 1]
+
+
+# ---------------------------------------------------------------------------- #
+def run_benchmark(
+    name: str,
+    setup: Callable[[], Callable[[], Any]],
+    number: int = DEFAULT_NUMBER,
+    repeats: int = DEFAULT_REPEATS,
+    warmup: int = DEFAULT_WARMUP,
+) -> BenchmarkResult:
+    """
+    Time an operation. Before every repeat the setup creates a fresh operation, outside of the timing,
+    so operations which change their hero start from the same state every time.
+
+    Args:
+        name (str): name of the benchmark
+        setup (Callable): returns the operation to time
+        number (int): calls of the operation per repeat
+        repeats (int): timed repeats
+        warmup (int): repeats which are run before the timed ones and discarded
+
+    Returns:
+        BenchmarkResult: timings per operation
+    """
+    timings = []
+    for repeat in range(warmup + repeats):
+        operation = setup()
+        loop = range(number)
+        start = time.perf_counter()
+        for _ in loop:
+            operation()
+        elapsed = time.perf_counter() - start
+        if repeat >= warmup:
+            timings.append(elapsed / number)
+
+    median = statistics.median(timings)
+    return BenchmarkResult(
+        name,
+        number,
+        repeats,
+        median,
+        percentile(timings, 95),
+        min(timings),
+        1 / median if median else math.inf,
+    )
+
+
+# ---------------------------------------------------------------------------- #
+def write_results_json(results: list[BenchmarkResult], path: str) -> None:
+    """
+    Write the results together with the details of the machine which produced them.
+
+    Args:
+        results (list[BenchmarkResult]): results of the benchmarks
+        path (str): path of the output file
+    """
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "results": [result._asdict() for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump(report, json_file, indent=2)
+
+
+# ---------------------------------------------------------------------------- #
+def format_result(result: BenchmarkResult) -> str:
+    """
+    Format a result as a single line of a table.
+
+    Args:
+        result (BenchmarkResult): result of a benchmark
+
+    Returns:
+        str: name, median and p95 in microseconds and operations per second
+    """
+    return (
+        f"{result.name:<58} {result.median * 1e6:10.3f} us {result.p95 * 1e6:10.3f} us "
+        f"{result.ops_per_second:14,.0f} ops/s"
+    )
@@ -0,0 +1,117 @@
+"""
+Benchmark of the battle snapshots - how many snapshots and restores of a duel in progress can be taken
+per second, compared with a copy.deepcopy of the same battle.
+Run from the root of the repository with: python -m Tests.Benchmarks.benchmark_snapshot
+"""
+
+import argparse
+import copy
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from battles_handler import Attacking
+from effects_handler import EffectScheduler
+from Heroes.hero_factory import HeroFactory
+from Simulations.simulation_handler import RandomPolicy, parse_hero_key
+
+if TYPE_CHECKING:
+    from Heroes.hero_base_stats import IBaseHero
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_ITERATIONS = 100_000
+WARMUP_TURNS = 4
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def build_battle(
+    attacker_key: tuple[str, str], defender_key: tuple[str, str]
+) -> tuple[Attacking, "IBaseHero"]:
+    """
+    Start a duel and play a few turns with random spells, so the battle has cooldowns,
+    active effects and damage over time to capture.
+
+    Args:
+        attacker_key (tuple[str, str]): key of the attacker in the hero registry
+        defender_key (tuple[str, str]): key of the defender in the hero registry
+
+    Returns:
+        tuple: the attacker side of the duel, which shares its scheduler with the defender side,
+        and the attacker
+    """
+    hero_factory = HeroFactory()
+    attacker = hero_factory.create_hero(*attacker_key)
+    defender = hero_factory.create_hero(*defender_key)
+    scheduler = EffectScheduler()
+    attacking = Attacking(attacker, defender, scheduler)
+    defending = Attacking(defender, attacker, scheduler)
+
+    policy = RandomPolicy(1)
+    for turn in range(1, WARMUP_TURNS + 1):
+        scheduler.start_turn(turn)
+        for caster, side in ((attacker, attacking), (defender, defending)):
+            spells = scheduler.get_ready_spells(caster, type(caster).spell_registry.names)
+            spell = policy.select_spell(caster, spells, turn)
+            if spell in type(caster).spell_registry.spells_with_args:
+                side.attack(spell, scheduler.get_active_effects(defender))
+            else:
+                side.attack(spell)
+
+    return attacking, attacker
+
+
+# ---------------------------------------------------------------------------- #
+def measure(operation: Callable[[], object], iterations: int) -> float:
+    """
+    Run an operation the given amount of times.
+
+    Args:
+        operation (Callable[[], object]): operation to measure
+        iterations (int): amount of runs
+
+    Returns:
+        float: runs per second
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    return iterations / max(time.perf_counter() - start, 1e-9)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark snapshots and restores of a battle")
+    parser.add_argument(
+        "--iterations", type=int, default=DEFAULT_ITERATIONS, help="Runs per measurement"
+    )
+    parser.add_argument("--attacker", type=parse_hero_key, default=("shaman", "enhancement"))
+    parser.add_argument("--defender", type=parse_hero_key, default=("warrior", "protection"))
+    args = parser.parse_args()
+
+    attacking, hero = build_battle(args.attacker, args.defender)
+    state = attacking.snapshot()
+    hero_state = hero.snapshot()
+    # The deepcopy copies everything the battle references, the spell tables included
+    deepcopy_iterations = max(1, args.iterations // 100)
+
+    results = {
+        "hero snapshot": measure(hero.snapshot, args.iterations),
+        "hero restore": measure(lambda: hero.restore(hero_state), args.iterations),
+        "battle snapshot": measure(attacking.snapshot, args.iterations),
+        "battle restore": measure(lambda: attacking.restore(state), args.iterations),
+        "battle fork": measure(lambda: attacking.restore(attacking.snapshot()), args.iterations),
+        "battle deepcopy": measure(lambda: copy.deepcopy(attacking), deepcopy_iterations),
+    }
+    for name, per_second in results.items():
+        print(f"{name:<18} {per_second:14,.0f}/s")
+
+    speedup = results["battle fork"] / results["battle deepcopy"]
+    print(f"A snapshot with a restore is {speedup:,.0f}x faster than a deepcopy of the battle")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark suite of the hot paths - every spell of all specs, hero creation, damage mitigation and complete duels.
+Run from the root of the repository with: python -m Tests.Benchmarks.benchmark_suite
+"""
+
+import argparse
+import functools
+
+from battles_handler import Defending
+from Heroes.hero_factory import HeroFactory
+from Simulations.simulation_handler import BattleSimulator, RandomPolicy
+from Tests.Benchmarks.benchmark_runner import (
+    DEFAULT_NUMBER,
+    DEFAULT_REPEATS,
+    DEFAULT_WARMUP,
+    BenchmarkResult,
+    format_result,
+    run_benchmark,
+    write_results_json,
+)
+
+# --------------------------------- Constants -------------------------------- #
+DUEL_NUMBER_DIVISOR = 100
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Setups                                    #
+# ---------------------------------------------------------------------------- #
+def setup_cast(hero_key: tuple[str, str], spell_name: str):
+    hero = HeroFactory().create_hero(*hero_key)
+    cast = getattr(hero, spell_name)
+    if spell_name in hero.spell_registry.spells_with_args:
+        # Lava Burst on a target with Flame Shock
+        return functools.partial(cast, ["flame_shock"])
+
+    return cast
+
+
+# ---------------------------------------------------------------------------- #
+def setup_create_hero(hero_key: tuple[str, str]):
+    return functools.partial(HeroFactory().create_hero, *hero_key)
+
+
+# ---------------------------------------------------------------------------- #
+def setup_deflect():
+    defender = HeroFactory().create_hero("warrior", "protection")
+    defender.damage_reduction = 15
+    return functools.partial(Defending(defender).deflect, 120)
+
+
+# ---------------------------------------------------------------------------- #
+def setup_duel(attacker_key: tuple[str, str], defender_key: tuple[str, str]):
+    simulator = BattleSimulator(attacker_key, defender_key, RandomPolicy(1), RandomPolicy(2))
+    return simulator.run_duel
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def collect_benchmarks(number: int) -> list[tuple[str, functools.partial, int]]:
+    """
+    Collect all benchmarks of the suite.
+
+    Args:
+        number (int): calls per repeat of the fast operations
+
+    Returns:
+        list[tuple]: name, setup and calls per repeat of every benchmark
+    """
+    benchmarks = []
+    for hero_key, hero_cls in HeroFactory._hero_registry.items():
+        hero_name = ":".join(hero_key)
+        for spell_name in hero_cls.spell_registry.names:
+            benchmarks.append(
+                (f"cast {hero_name} {spell_name}", functools.partial(setup_cast, hero_key, spell_name), number)
+            )
+
+    for hero_key in HeroFactory._hero_registry:
+        benchmarks.append(
+            (f"create_hero {':'.join(hero_key)}", functools.partial(setup_create_hero, hero_key), number)
+        )
+
+    benchmarks.append(("Defending.deflect", setup_deflect, number))
+    benchmarks.append(
+        (
+            "duel paladin:retribution vs warrior:protection",
+            functools.partial(setup_duel, ("paladin", "retribution"), ("warrior", "protection")),
+            max(1, number // DUEL_NUMBER_DIVISOR),
+        )
+    )
+
+    return benchmarks
+
+
+# ---------------------------------------------------------------------------- #
+def run_suite(
+    number: int = DEFAULT_NUMBER,
+    repeats: int = DEFAULT_REPEATS,
+    warmup: int = DEFAULT_WARMUP,
+    name_filter: str = "",
+) -> list[BenchmarkResult]:
+    """
+    Run all benchmarks, whose name contains the filter.
+
+    Args:
+        number (int): calls per repeat of the fast operations
+        repeats (int): timed repeats of every benchmark
+        warmup (int): discarded repeats before the timed ones
+        name_filter (str): run only benchmarks, whose name contains it
+
+    Returns:
+        list[BenchmarkResult]: results in suite order
+    """
+    results = []
+    for name, setup, calls in collect_benchmarks(number):
+        if name_filter in name:
+            result = run_benchmark(name, setup, calls, repeats, warmup)
+            print(format_result(result))
+            results.append(result)
+
+    return results
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("--number", type=int, default=DEFAULT_NUMBER, help="Calls per repeat")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed repeats")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="Discarded repeats")
+    parser.add_argument("--filter", default="", help="Run only benchmarks whose name contains it")
+    parser.add_argument(
+        "--output",
+        default="benchmark_results.json",
+        help="Path of the JSON results (default: benchmark_results.json)",
+    )
+    args = parser.parse_args()
+
+    results = run_suite(args.number, args.repeats, args.warmup, args.filter)
+    write_results_json(results, args.output)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
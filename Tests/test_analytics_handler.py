@@ -0,0 +1,84 @@
+import pickle
+import random
+import unittest
+
+from Simulations.analytics_handler import BattleAnalytics, QuantileSketch, RunningMoments
+from Simulations.simulation_handler import BattleSimulator, RandomPolicy
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestQuantileSketch(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_quantiles_are_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(4, 1) for _ in range(20000))
+        first, second = QuantileSketch(0.01), QuantileSketch(0.01)
+        for index, value in enumerate(values):
+            (first if index % 2 else second).add(value)
+        first.merge(second)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertAlmostEqual(first.quantile(q), exact, delta=exact * 0.011)
+
+    # ------------------------------------------------------------------------ #
+    def test_merged_moments_match_single_aggregate(self):
+        values = [3, 8, 1, 12, 7, 7, 2]
+        whole, first, second = RunningMoments(), RunningMoments(), RunningMoments()
+        for value in values:
+            whole.add(value)
+        for value in values[:3]:
+            first.add(value)
+        for value in values[3:]:
+            second.add(value)
+        first.merge(second)
+
+        self.assertEqual((first.count, first.total), (whole.count, whole.total))
+        self.assertAlmostEqual(first.mean, whole.mean)
+        self.assertAlmostEqual(first.variance, whole.variance)
+        self.assertEqual((first.minimum, first.maximum), (1, 12))
+
+
+# ---------------------------------------------------------------------------- #
+class TestBattleAnalytics(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_merged_workers_match_single_aggregate(self):
+        aggregates = []
+        for _ in range(3):
+            analytics = BattleAnalytics()
+            simulator = BattleSimulator(
+                ("paladin", "retribution"),
+                ("warrior", "fury"),
+                RandomPolicy(1),
+                RandomPolicy(2),
+                analytics=analytics,
+            )
+            list(simulator.simulate(20))
+            aggregates.append(analytics)
+
+        whole, first, second = aggregates
+        first = pickle.loads(pickle.dumps(first))
+        first.merge(second)
+        whole_spec = whole.specs[("paladin", "retribution")]
+        merged_spec = first.specs[("paladin", "retribution")]
+        self.assertEqual(merged_spec.battles, 2 * whole_spec.battles)
+        self.assertAlmostEqual(merged_spec.dps.moments.mean, whole_spec.dps.moments.mean)
+        self.assertEqual(merged_spec.resource_spent, 2 * whole_spec.resource_spent)
+
+        report = first.report()
+        self.assertGreater(report["specs"]["warrior:fury"]["dps"]["mean"], 0)
+        self.assertIn("cast_rampage", report["spells"]["warrior:fury"])
+        # Heals are added to the spell, which healed
+        bloodbath = report["spells"]["warrior:fury"]["cast_bloodbath"]
+        self.assertGreater(bloodbath["healing"], 0)
+        self.assertIn("healing_per_pool", bloodbath)
+        self.assertEqual(report["spells"]["warrior:fury"]["cast_rampage"]["healing"], 0)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
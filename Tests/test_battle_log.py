@@ -0,0 +1,170 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from Simulations.simulation_handler import BattleSimulator, RandomPolicy
+from Storage.battle_log import (
+    FILE_MAGIC,
+    KIND_DUEL,
+    KIND_TICK,
+    RECORD,
+    BattleLogReader,
+    BattleRecorder,
+    HeroState,
+    get_state_getter,
+)
+
+# --------------------------------- Constants -------------------------------- #
+PAIRINGS = [
+    (("paladin", "retribution"), ("warrior", "protection")),
+    (("shaman", "enhancement"), ("priest", "shadow")),
+    (("monk", "windwalker"), ("mage", "fire")),
+]
+DUELS = 5
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Helpers                                   #
+# ---------------------------------------------------------------------------- #
+class CapturingRecorder(BattleRecorder):
+    """
+    Keeps the final state of every recorded duel, to compare it with the replay.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self.final_states = []
+
+    # ------------------------------------------------------------------------ #
+    def end_duel(self, winner, turns) -> None:
+        super().end_duel(winner, turns)
+        self.final_states.append(
+            (
+                HeroState(*get_state_getter(self._attacker)(self._attacker)),
+                HeroState(*get_state_getter(self._defender)(self._defender)),
+            )
+        )
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestBattleLog(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        os.remove(self.path)
+
+    # ------------------------------------------------------------------------ #
+    def tearDown(self):
+        os.remove(self.path)
+
+    # ------------------------------------------------------------------------ #
+    def test_replay_matches_simulation(self):
+        expected = []
+        with CapturingRecorder(self.path) as recorder:
+            for seed, (attacker_key, defender_key) in enumerate(PAIRINGS):
+                simulator = BattleSimulator(
+                    attacker_key,
+                    defender_key,
+                    RandomPolicy(seed),
+                    RandomPolicy(seed + 100),
+                    recorder=recorder,
+                )
+                for result in simulator.simulate(DUELS):
+                    expected.append((attacker_key, defender_key, result))
+
+        with BattleLogReader(self.path) as reader:
+            replayed = list(reader.replay())
+            kinds = {record.kind for record in reader.iter_records()}
+
+        self.assertEqual(len(replayed), len(expected))
+        self.assertIn(KIND_TICK, kinds)
+        for duel, (attacker_key, defender_key, result), states in zip(
+            replayed, expected, recorder.final_states
+        ):
+            self.assertEqual((duel.attacker, duel.defender), (attacker_key, defender_key))
+            self.assertEqual((duel.winner, duel.turns), (result.winner, result.turns))
+            self.assertEqual(duel.attacker_state.health, result.attacker_health)
+            self.assertEqual(duel.defender_state.health, result.defender_health)
+            self.assertEqual((duel.attacker_state, duel.defender_state), states)
+
+    # ------------------------------------------------------------------------ #
+    def test_appending_keeps_earlier_duels(self):
+        for seed in range(2):
+            with BattleRecorder(self.path) as recorder:
+                simulator = BattleSimulator(
+                    *PAIRINGS[0], RandomPolicy(seed), RandomPolicy(seed), recorder=recorder
+                )
+                simulator.run_duel()
+
+        with BattleLogReader(self.path) as reader:
+            headers = [record for record in reader.iter_records() if record.kind == KIND_DUEL]
+            self.assertEqual(len(list(reader.replay())), 2)
+
+        self.assertEqual(len(headers), 2)
+
+    # ------------------------------------------------------------------------ #
+    def test_big_endian_host_reads_little_endian_words(self):
+        with BattleRecorder(self.path) as recorder:
+            simulator = BattleSimulator(
+                *PAIRINGS[1], RandomPolicy(1), RandomPolicy(2), recorder=recorder
+            )
+            results = list(simulator.simulate(DUELS))
+
+        with BattleLogReader(self.path) as reader:
+            replayed = list(reader.replay())
+        self.assertEqual(len(replayed), len(results))
+        # On a big-endian host the words are decoded with struct instead of read in place
+        with mock.patch("Storage.battle_log.sys.byteorder", "big"):
+            with BattleLogReader(self.path) as reader:
+                self.assertEqual(list(reader.replay()), replayed)
+
+    # ------------------------------------------------------------------------ #
+    def test_log_of_other_spec_tables_is_rejected(self):
+        with BattleRecorder(self.path) as recorder:
+            simulator = BattleSimulator(
+                *PAIRINGS[0], RandomPolicy(1), RandomPolicy(2), recorder=recorder
+            )
+            simulator.run_duel()
+
+        # A log written with another spell list has another digest after the magic
+        with open(self.path, "r+b") as log_file:
+            log_file.seek(len(FILE_MAGIC))
+            log_file.write(b"\x00" * 4)
+
+        with self.assertRaisesRegex(ValueError, "other specs or spells"):
+            BattleLogReader(self.path)
+        with self.assertRaisesRegex(ValueError, "other specs or spells"):
+            BattleRecorder(self.path)
+
+
+    # ------------------------------------------------------------------------ #
+    def test_truncated_log_is_rejected(self):
+        with BattleRecorder(self.path) as recorder:
+            simulator = BattleSimulator(
+                *PAIRINGS[0], RandomPolicy(1), RandomPolicy(2), recorder=recorder
+            )
+            simulator.run_duel()
+
+        with open(self.path, "ab") as log_file:
+            log_file.write(b"\x00" * 2)
+        with self.assertRaisesRegex(ValueError, "incomplete record"):
+            BattleLogReader(self.path)
+
+        # Cut off the last whole record, so the duel header counts more records than are left
+        with open(self.path, "r+b") as log_file:
+            log_file.truncate(os.path.getsize(self.path) - 2 - RECORD.size)
+        with BattleLogReader(self.path) as reader:
+            with self.assertRaisesRegex(ValueError, "Corrupt battle log"):
+                list(reader.replay())
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
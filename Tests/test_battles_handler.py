@@ -0,0 +1,233 @@
+import unittest
+
+from battles_handler import (
+    Attacking,
+    DamageEvent,
+    EventBus,
+    HealEvent,
+    ResourceGainEvent,
+    ResourceSpendEvent,
+)
+from effects_handler import EffectScheduler
+from Heroes.hero_factory import HeroFactory
+from Heroes.hero_layout import get_hero_layout
+from Simulations.simulation_handler import BattleSimulator, RandomPolicy
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestCombo(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def setUp(self):
+        hero_factory = HeroFactory()
+        self.paladin = hero_factory.create_hero("paladin", "retribution")
+        self.target = hero_factory.create_hero("warrior", "protection")
+        self.scheduler = EffectScheduler()
+        self.attacking = Attacking(self.paladin, self.target, self.scheduler)
+
+    # ------------------------------------------------------------------------ #
+    def test_unaffordable_combo_changes_nothing(self):
+        state = (self.paladin._curr_holy_power, self.paladin._curr_mana)
+        health = self.target.get_current_health()
+
+        for combo in (
+            ["cast_judgement", "cast_blade_of_justice", "cast_final_verdict"],
+            ["cast_wake_of_ashes", "cast_final_verdict", "cast_final_verdict"],
+            ["cast_judgement", "cast_judgement"],
+            ["cast_judgement", "cast_smite"],
+            [],
+        ):
+            with self.subTest(combo=combo), self.assertRaises(ValueError):
+                self.attacking.attack_combo(combo)
+
+        self.assertEqual((self.paladin._curr_holy_power, self.paladin._curr_mana), state)
+        self.assertEqual(self.target.get_current_health(), health)
+        self.assertFalse(self.scheduler.is_on_cooldown(self.paladin, "cast_judgement"))
+
+    # ------------------------------------------------------------------------ #
+    def test_combo_matches_single_casts(self):
+        combo = ["cast_judgement", "cast_wake_of_ashes", "cast_final_verdict"]
+        result = self.attacking.attack_combo(combo)
+
+        hero_factory = HeroFactory()
+        paladin = hero_factory.create_hero("paladin", "retribution")
+        target = hero_factory.create_hero("warrior", "protection")
+        attacking = Attacking(paladin, target, EffectScheduler())
+        expected = [attacking.attack(spell) for spell in combo]
+
+        self.assertEqual(list(result.results), expected)
+        self.assertEqual(result.spells, tuple(combo))
+        self.assertEqual(result.damage, target.max_health - target.get_current_health())
+        self.assertEqual(self.target.get_current_health(), target.get_current_health())
+        self.assertEqual(self.paladin._curr_holy_power, 1)
+        self.assertTrue(self.scheduler.is_on_cooldown(self.paladin, "cast_wake_of_ashes"))
+
+    # ------------------------------------------------------------------------ #
+    def test_class_resources_are_validated(self):
+        hero_factory = HeroFactory()
+        for hero_key, combo in (
+            (("warrior", "fury"), ["cast_raging_blow", "cast_rampage"]),
+            (("monk", "windwalker"), ["cast_tiger_palm", "cast_fists_of_fury"]),
+        ):
+            hero = hero_factory.create_hero(*hero_key)
+            attacking = Attacking(hero, self.target, EffectScheduler())
+            with self.subTest(hero_key=hero_key):
+                with self.assertRaises(ValueError):
+                    attacking.validate_combo(combo)
+
+                # Enough resource makes the same combo valid
+                layout = get_hero_layout(type(hero))
+                setattr(hero, layout.resource, getattr(hero, layout.max_resource))
+                self.assertEqual(len(attacking.attack_combo(combo).results), 2)
+
+
+# ---------------------------------------------------------------------------- #
+class TestEventBus(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_events_are_delivered_once_per_turn(self):
+        event_bus = EventBus()
+        batches = {DamageEvent: [], HealEvent: [], ResourceGainEvent: []}
+        for event_type, received in batches.items():
+            event_bus.subscribe(
+                event_type, lambda turn, events, received=received: received.append((turn, events))
+            )
+        self.assertIsNone(event_bus.publish_resource_spend)
+
+        priest_cls = HeroFactory._hero_registry["priest", "shadow"]
+        simulator = BattleSimulator(
+            ("paladin", "retribution"),
+            ("priest", "shadow"),
+            RandomPolicy(5),
+            RandomPolicy(6),
+            event_bus=event_bus,
+        )
+        result = simulator.run_duel()
+
+        turns = [turn for turn, _ in batches[DamageEvent]]
+        self.assertEqual(turns, sorted(set(turns)))
+        self.assertLessEqual(turns[-1], result.turns)
+        damage_taken = sum(
+            event.damage_taken
+            for _, events in batches[DamageEvent]
+            for event in events
+            if isinstance(event.defender, priest_cls)
+        )
+        healing = sum(
+            event.amount
+            for _, events in batches[HealEvent]
+            for event in events
+            if isinstance(event.hero, priest_cls)
+        )
+        max_health = HeroFactory().create_hero("priest", "shadow").max_health
+        self.assertEqual(result.defender_health, max_health - damage_taken + healing)
+        # Every heal of the duel comes from a spell of the healed hero
+        for _, events in batches[HealEvent]:
+            for event in events:
+                self.assertIn(event.spell_name, type(event.hero).spell_registry.names)
+        self.assertTrue(batches[ResourceGainEvent])
+
+    # ------------------------------------------------------------------------ #
+    def test_spent_resource_is_published(self):
+        event_bus = EventBus()
+        received = []
+        event_bus.subscribe(ResourceSpendEvent, lambda turn, events: received.append((turn, events)))
+        hero_factory = HeroFactory()
+        paladin = hero_factory.create_hero("paladin", "retribution")
+        attacking = Attacking(
+            paladin, hero_factory.create_hero("warrior", "protection"), EffectScheduler()
+        )
+        event_bus.attach(paladin)
+
+        # Without the holy power Final Verdict spends nothing
+        self.assertIsNone(attacking.attack("cast_final_verdict"))
+        attacking.attack("cast_wake_of_ashes")
+        attacking.attack("cast_final_verdict")
+        event_bus.flush(1)
+
+        self.assertEqual(received, [(1, [ResourceSpendEvent(paladin, 3)])])
+        self.assertEqual(paladin._curr_holy_power, 0)
+
+    # ------------------------------------------------------------------------ #
+    def test_nothing_spent_is_not_published(self):
+        event_bus = EventBus()
+        received = []
+        event_bus.subscribe(ResourceSpendEvent, lambda turn, events: received.extend(events))
+        priest = HeroFactory().create_hero("priest", "shadow")
+        event_bus.attach(priest)
+
+        # Flash Heal removes insanity, of which the priest has none yet
+        priest.cast_flash_heal()
+        priest.add_specific_stat(30)
+        priest.cast_flash_heal()
+        event_bus.flush(1)
+
+        self.assertEqual(received, [ResourceSpendEvent(priest, 20)])
+
+    # ------------------------------------------------------------------------ #
+    def test_publisher_is_removed_with_last_listener(self):
+        event_bus = EventBus()
+        listener = lambda turn, events: None  # noqa: E731
+        event_bus.subscribe(HealEvent, listener)
+        self.assertIsNotNone(event_bus.publish_heal)
+
+        event_bus.unsubscribe(HealEvent, listener)
+        self.assertIsNone(event_bus.publish_heal)
+        with self.assertRaises(ValueError):
+            event_bus.unsubscribe(HealEvent, listener)
+        with self.assertRaises(ValueError):
+            event_bus.subscribe(int, listener)
+
+
+# ---------------------------------------------------------------------------- #
+class TestSnapshot(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def setUp(self):
+        hero_factory = HeroFactory()
+        self.shaman = hero_factory.create_hero("shaman", "enhancement")
+        self.warrior = hero_factory.create_hero("warrior", "protection")
+        self.scheduler = EffectScheduler()
+        self.shaman_attacking = Attacking(self.shaman, self.warrior, self.scheduler)
+        self.warrior_attacking = Attacking(self.warrior, self.shaman, self.scheduler)
+
+    # ------------------------------------------------------------------------ #
+    def play(self, turns: list[tuple[str, str]]) -> list[tuple]:
+        states = []
+        for shaman_spell, warrior_spell in turns:
+            self.scheduler.start_turn(self.scheduler.turn + 1)
+            self.shaman_attacking.attack(shaman_spell)
+            self.warrior_attacking.attack(warrior_spell)
+            states.append(
+                (
+                    self.shaman.snapshot(),
+                    self.warrior.snapshot(),
+                    self.scheduler.get_active_effects(self.warrior),
+                    self.scheduler.get_cooldown_ends(self.shaman),
+                    self.scheduler.get_damage_over_time(self.warrior),
+                )
+            )
+        return states
+
+    # ------------------------------------------------------------------------ #
+    def test_restored_battle_plays_out_the_same(self):
+        self.play([("cast_flame_shock", "cast_champions_spear"), ("cast_stormstrike", "cast_charge")])
+        state = self.shaman_attacking.snapshot()
+
+        turns = [("cast_lava_lash", "cast_shield_block"), ("cast_tempest", "cast_sheild_slam")]
+        first = self.play(turns)
+        self.assertNotEqual(self.shaman_attacking.snapshot()[:2], state[:2])
+
+        self.shaman_attacking.restore(state)
+        self.assertEqual(self.shaman_attacking.snapshot()[:2], state[:2])
+        # What if the shaman had cast Primordial Wave instead
+        self.assertNotEqual(self.play([("cast_primordial_wave", "cast_shield_block")])[0], first[0])
+
+        self.shaman_attacking.restore(state)
+        self.assertEqual(self.play(turns), first)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
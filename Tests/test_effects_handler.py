@@ -0,0 +1,78 @@
+import unittest
+
+from battles_handler import Attacking
+from effects_handler import EffectScheduler
+from Heroes.hero_factory import HeroFactory
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestEffectScheduler(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def setUp(self):
+        hero_factory = HeroFactory()
+        self.shaman = hero_factory.create_hero("shaman", "enhancement")
+        self.warrior = hero_factory.create_hero("warrior", "protection")
+        self.scheduler = EffectScheduler()
+        self.attacking = Attacking(self.shaman, self.warrior, self.scheduler)
+
+    # ------------------------------------------------------------------------ #
+    def test_cooldown_blocks_until_reset(self):
+        self.assertIsNotNone(self.attacking.attack("cast_primordial_wave"))
+        self.assertTrue(self.scheduler.is_on_cooldown(self.shaman, "cast_primordial_wave"))
+
+        self.scheduler.start_turn(6)
+        self.assertIsNone(self.attacking.attack("cast_primordial_wave"))
+
+        self.scheduler.start_turn(7)
+        self.assertFalse(self.scheduler.is_on_cooldown(self.shaman, "cast_primordial_wave"))
+        self.assertIsNotNone(self.attacking.attack("cast_primordial_wave"))
+
+    # ------------------------------------------------------------------------ #
+    def test_damage_over_time_ticks_and_expires(self):
+        result = self.attacking.attack("cast_flame_shock")
+        self.assertEqual(self.scheduler.get_active_effects(self.warrior), ["flame_shock"])
+
+        health = self.warrior.get_current_health()
+        for turn in range(1, result.turns_active + 1):
+            self.scheduler.start_turn(turn)
+            health -= result.damage_over_time
+            self.assertEqual(self.warrior.get_current_health(), health)
+
+        self.assertEqual(self.scheduler.get_active_effects(self.warrior), [])
+        self.scheduler.start_turn(result.turns_active + 5)
+        self.assertEqual(self.warrior.get_current_health(), health)
+
+    # ------------------------------------------------------------------------ #
+    def test_lava_burst_is_empowered_by_flame_shock(self):
+        normal = self.attacking.attack("cast_lava_burst", self.scheduler.get_active_effects(self.warrior))
+        self.scheduler.start_turn(2)
+        self.attacking.attack("cast_flame_shock")
+        empowered = self.attacking.attack("cast_lava_burst", self.scheduler.get_active_effects(self.warrior))
+
+        self.assertEqual(empowered.spell_damage, normal.spell_damage * 2)
+
+    # ------------------------------------------------------------------------ #
+    def test_arcane_intellect_is_taken_back_on_expiry(self):
+        mage = HeroFactory().create_hero("mage", "fire")
+        attacking = Attacking(mage, self.warrior, self.scheduler)
+        spell_power = mage.spell_power
+
+        for cast_turn in (0, 8):
+            self.scheduler.start_turn(cast_turn)
+            result = attacking.attack("cast_arcane_intellect")
+            self.assertGreater(mage.spell_power, spell_power)
+
+            self.scheduler.start_turn(cast_turn + result.turns_active - 1)
+            self.assertGreater(mage.spell_power, spell_power)
+            self.scheduler.start_turn(cast_turn + result.turns_active)
+            # The buff does not compound over the casts
+            self.assertEqual(mage.spell_power, spell_power)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import ast
+import subprocess
+import sys
+import unittest
+
+from Heroes.hero_factory import HeroFactory, get_hero_slots
+
+# --------------------------------- Constants -------------------------------- #
+# Prints the modules of the Spells package loaded after running the given code in a fresh interpreter
+LOADED_SPELL_MODULES = (
+    "import sys; {code}; "
+    "print(sorted(name for name in sys.modules if name.partition('.')[0] == 'Spells'))"
+)
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestHeroFactory(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_heroes_have_spec_stats(self):
+        paladin = HeroFactory().create_hero("Paladin", "Retribution")
+        self.assertEqual(paladin.max_health, 800)
+        self.assertEqual(paladin.get_current_health(), 800)
+        self.assertEqual(paladin.attack_power, 75)
+        self.assertEqual(paladin._curr_mana, 300)
+
+        warrior = HeroFactory().create_hero("warrior", "fury")
+        self.assertEqual(warrior._max_rage, 200)
+
+    # ------------------------------------------------------------------------ #
+    def test_clones_are_independent(self):
+        hero_factory = HeroFactory()
+        first = hero_factory.create_hero("mage", "fire")
+        second = hero_factory.create_hero("mage", "fire")
+        first.take_damage(100)
+        first.spell_power = 200
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.get_current_health(), 700)
+        self.assertEqual(second.spell_power, 110)
+        self.assertEqual(HeroFactory.get_prototype("mage", "fire").spell_power, 110)
+
+    # ------------------------------------------------------------------------ #
+    def test_pool_reuses_reset_heroes(self):
+        hero_factory = HeroFactory(pool_size=1)
+        first = hero_factory.create_hero("shaman", "enhancement")
+        second = hero_factory.create_hero("shaman", "enhancement")
+        fresh = hero_factory.create_hero("shaman", "enhancement")
+        first.take_damage(500)
+        first.cast_flame_shock()
+        hero_factory.release_hero(first)
+        hero_factory.release_hero(second)
+
+        reused = hero_factory.create_hero("shaman", "enhancement")
+        self.assertIs(reused, first)
+        for slot in get_hero_slots(type(fresh)):
+            self.assertEqual(getattr(reused, slot), getattr(fresh, slot), slot)
+        self.assertIsNot(hero_factory.create_hero("shaman", "enhancement"), second)
+
+    # ------------------------------------------------------------------------ #
+    def test_hero_released_twice_is_pooled_once(self):
+        hero_factory = HeroFactory(pool_size=2)
+        hero = hero_factory.create_hero("mage", "fire")
+        hero_factory.release_hero(hero)
+        hero_factory.release_hero(hero)
+
+        first = hero_factory.create_hero("mage", "fire")
+        second = hero_factory.create_hero("mage", "fire")
+        self.assertIs(first, hero)
+        self.assertIsNot(first, second)
+
+    # ------------------------------------------------------------------------ #
+    def test_spec_modules_load_lazily(self):
+        def get_loaded_modules(code: str) -> list[str]:
+            completed = subprocess.run(
+                [sys.executable, "-c", LOADED_SPELL_MODULES.format(code=code)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            return ast.literal_eval(completed.stdout.splitlines()[-1])
+
+        for option in ("--show-classes", "--show-roles"):
+            self.assertEqual(
+                get_loaded_modules(
+                    f"import runpy; sys.argv = ['main.py', '{option}']; "
+                    "runpy.run_path('main.py', run_name='__main__')"
+                ),
+                [],
+            )
+        loaded = get_loaded_modules(
+            "from Heroes.hero_factory import HeroFactory; HeroFactory().create_hero('mage', 'fire')"
+        )
+        self.assertEqual(
+            [name for name in loaded if name.endswith("_spell_handler")],
+            ["Spells.mage_spell_handler"],
+        )
+
+    # ------------------------------------------------------------------------ #
+    def test_unknown_hero_raises_error(self):
+        with self.assertRaises(ValueError):
+            HeroFactory().create_hero("druid", "balance")
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from instrumentation_handler import (
+    disable_instrumentation,
+    enable_instrumentation,
+    get_method_stats,
+)
+from Simulations.simulation_handler import BattleSimulator, RandomPolicy
+from Spells.paladin_spell_handler import PaladinCommonSpells, RetributionPaladinSpells
+from Spells.shaman_spell_handler import EnhancementShamanSpells
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestInstrumentation(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def tearDown(self):
+        disable_instrumentation(RetributionPaladinSpells)
+        disable_instrumentation(EnhancementShamanSpells)
+
+    # ------------------------------------------------------------------------ #
+    def test_records_calls_and_resource_deltas(self):
+        enable_instrumentation(RetributionPaladinSpells)
+        paladin = RetributionPaladinSpells()
+        result = paladin.cast_blade_of_justice()
+        paladin.cast_blade_of_justice()
+
+        stats = get_method_stats(RetributionPaladinSpells)
+        self.assertEqual(stats["cast_blade_of_justice"].calls, 2)
+        self.assertEqual(stats["cast_blade_of_justice"].resource_deltas["mana"], -2 * result.spell_cost)
+        self.assertEqual(stats["cast_blade_of_justice"].resource_deltas["holy_power"], 2)
+        self.assertEqual(stats["add_specific_stat"].calls, 2)
+        self.assertGreater(stats["cast_blade_of_justice"].p99_ns(), 0)
+
+    # ------------------------------------------------------------------------ #
+    def test_disable_leaves_no_wrapper(self):
+        original_spell = RetributionPaladinSpells.__dict__["cast_blade_of_justice"]
+        original_registry_method = RetributionPaladinSpells.spell_registry.get("cast_judgement").method
+
+        enable_instrumentation(RetributionPaladinSpells)
+        self.assertIsNot(RetributionPaladinSpells.cast_blade_of_justice, original_spell)
+        disable_instrumentation(RetributionPaladinSpells)
+
+        self.assertIs(RetributionPaladinSpells.__dict__["cast_blade_of_justice"], original_spell)
+        self.assertNotIn("cast_judgement", RetributionPaladinSpells.__dict__)
+        self.assertIs(RetributionPaladinSpells.cast_judgement, PaladinCommonSpells.cast_judgement)
+        self.assertIs(
+            RetributionPaladinSpells.spell_registry.get("cast_judgement").method,
+            original_registry_method,
+        )
+        self.assertEqual(get_method_stats(RetributionPaladinSpells), {})
+
+    # ------------------------------------------------------------------------ #
+    def test_instrumented_duels_are_unchanged(self):
+        def run():
+            simulator = BattleSimulator(
+                ("shaman", "enhancement"), ("paladin", "retribution"), RandomPolicy(3), RandomPolicy(4)
+            )
+            return list(simulator.simulate(10))
+
+        expected = run()
+        enable_instrumentation(EnhancementShamanSpells)
+
+        self.assertEqual(run(), expected)
+        self.assertIn("cast_lava_burst", EnhancementShamanSpells.spell_registry.spells_with_args)
+        self.assertGreater(get_method_stats(EnhancementShamanSpells)["cast_lava_burst"].calls, 0)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from Heroes.hero_factory import HeroFactory
+from Simulations.matrix_handler import (
+    MatchupMatrix,
+    MatrixCell,
+    write_matrix_csv,
+    write_matrix_json,
+)
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestMatchupMatrix(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    @classmethod
+    def setUpClass(cls) -> None:
+        matrix = MatchupMatrix(battles_per_cell=2, workers=1, chunk_size=1, seed=7, analytics=True)
+        cls.cells = matrix.run()
+        cls.report = matrix.analytics.report()
+
+    # ------------------------------------------------------------------------ #
+    def test_every_pairing_has_a_cell(self):
+        hero_keys = [":".join(hero_key) for hero_key in HeroFactory._hero_registry]
+        pairings = [(attacker, defender) for attacker in hero_keys for defender in hero_keys]
+
+        self.assertEqual([(cell.attacker, cell.defender) for cell in self.cells], pairings)
+        for cell in self.cells:
+            self.assertEqual(cell.attacker_wins + cell.defender_wins + cell.draws, cell.battles)
+            self.assertEqual(cell.win_rate, cell.attacker_wins / cell.battles)
+
+    # ------------------------------------------------------------------------ #
+    def test_workers_do_not_change_results(self):
+        matrix = MatchupMatrix(battles_per_cell=2, workers=2, chunk_size=1, seed=7, analytics=True)
+        cells = matrix.run()
+
+        # The wall time is the only field which depends on the workers
+        self.assertEqual(
+            [cell._replace(wall_time=0.0) for cell in cells],
+            [cell._replace(wall_time=0.0) for cell in self.cells],
+        )
+        self.assertEqual(matrix.analytics.report(), self.report)
+
+    # ------------------------------------------------------------------------ #
+    def test_output_round_trip(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            csv_path = os.path.join(output_dir, "matrix.csv")
+            json_path = os.path.join(output_dir, "matrix.json")
+            write_matrix_csv(self.cells, csv_path)
+            write_matrix_json(self.cells, json_path)
+
+            with open(csv_path, newline="", encoding="utf-8") as csv_file:
+                rows = list(csv.DictReader(csv_file))
+            with open(json_path, encoding="utf-8") as json_file:
+                objects = json.load(json_file)
+
+        types = MatrixCell.__annotations__
+        csv_cells = [
+            MatrixCell(**{field: types[field](value) for field, value in row.items()})
+            for row in rows
+        ]
+        self.assertEqual(csv_cells, self.cells)
+        self.assertEqual([MatrixCell(**cell) for cell in objects], self.cells)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import unittest
+
+from effects_handler import EffectScheduler
+from Heroes.hero_factory import HeroFactory
+from Simulations import mcts_handler
+from Simulations.mcts_handler import MonteCarloPolicy, MonteCarloSearch, _grow_tree
+from Simulations.minimax_handler import DuelModel
+from Simulations.simulation_handler import BattleSimulator, RandomPolicy, summarize_results
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestMonteCarlo(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_spells_without_resource_spend_the_turn(self):
+        hero_factory = HeroFactory()
+        for attacker_key, defender_key in (
+            (("paladin", "retribution"), ("warrior", "protection")),
+            (("warrior", "fury"), ("paladin", "retribution")),
+        ):
+            attacker = hero_factory.create_hero(*attacker_key)
+            defender = hero_factory.create_hero(*defender_key)
+            model = DuelModel(attacker, defender)
+            position = model.get_position(EffectScheduler(), attacker, defender, 0)
+            spell_ids = model.get_ready_spells(position)
+
+            # Without class resource, Final Verdict and Rampage return None and change nothing
+            for spell in ("cast_final_verdict", "cast_rampage"):
+                entry = type(attacker).spell_registry.get(spell)
+                if entry is not None:
+                    self.assertEqual(
+                        model.play(position, entry.spell_id), (position[0], position[1], 1)
+                    )
+
+            stats, rollouts = MonteCarloSearch(model, 0, seed=1).run(position, spell_ids, 0.02)
+            with self.subTest(attacker=attacker_key):
+                self.assertEqual(set(stats), set(spell_ids))
+                self.assertEqual(sum(visits for visits, _ in stats.values()), rollouts)
+
+    # ------------------------------------------------------------------------ #
+    def test_root_parallel_policy_beats_random(self):
+        policy = MonteCarloPolicy(time_budget=0.02, workers=2, seed=1)
+        self.addCleanup(policy.close)
+        # Random Retribution Paladins win about one duel in ten against Protection Warriors
+        simulator = BattleSimulator(
+            ("paladin", "retribution"), ("warrior", "protection"), policy, RandomPolicy(3)
+        )
+        summary = summarize_results(simulator.simulate(2))
+
+        self.assertEqual(summary["attacker"], 2)
+        self.assertGreater(policy.rollouts_per_second, 0)
+
+    # ------------------------------------------------------------------------ #
+    def test_worker_keeps_model_of_duel(self):
+        self.addCleanup(mcts_handler._worker_models.clear)
+        hero_factory = HeroFactory()
+        attacker = hero_factory.create_hero("paladin", "retribution")
+        defender = hero_factory.create_hero("mage", "fire")
+        model = DuelModel(attacker, defender)
+        position = model.get_position(EffectScheduler(), attacker, defender, 0)
+        spell_ids = model.get_ready_spells(position)
+
+        self.assertIsNotNone(_grow_tree((7, model, 0, position, spell_ids, 0.01, 1)))
+        # The later moves of the duel only send its id
+        self.assertIsNotNone(_grow_tree((7, None, 0, position, spell_ids, 0.01, 2)))
+        self.assertIsNone(_grow_tree((8, None, 0, position, spell_ids, 0.01, 3)))
+
+    # ------------------------------------------------------------------------ #
+    def test_async_search_does_not_block_event_loop(self):
+        policy = MonteCarloPolicy(time_budget=0.2, workers=2, seed=1)
+        self.addCleanup(policy.close)
+        hero_factory = HeroFactory()
+        hero = hero_factory.create_hero("paladin", "retribution")
+        opponent = hero_factory.create_hero("warrior", "protection")
+        scheduler = EffectScheduler()
+        policy.begin_duel(hero, opponent, scheduler, True)
+        spells = scheduler.get_ready_spells(hero, type(hero).spell_registry.names)
+
+        async def search() -> tuple[list[str], int]:
+            ticks = 0
+            moves = asyncio.gather(*(policy.select_spell_async(hero, spells, 0) for _ in range(2)))
+            while not moves.done():
+                await asyncio.sleep(0.01)
+                ticks += 1
+            return await moves, ticks
+
+        selected, ticks = asyncio.run(search())
+        self.assertTrue(set(selected) <= set(spells))
+        self.assertGreater(ticks, 10)
+        self.assertGreater(policy.rollouts, 0)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
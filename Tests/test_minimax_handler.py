@@ -0,0 +1,85 @@
+import random
+import time
+import unittest
+
+from battles_handler import Attacking
+from effects_handler import EffectScheduler
+from Heroes.hero_factory import HeroFactory
+from Simulations.minimax_handler import DuelModel, MinimaxPolicy
+from Simulations.simulation_handler import BattleSimulator, RandomPolicy, summarize_results
+
+# --------------------------------- Constants -------------------------------- #
+PAIRINGS = [
+    (("paladin", "retribution"), ("shaman", "enhancement")),
+    (("priest", "shadow"), ("monk", "windwalker")),
+    (("warrior", "protection"), ("mage", "fire")),
+]
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestMinimax(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_model_follows_battle(self):
+        for attacker_key, defender_key in PAIRINGS:
+            rng = random.Random(7)
+            hero_factory = HeroFactory()
+            attacker = hero_factory.create_hero(*attacker_key)
+            defender = hero_factory.create_hero(*defender_key)
+            scheduler = EffectScheduler()
+            model = DuelModel(attacker, defender)
+            position = model.get_position(scheduler, attacker, defender, 0)
+            sides = (
+                (Attacking(attacker, defender, scheduler), attacker, defender),
+                (Attacking(defender, attacker, scheduler), defender, attacker),
+            )
+
+            for turn in range(30):
+                scheduler.start_turn(turn)
+                if isinstance(position, int):
+                    break
+                with self.subTest(attacker=attacker_key, defender=defender_key, turn=turn):
+                    self.assertEqual(model.get_position(scheduler, attacker, defender, 0), position)
+
+                for attacking, hero, opponent in sides:
+                    registry = type(hero).spell_registry
+                    spells = scheduler.get_ready_spells(hero, registry.names)
+                    spell = rng.choice(spells) if spells else None
+                    if spell in registry.spells_with_args:
+                        attacking.attack(spell, scheduler.get_active_effects(opponent))
+                    elif spell is not None:
+                        attacking.attack(spell)
+                    position = model.play(position, registry.get(spell).spell_id if spell else -1)
+                    if isinstance(position, int):
+                        break
+
+    # ------------------------------------------------------------------------ #
+    def test_policy_beats_random_within_budget(self):
+        policy = MinimaxPolicy(time_budget=0.005)
+        select_spell = policy.select_spell
+        move_times = []
+
+        def timed_select_spell(hero, spells, turn):
+            start = time.perf_counter()
+            spell = select_spell(hero, spells, turn)
+            move_times.append(time.perf_counter() - start)
+            return spell
+
+        policy.select_spell = timed_select_spell
+        # Random Retribution Paladins win about one duel in ten against Protection Warriors
+        simulator = BattleSimulator(
+            ("paladin", "retribution"), ("warrior", "protection"), policy, RandomPolicy(3)
+        )
+        summary = summarize_results(simulator.simulate(3))
+
+        self.assertEqual(summary["attacker"], 3)
+        self.assertLess(max(move_times), 0.05)
+        self.assertEqual(policy._duels, {})
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from battles_handler import Attacking, Defending
+from effects_handler import EffectScheduler
+from Heroes.hero_factory import HeroFactory
+from mitigation_handler import ABSORB, FLAT, PERCENT, MitigationStack
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestMitigationStack(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_effects_are_combined_and_expire(self):
+        stack = MitigationStack(max_percent=80)
+        stack.add("ignore_pain", PERCENT, 50, 3)
+        stack.add("divine_shield", PERCENT, 50, 4)
+        stack.add("blessed_hammer", FLAT, 12, 3)
+        stack.add("power_word_shield", ABSORB, 30, 5)
+        self.assertEqual((stack.damage_taken, stack.flat, stack.absorb), (20, 12, 30))
+
+        self.assertEqual(stack.absorb_damage(20), 0)
+        self.assertEqual(stack.absorb_damage(25), 15)
+        self.assertEqual(stack.absorb, 0)
+
+        # A refreshed effect is kept by the expiry of the earlier cast
+        stack.add("ignore_pain", PERCENT, 50, 6)
+        stack.expire("ignore_pain", 3)
+        stack.expire("blessed_hammer", 3)
+        self.assertEqual((stack.damage_taken, stack.flat), (20, 0))
+        stack.expire("divine_shield", 4)
+        self.assertEqual(stack.damage_taken, 50)
+
+    # ------------------------------------------------------------------------ #
+    def test_spells_mitigate_hits_while_active(self):
+        hero_factory = HeroFactory()
+        warrior = hero_factory.create_hero("warrior", "protection")
+        priest = hero_factory.create_hero("priest", "shadow")
+        scheduler = EffectScheduler()
+        priest_attacking = Attacking(priest, warrior, scheduler)
+        warrior_attacking = Attacking(warrior, priest, scheduler)
+
+        shield = priest_attacking.attack("cast_power_word_shield")
+        health = priest.get_current_health()
+        # Champion's Spear and Charge hit through the shield and generate the rage of Shield Block
+        damage = warrior_attacking.attack("cast_champions_spear").spell_damage
+        damage += warrior_attacking.attack("cast_charge").spell_damage
+        self.assertEqual(priest.get_current_health(), health - (damage - shield.damage_reduction))
+        self.assertEqual(scheduler.get_mitigation(priest).absorb, 0)
+
+        self.assertIsNotNone(warrior_attacking.attack("cast_shield_block"))
+        health = warrior.get_current_health()
+        self.assertGreater(priest_attacking.attack("cast_mind_blast").spell_damage, 0)
+        self.assertEqual(warrior.get_current_health(), health)
+
+        scheduler.start_turn(2)
+        self.assertEqual(scheduler.get_mitigation(warrior).effects, {})
+        self.assertEqual(scheduler.get_mitigation(priest).effects, {})
+
+
+    # ------------------------------------------------------------------------ #
+    def test_deflect_does_not_use_up_absorb(self):
+        warrior = HeroFactory().create_hero("warrior", "protection")
+        stack = MitigationStack(warrior.max_damage_reduction)
+        stack.add("power_word_shield", ABSORB, 30, 5)
+        defending = Defending(warrior, stack)
+        damage = 50 + warrior.damage_reduction
+
+        self.assertEqual(defending.deflect(damage), 20)
+        self.assertEqual(defending.parry(damage), 20)
+        self.assertEqual(stack.absorb, 30)
+
+        health = warrior.get_current_health()
+        self.assertEqual(defending.take_hit(warrior, "cast_charge", damage), 20)
+        self.assertEqual(warrior.get_current_health(), health - 20)
+        self.assertEqual(stack.absorb, 0)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
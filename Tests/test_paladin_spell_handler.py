@@ -18,23 +18,45 @@ class TestRetributionPaladinSpells(unittest.TestCase):
         del self.cls_instance
 
     # ------------------------------------------------------------------------ #
-    def test_cast_divine_protection_raise_error(self):
-        self.cls_instance._secondary_pool = 0
+    def test_cast_divine_protection_spends_mana(self):
+        mana = self.cls_instance._curr_mana
+        result = self.cls_instance.cast_divine_protection()
 
-        with self.assertRaises(ValueError):
-            self.cls_instance.cast_divine_shield()
+        self.assertEqual(self.cls_instance._curr_mana, mana - result.spell_cost)
+        self.assertGreater(result.turns_active, 0)
+
+    # ------------------------------------------------------------------------ #
+    def test_unknown_attribute_raise_error(self):
+        with self.assertRaises(AttributeError):
+            self.cls_instance._secondary_pool = 0
 
     # ------------------------------------------------------------------------ #
     def test_blade_of_justice(self):
-        pass
+        result = self.cls_instance.cast_blade_of_justice()
+
+        self.assertEqual(result.spell_damage, 14)
+        self.assertEqual(result.cooldown, 3)
+        self.assertEqual(self.cls_instance._curr_holy_power, 1)
+        self.assertIs(self.cls_instance.cast_blade_of_justice(), result)
 
     # ------------------------------------------------------------------------ #
     def test_final_verdict(self):
-        pass
+        self.assertIsNone(self.cls_instance.cast_final_verdict())
+
+        self.cls_instance.add_specific_stat(3)
+        result = self.cls_instance.cast_final_verdict()
+
+        self.assertEqual(result.spell_damage, 17)
+        self.assertEqual(self.cls_instance._curr_holy_power, 0)
 
     # ------------------------------------------------------------------------ #
     def test_wake_of_ashes(self):
-        pass
+        self.cls_instance.cast_divine_shield()
+        result = self.cls_instance.cast_wake_of_ashes()
+
+        self.assertEqual(result.spell_damage, 30)
+        self.assertEqual(result.damage_reduction, 0)
+        self.assertEqual(self.cls_instance._curr_holy_power, 3)
 
 
 # ---------------------------------------------------------------------------- #
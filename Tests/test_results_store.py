@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+from Simulations.simulation_handler import ATTACKER, DEFENDER, BattleResult
+from Storage.results_store import (
+    INDEX_MAGIC,
+    RECORDS_PER_EXTENT,
+    ResultsStore,
+    ResultsWriter,
+    get_index_path,
+    read_index,
+)
+
+# --------------------------------- Constants -------------------------------- #
+FURY_WARRIOR = ("warrior", "fury")
+SHADOW_PRIEST = ("priest", "shadow")
+FIRE_MAGE = ("mage", "fire")
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestResultsStore(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        os.remove(self.path)
+
+    # ------------------------------------------------------------------------ #
+    def tearDown(self):
+        for path in (self.path, get_index_path(self.path)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # ------------------------------------------------------------------------ #
+    def test_query_filters_one_pairing(self):
+        winners = (ATTACKER, DEFENDER, None)
+        results = [
+            BattleResult(winners[duel % 3], duel % 25, duel, -duel)
+            for duel in range(RECORDS_PER_EXTENT * 2 + 7)
+        ]
+        with ResultsWriter(self.path) as writer:
+            for result in results:
+                writer.append(FURY_WARRIOR, SHADOW_PRIEST, result)
+                writer.append(FIRE_MAGE, SHADOW_PRIEST, result._replace(winner=DEFENDER, turns=1))
+
+        with ResultsStore(self.path) as store:
+            self.assertEqual(store.count(FURY_WARRIOR, SHADOW_PRIEST), len(results))
+            self.assertEqual(store.count(SHADOW_PRIEST, FURY_WARRIOR), 0)
+            self.assertEqual(list(store.query(FURY_WARRIOR, SHADOW_PRIEST)), results)
+            self.assertEqual(
+                list(store.query(FURY_WARRIOR, SHADOW_PRIEST, winner=DEFENDER, turns_below=10)),
+                [result for result in results if result.winner == DEFENDER and result.turns < 10],
+            )
+            self.assertEqual(
+                list(store.query(FURY_WARRIOR, SHADOW_PRIEST, winner=None)),
+                [result for result in results if result.winner is None],
+            )
+
+        # Every extent holds a single pairing only
+        self.assertEqual(len(read_index(self.path)[(FURY_WARRIOR, SHADOW_PRIEST)]), 3)
+
+    # ------------------------------------------------------------------------ #
+    def test_reopening_appends(self):
+        result = BattleResult(ATTACKER, 12, 300, 0)
+        for _ in range(2):
+            with ResultsWriter(self.path) as writer:
+                writer.append(FURY_WARRIOR, SHADOW_PRIEST, result)
+
+        with ResultsStore(self.path) as store:
+            self.assertEqual(list(store.query(FURY_WARRIOR, SHADOW_PRIEST)), [result, result])
+
+    # ------------------------------------------------------------------------ #
+    def test_store_of_other_specs_is_rejected(self):
+        with ResultsWriter(self.path) as writer:
+            writer.append(FURY_WARRIOR, SHADOW_PRIEST, BattleResult(DEFENDER, 9, 0, 120))
+
+        # A store written with another list of specs has another digest after the magic
+        with open(get_index_path(self.path), "r+b") as index_file:
+            index_file.seek(len(INDEX_MAGIC))
+            index_file.write(b"\x00" * 4)
+
+        with self.assertRaisesRegex(ValueError, "other specs"):
+            ResultsStore(self.path)
+        with self.assertRaisesRegex(ValueError, "other specs"):
+            ResultsWriter(self.path)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from battles_handler import Attacking
+from effects_handler import EffectScheduler
+from Heroes.hero_factory import HeroFactory
+from Simulations.rotation_handler import RotationOptimizer, optimize_rotation
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Helpers                                   #
+# ---------------------------------------------------------------------------- #
+def replay_damage(hero_key: tuple[str, str], spells: tuple[str | None, ...]) -> int:
+    """
+    Cast the spells in a battle against a target, which never casts, and return the damage it took.
+    """
+    hero_factory = HeroFactory()
+    caster = hero_factory.create_hero(*hero_key)
+    target = hero_factory.create_hero("paladin", "protection")
+    target._curr_health = 10**9
+    scheduler = EffectScheduler()
+    attacking = Attacking(caster, target, scheduler)
+    spells_with_args = type(caster).spell_registry.spells_with_args
+
+    for turn, spell in enumerate(spells):
+        scheduler.start_turn(turn)
+        if spell is None:
+            continue
+        if spell in spells_with_args:
+            attacking.attack(spell, scheduler.get_active_effects(target))
+        else:
+            attacking.attack(spell)
+
+    return 10**9 - target.get_current_health()
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestRotationOptimizer(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_plan_damage_matches_battle(self):
+        for hero_key in HeroFactory._hero_registry:
+            plan = optimize_rotation(hero_key, 12)
+            with self.subTest(hero_key=hero_key):
+                self.assertEqual(len(plan.spells), 12)
+                self.assertEqual(replay_damage(hero_key, plan.spells), plan.damage)
+
+    # ------------------------------------------------------------------------ #
+    def test_transpositions_are_expanded_once(self):
+        optimizer = RotationOptimizer(("monk", "windwalker"))
+        plan = optimizer.optimize(20)
+        cache_size = optimizer.cache_size
+
+        self.assertIn("cast_fists_of_fury", plan.spells)
+        # 7 spells give billions of sequences of 20 casts, but only a few thousand distinct states
+        self.assertLess(cache_size, 5000)
+        self.assertEqual(optimizer.optimize(20), plan)
+        self.assertEqual(optimizer.cache_size, cache_size)
+
+    # ------------------------------------------------------------------------ #
+    def test_invalid_casts_raise_error(self):
+        with self.assertRaises(ValueError):
+            optimize_rotation(("monk", "windwalker"), 0)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
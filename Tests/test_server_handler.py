@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+
+from server_handler import SESSION_MAX_TABLE_SIZE, GameServer
+from Simulations.minimax_handler import MinimaxPolicy
+
+# --------------------------------- Constants -------------------------------- #
+IDLE_SESSIONS = 200
+THINK_TIME = 0.5
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    # ------------------------------------------------------------------------ #
+    async def asyncSetUp(self):
+        self.server = GameServer(port=0)
+        await self.server.start()
+
+    # ------------------------------------------------------------------------ #
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    # ------------------------------------------------------------------------ #
+    async def connect(self):
+        return await asyncio.open_connection("127.0.0.1", self.server.port)
+
+    # ------------------------------------------------------------------------ #
+    async def test_duel_until_finished(self):
+        reader, writer = await self.connect()
+        for line in ("warrior", "damage", "mage"):
+            await reader.readline()
+            writer.write(f"{line}\n".encode())
+
+        self.assertEqual(await reader.readline(), b"Automatically selected role: Damage\n")
+        self.assertEqual(
+            await reader.readline(), b"Created attacker: Fury Warrior, defender: Fire Mage\n"
+        )
+
+        while True:
+            line = (await reader.readline()).decode()
+            if not line.startswith("Turn"):
+                break
+            writer.write(b"0\n")
+            self.assertIn("Health:", (await reader.readline()).decode())
+
+        self.assertRegex(line, r"^(You win|You lose|Draw) after \d+ turns\.$")
+        self.assertEqual(await reader.read(), b"")
+        writer.close()
+
+    # ------------------------------------------------------------------------ #
+    async def test_invalid_choices_end_the_session(self):
+        reader, writer = await self.connect()
+        await reader.readline()
+        for _ in range(3):
+            writer.write(b"druid\n")
+            line = await reader.readline()
+
+        self.assertEqual(line, b"Too many invalid attempts. Goodbye.\n")
+        self.assertEqual(await reader.read(), b"")
+        writer.close()
+
+    # ------------------------------------------------------------------------ #
+    async def test_many_idle_sessions(self):
+        connections = [await self.connect() for _ in range(IDLE_SESSIONS)]
+        for reader, _ in connections:
+            await reader.readline()
+        self.assertEqual(self.server.session_count, IDLE_SESSIONS)
+
+        for _, writer in connections:
+            writer.close()
+            await writer.wait_closed()
+
+
+# ---------------------------------------------------------------------------- #
+class TestSearchingServer(unittest.IsolatedAsyncioTestCase):
+    # ------------------------------------------------------------------------ #
+    async def asyncSetUp(self):
+        policy = MinimaxPolicy(time_budget=THINK_TIME, max_table_size=SESSION_MAX_TABLE_SIZE)
+        self.server = GameServer(port=0, defender_policy=policy)
+        await self.server.start()
+
+    # ------------------------------------------------------------------------ #
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    # ------------------------------------------------------------------------ #
+    async def test_search_does_not_block_other_sessions(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+        for line in ("warrior", "damage", "mage"):
+            await reader.readline()
+            writer.write(f"{line}\n".encode())
+        for _ in range(3):
+            await reader.readline()
+
+        # The defender searches for its spell, while the next player connects
+        writer.write(b"0\n")
+        turn = asyncio.create_task(reader.readline())
+        other_reader, other_writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+        self.assertTrue((await other_reader.readline()).startswith(b"Enter the class"))
+        self.assertFalse(turn.done())
+
+        self.assertIn(b"Health:", await turn)
+        for connection in (writer, other_writer):
+            connection.close()
+            await connection.wait_closed()
+
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from Simulations.simulation_handler import (
+    BattleSimulator,
+    RandomPolicy,
+    parse_hero_key,
+    summarize_results,
+)
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestBattleSimulator(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_run_duel_has_winner(self):
+        simulator = BattleSimulator(("paladin", "retribution"), ("warrior", "protection"))
+        result = simulator.run_duel()
+
+        self.assertIn(result.winner, ("attacker", "defender"))
+        self.assertTrue(result.attacker_health <= 0 or result.defender_health <= 0)
+
+    # ------------------------------------------------------------------------ #
+    def test_seeded_duels_are_reproducible(self):
+        results = []
+        for _ in range(2):
+            simulator = BattleSimulator(
+                ("shaman", "enhancement"),
+                ("monk", "windwalker"),
+                RandomPolicy(1),
+                RandomPolicy(2),
+            )
+            results.append(list(simulator.simulate(20)))
+
+        self.assertEqual(results[0], results[1])
+
+    # ------------------------------------------------------------------------ #
+    def test_turn_limit_ends_in_draw(self):
+        simulator = BattleSimulator(("mage", "fire"), ("priest", "shadow"), max_turns=1)
+        summary = summarize_results(simulator.simulate(5))
+
+        self.assertEqual(summary["battles"], 5)
+        self.assertEqual(summary["draws"], 5)
+
+    # ------------------------------------------------------------------------ #
+    def test_parse_hero_key(self):
+        self.assertEqual(parse_hero_key("Paladin:Retribution"), ("paladin", "retribution"))
+
+        with self.assertRaises(ValueError):
+            parse_hero_key("paladin")
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from Heroes import spec_data
+from Heroes.hero_factory import HeroFactory
+from Heroes.spec_data import DEFAULT_SPEC_PATH, load_spec_definitions
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestSpecData(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_heroes_are_built_from_the_definitions(self):
+        for hero_key, spec in load_spec_definitions().items():
+            hero = HeroFactory().create_hero(*hero_key)
+            self.assertEqual(type(hero).__name__, spec.class_name)
+            self.assertEqual(type(hero).spell_definitions, spec.spells)
+            for stat, value in spec.stats.items():
+                self.assertEqual(getattr(hero, stat), value)
+
+    # ------------------------------------------------------------------------ #
+    def test_cache_follows_changes_of_the_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "specs.json")
+            shutil.copyfile(DEFAULT_SPEC_PATH, path)
+            specs = load_spec_definitions(path)
+            self.assertTrue(os.path.exists(os.path.join(directory, "__pycache__", "specs.marshal")))
+
+            with open(path, encoding="utf-8") as data_file:
+                data = json.load(data_file)
+            data["warrior:fury"]["stats"]["max_health"] = 1234
+            with open(path, "w", encoding="utf-8") as data_file:
+                json.dump(data, data_file)
+            spec_data._loaded.pop(path)
+            changed = load_spec_definitions(path)
+            self.assertEqual(changed["warrior", "fury"].stats["max_health"], 1234)
+            self.assertEqual(changed["mage", "fire"], specs["mage", "fire"])
+
+            data["mage:fire"]["spells"]["cast_fireball"]["power"] = 1
+            with open(path, "w", encoding="utf-8") as data_file:
+                json.dump(data, data_file)
+            spec_data._loaded.pop(path)
+            with self.assertRaises(ValueError):
+                load_spec_definitions(path)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from battles_handler import Attacking
+from Heroes.hero_factory import HeroFactory
+from Spells.shaman_spell_handler import EnhancementShamanSpells
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestSpellRegistry(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_registry_contains_only_spells(self):
+        registry = EnhancementShamanSpells.spell_registry
+
+        self.assertIn("cast_stormstrike", registry)
+        self.assertIn("cast_lighting_bolt", registry)
+        self.assertNotIn("heal_up", registry)
+        self.assertEqual(registry.spells_with_args, frozenset({"cast_lava_burst"}))
+
+        entry = registry.get("cast_feral_spirit")
+        self.assertIs(registry.get(entry.spell_id), entry)
+        self.assertEqual(entry.cooldown, 8)
+        # Booleans are not ids, even though they hash like 0 and 1
+        self.assertIsNone(registry.get(True))
+        self.assertNotIn(False, registry)
+
+    # ------------------------------------------------------------------------ #
+    def test_attack_by_id_and_name(self):
+        hero_factory = HeroFactory()
+        paladin = hero_factory.create_hero("paladin", "retribution")
+        warrior = hero_factory.create_hero("warrior", "protection")
+        attacking = Attacking(paladin, warrior)
+        spell_id = paladin.spell_registry.get("cast_blade_of_justice").spell_id
+
+        by_id = attacking.attack(spell_id)
+        by_name = attacking.attack("cast_blade_of_justice")
+
+        self.assertIs(by_id, by_name)
+        self.assertIsNone(attacking.attack("heal_up", 100))
+        self.assertIsNone(attacking.attack(len(paladin.spell_registry)))
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+
+from Heroes.hero_factory import HeroFactory
+from Heroes.spec_data import load_spec_definitions
+from Simulations.sweep_handler import (
+    BalanceSweep,
+    apply_overrides,
+    get_definitions_digest,
+    grid_configs,
+    normalize_overrides,
+)
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class TestBalanceSweep(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_overrides_are_applied_and_restored(self):
+        overrides = {"paladin:retribution": {"cast_blade_of_justice": {"attack_power": 200}}}
+        damage = HeroFactory().create_hero("paladin", "retribution")._spell_table[
+            "cast_blade_of_justice"
+        ].result.spell_damage
+
+        with apply_overrides(overrides):
+            paladin = HeroFactory().create_hero("paladin", "retribution")
+            spell = paladin._spell_table["cast_blade_of_justice"].result
+            self.assertEqual(spell.spell_damage, 150)
+
+        paladin = HeroFactory().create_hero("paladin", "retribution")
+        spell = paladin._spell_table["cast_blade_of_justice"].result
+        self.assertEqual(spell.spell_damage, damage)
+
+        with self.assertRaises(ValueError):
+            normalize_overrides({"paladin:retribution": {"cast_fireball": {"attack_power": 1}}})
+
+    # ------------------------------------------------------------------------ #
+    def test_repeated_and_overlapping_configs_are_cached(self):
+        space = {"warrior:fury": {"cast_raging_blow": {"attack_power": [400, 300]}}}
+        with tempfile.TemporaryDirectory() as cache_dir:
+            sweep = BalanceSweep(battles_per_cell=2, workers=1, cache_dir=cache_dir)
+            results = sweep.run(grid_configs(space) + [{}])
+            # The baseline value of 400 is the same config as no overrides
+            self.assertEqual((len(results), sweep.evaluated), (2, 2))
+
+            sweep = BalanceSweep(battles_per_cell=2, workers=1, cache_dir=cache_dir)
+            cached = sweep.run(grid_configs(space))
+            self.assertEqual((sweep.evaluated, sweep.cache_hits), (0, 2))
+            self.assertEqual(cached, results)
+
+    # ------------------------------------------------------------------------ #
+    def test_stat_change_changes_definitions_digest(self):
+        digest = get_definitions_digest()
+        stats = load_spec_definitions()[("mage", "fire")].stats
+        spell_power = stats.get("spell_power")
+        stats["spell_power"] = (spell_power or 0) + 10
+        try:
+            self.assertNotEqual(get_definitions_digest(), digest)
+        finally:
+            if spell_power is None:
+                del stats["spell_power"]
+            else:
+                stats["spell_power"] = spell_power
+
+        self.assertEqual(get_definitions_digest(), digest)
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    unittest.main()
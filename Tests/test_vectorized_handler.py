@@ -0,0 +1,99 @@
+import unittest
+from unittest import mock
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from Heroes.hero_factory import HeroFactory
+from Simulations.simulation_handler import BattleSimulator, ISpellPolicy
+
+if np is not None:
+    from Simulations import vectorized_handler
+    from Simulations.vectorized_handler import VectorizedBattle
+
+# --------------------------------- Constants -------------------------------- #
+DUELS_PER_PAIRING = 6
+MAX_TURNS = 200
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Helpers                                   #
+# ---------------------------------------------------------------------------- #
+class ScriptedPolicy(ISpellPolicy):
+    """
+    Chooses the spells with the given rolls, one per turn, the same way as RandomPolicy.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, rolls) -> None:
+        self._rolls = rolls
+
+    # ------------------------------------------------------------------------ #
+    def select_spell(self, hero, spells, turn):
+        return spells[int(self._rolls[turn] * len(spells))]
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestVectorizedBattle(unittest.TestCase):
+    # ------------------------------------------------------------------------ #
+    def test_matches_object_engine(self):
+        rng = np.random.default_rng(7)
+        hero_keys = list(HeroFactory._hero_registry)
+        for attacker_key in hero_keys:
+            for defender_key in hero_keys:
+                battle = VectorizedBattle(attacker_key, defender_key, DUELS_PER_PAIRING, MAX_TURNS)
+                attacker_rolls = rng.random((MAX_TURNS, DUELS_PER_PAIRING))
+                defender_rolls = rng.random((MAX_TURNS, DUELS_PER_PAIRING))
+                turn = 0
+                while battle.is_running():
+                    battle.step(attacker_rolls[turn], defender_rolls[turn])
+                    turn += 1
+
+                expected = [
+                    BattleSimulator(
+                        attacker_key,
+                        defender_key,
+                        ScriptedPolicy(attacker_rolls[:, duel]),
+                        ScriptedPolicy(defender_rolls[:, duel]),
+                        MAX_TURNS,
+                    ).run_duel()
+                    for duel in range(DUELS_PER_PAIRING)
+                ]
+                self.assertEqual(battle.results(), expected, (attacker_key, defender_key))
+
+    # ------------------------------------------------------------------------ #
+    def test_run_random_is_reproducible(self):
+        results = [
+            VectorizedBattle(("mage", "fire"), ("priest", "shadow"), 50).run_random(3)
+            for _ in range(2)
+        ]
+
+        self.assertEqual(results[0], results[1])
+        self.assertTrue(all(result.turns > 0 for result in results[0]))
+
+
+    # ------------------------------------------------------------------------ #
+    def test_every_spell_needs_a_behaviour(self):
+        behaviours = dict(vectorized_handler._SPELL_BEHAVIOURS)
+        del behaviours["cast_tempest"]
+        with mock.patch.object(vectorized_handler, "_SPELL_BEHAVIOURS", behaviours):
+            with self.assertRaisesRegex(ValueError, "missing \\['cast_tempest'\\]"):
+                vectorized_handler._check_spell_behaviours()
+
+        behaviours = dict(vectorized_handler._SPELL_BEHAVIOURS)
+        behaviours["cast_judgement"] = vectorized_handler.SpellBehaviour(gated_cooldown=True)
+        with mock.patch.object(vectorized_handler, "_SPELL_BEHAVIOURS", behaviours):
+            with self.assertRaisesRegex(ValueError, "cast_judgement has a gated cooldown"):
+                vectorized_handler._check_spell_behaviours()
+
+
+# ---------------------------------------------------------------------------- #
+#                                     Main                                     #
+# ---------------------------------------------------------------------------- #
+if __name__ == '__main__':
+    unittest.main()
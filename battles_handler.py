@@ -1,31 +1,435 @@
 """
 Handler class, which contains the logic behind the battles.
 Heroes can attack to deal damage or heal, deflect or parry to mitigate some of the damage dealt.
+What happens in a battle - casts, damage, healing, class resource gained and spent - is published
+to an event bus, which delivers the events to its listeners once per turn.
 """
 
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from effects_handler import EffectScheduler
 from Heroes.hero_base_stats import IBaseHero
+from Heroes.hero_layout import GATE_CONSUME, GATE_EXACT_RESET, get_hero_layout
+from mitigation_handler import MitigationStack
+from Spells.spell_records import SpellResult
+from Spells.spell_registry import SpellEntry
+
+if TYPE_CHECKING:
+    from Storage.battle_log import BattleRecorder
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class ComboResult(NamedTuple):
+    """
+    Outcome of a combo. Spells after the one which killed the defender are not cast,
+    so the results can be shorter than the combo.
+    """
+
+    spells: tuple[str, ...]
+    results: tuple[SpellResult | None, ...]
+    damage: int
+
+
+# ---------------------------------------------------------------------------- #
+class CastEvent(NamedTuple):
+    """
+    A spell cast by the attacker and the damage it dealt after the mitigation of the defender.
+    The result is None if the spell could not be cast.
+    """
+
+    attacker: IBaseHero
+    spell_name: str
+    result: SpellResult | None
+    damage_taken: int
+
+
+# ---------------------------------------------------------------------------- #
+class DamageEvent(NamedTuple):
+    """
+    Damage of a spell or of a damage over time tick, before and after the mitigation of the defender.
+    """
+
+    attacker: IBaseHero
+    defender: IBaseHero
+    spell_name: str  # name of the spell method or of the damage over time effect
+    damage: int
+    damage_taken: int
+
+
+# ---------------------------------------------------------------------------- #
+class HealEvent(NamedTuple):
+    """
+    Health restored to a hero, without the overhealing.
+    """
+
+    hero: IBaseHero
+    spell_name: str | None  # name of the spell method, which healed, None for a heal outside of a cast
+    amount: int
+
+
+# ---------------------------------------------------------------------------- #
+class ResourceGainEvent(NamedTuple):
+    """
+    Class resource generated by a hero, without the part above its max.
+    """
+
+    hero: IBaseHero
+    amount: int
+
+
+# ---------------------------------------------------------------------------- #
+class ResourceSpendEvent(NamedTuple):
+    """
+    Class resource spent by a hero on a spell.
+    """
+
+    hero: IBaseHero
+    amount: int
 
 
 # ---------------------------------------------------------------------------- #
 #                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class EventBus:
+    """
+    Typed event bus of a battle. Listeners subscribe to an event type and receive all events of that
+    type at the end of every turn, in one batch.
+    Heroes publish through the bus attached to them. The publisher of an event type is None while
+    the type has no listeners, so the publishing code skips building the event and headless battles,
+    whose heroes have no bus, only pay for a single None check.
+    """
+
+    __slots__ = (
+        "_listeners",
+        "_batches",
+        "casting",
+        "publish_cast",
+        "publish_damage",
+        "publish_heal",
+        "publish_resource_gain",
+        "publish_resource_spend",
+    )
+
+    _PUBLISHERS = {
+        CastEvent: "publish_cast",
+        DamageEvent: "publish_damage",
+        HealEvent: "publish_heal",
+        ResourceGainEvent: "publish_resource_gain",
+        ResourceSpendEvent: "publish_resource_spend",
+    }
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self) -> None:
+        self._listeners: dict[type, list[Callable[[int, list[Any]], None]]] = {}
+        self._batches: dict[type, list] = {}
+        # Name of the spell method being cast, so the events published by the spell can name it
+        self.casting: str | None = None
+        self.publish_cast: Callable[..., None] | None = None
+        self.publish_damage: Callable[..., None] | None = None
+        self.publish_heal: Callable[..., None] | None = None
+        self.publish_resource_gain: Callable[..., None] | None = None
+        self.publish_resource_spend: Callable[..., None] | None = None
+
+    # ------------------------------------------------------------------------ #
+    def subscribe(self, event_type: type, listener: Callable[[int, list[Any]], None]) -> None:
+        """
+        Deliver the events of a type to the listener, once per turn.
+
+        Args:
+            event_type (type): CastEvent, DamageEvent, HealEvent, ResourceGainEvent or ResourceSpendEvent
+            listener (Callable[[int, list[Any]], None]): called with the turn and its events
+
+        Raises:
+            ValueError: if the event type is unknown
+        """
+        publisher = self._PUBLISHERS.get(event_type)
+        if publisher is None:
+            raise ValueError(f"Unknown event type: {event_type}")
+
+        listeners = self._listeners.setdefault(event_type, [])
+        listeners.append(listener)
+        if len(listeners) == 1:
+            batch = self._batches[event_type] = []
+            setattr(self, publisher, self._make_publisher(event_type, batch))
+
+    # ------------------------------------------------------------------------ #
+    def unsubscribe(self, event_type: type, listener: Callable[[int, list[Any]], None]) -> None:
+        """
+        Stop delivering the events of a type to the listener. The undelivered events of the type
+        are dropped with its last listener.
+
+        Args:
+            event_type (type): type of the events
+            listener (Callable[[int, list[Any]], None]): a subscribed listener
+
+        Raises:
+            ValueError: if the listener is not subscribed to the event type
+        """
+        listeners = self._listeners.get(event_type)
+        if not listeners or listener not in listeners:
+            raise ValueError(f"Listener is not subscribed to {event_type.__name__}")
+
+        listeners.remove(listener)
+        if not listeners:
+            del self._listeners[event_type]
+            del self._batches[event_type]
+            setattr(self, self._PUBLISHERS[event_type], None)
+
+    # ------------------------------------------------------------------------ #
+    def attach(self, *heroes: IBaseHero) -> None:
+        """
+        Publish the events of the heroes to this bus.
+        """
+        for hero in heroes:
+            hero.event_bus = self
+
+    # ------------------------------------------------------------------------ #
+    def detach(self, *heroes: IBaseHero) -> None:
+        """
+        Stop publishing the events of the heroes.
+        """
+        for hero in heroes:
+            if hero.event_bus is self:
+                hero.event_bus = None
+
+    # ------------------------------------------------------------------------ #
+    def flush(self, turn: int) -> None:
+        """
+        Deliver the events published since the last flush to the listeners of their types.
+
+        Args:
+            turn (int): turn in which the events happened
+        """
+        for event_type, batch in self._batches.items():
+            if batch:
+                events = batch.copy()
+                batch.clear()
+                for listener in self._listeners[event_type]:
+                    listener(turn, events)
+
+    # ------------------------------------------------------------------------ #
+    @staticmethod
+    def _make_publisher(event_type: type, batch: list) -> Callable[..., None]:
+        append = batch.append
+
+        def publish(*fields) -> None:
+            append(event_type(*fields))
+
+        return publish
+
+
 # ---------------------------------------------------------------------------- #
 class Attacking:
 
     # ------------------------------------------------------------------------ #
-    def __init__(self, attacker: IBaseHero, defender: IBaseHero) -> None:
+    def __init__(
+        self,
+        attacker: IBaseHero,
+        defender: IBaseHero,
+        scheduler: EffectScheduler | None = None,
+        recorder: "BattleRecorder | None" = None,
+    ) -> None:
         self._attacker = attacker
         self._defender = defender
+        self._defending = Defending(
+            defender, scheduler.get_mitigation(defender) if scheduler is not None else None
+        )
+        self._scheduler = scheduler
+        self._recorder = recorder
+        self._spells = type(attacker).spell_registry
+
+    # ------------------------------------------------------------------------ #
+    def attack(self, selected_spell: int | str, *spell_args) -> SpellResult | None:
+        """
+        Cast the selected spell of the attacker and apply its damage to the defender,
+        after it has been mitigated by the defender. With an effect scheduler, spells on cooldown
+        can not be cast and the cooldown and the effect of every cast spell are scheduled.
+        With a battle recorder, every cast spell is written to the battle log.
+
+        Args:
+            selected_spell (int | str): id of the spell in the spell registry of the attacker
+                or name of the spell method, for example "cast_judgement"
+            spell_args: extra arguments for spells, which need them (e.g. the active spells for Lava Burst)
+
+        Returns:
+            SpellResult | None: result of the cast spell or None if the spell is invalid, on cooldown
+            or could not be cast
+        """
+        spell = self._spells.get(selected_spell)
+        if spell is None:
+            return None
+
+        scheduler = self._scheduler
+        if scheduler is not None and scheduler.is_on_cooldown(self._attacker, spell.name):
+            return None
+
+        return self._cast(spell, spell_args)[0]
+
+    # ------------------------------------------------------------------------ #
+    def snapshot(self) -> tuple:
+        """
+        Capture the state of the battle between the attacker and the defender - health, pools and
+        class resources of both heroes and, with an effect scheduler, all cooldowns, active effects,
+        damage over time and mitigation. Events already published to an event bus are not part of it.
+
+        Returns:
+            tuple: state of the battle, which can be given to restore
+        """
+        scheduler = self._scheduler
+        if scheduler is None:
+            return (self._attacker.snapshot(), self._defending.snapshot(), None)
+
+        # The scheduler holds the mitigation stacks of both heroes
+        return (self._attacker.snapshot(), self._defender.snapshot(), scheduler.snapshot())
+
+    # ------------------------------------------------------------------------ #
+    def restore(self, state: tuple) -> None:
+        """
+        Bring the battle back to a captured state. An effect scheduler shared with the Attacking
+        of the opponent is restored too, so a single snapshot covers both directions of a duel.
+
+        Args:
+            state (tuple): state captured by snapshot of the same Attacking
+        """
+        attacker_state, defender_state, scheduler_state = state
+        self._attacker.restore(attacker_state)
+        if scheduler_state is None:
+            self._defending.restore(defender_state)
+        else:
+            self._defender.restore(defender_state)
+            self._scheduler.restore(scheduler_state)
+
+    # ------------------------------------------------------------------------ #
+    def validate_combo(self, spells: Sequence[int | str]) -> tuple[SpellEntry, ...]:
+        """
+        Check in a single pass, without changing any state, that the attacker can cast all spells
+        of a combo one after another - every spell is known and not on cooldown, no spell with a cooldown
+        is cast twice and the class resource (holy power, rage, chi, ...) covers every spell which needs it,
+        including the resource generated by the spells before it.
+
+        Args:
+            spells (Sequence[int | str]): ids or names of the spells, in the order of casting
+
+        Raises:
+            ValueError: if the combo is empty or any of its spells can not be cast
+
+        Returns:
+            tuple[SpellEntry, ...]: the spells of the combo
+        """
+        if not spells:
+            raise ValueError("The combo is empty")
+
+        layout = get_hero_layout(type(self._attacker))
+        resource = getattr(self._attacker, layout.resource)
+        max_resource = getattr(self._attacker, layout.max_resource)
+        scheduler = self._scheduler
+        used: set[str] = set()
+        entries = []
+        for selected_spell in spells:
+            spell = self._spells.get(selected_spell)
+            if spell is None:
+                raise ValueError(f"Unknown spell: {selected_spell}")
+            if spell.name in used or (
+                scheduler is not None and scheduler.is_on_cooldown(self._attacker, spell.name)
+            ):
+                raise ValueError(f"Spell is on cooldown: {spell.name}")
+            if spell.cooldown > 0:
+                used.add(spell.name)
+
+            cost = spell.resource_cost
+            if cost:
+                if layout.resource_gate == GATE_CONSUME:
+                    if resource < cost:
+                        raise ValueError(
+                            f"Not enough resource for {spell.name}: {resource} of {cost}"
+                        )
+                    resource -= cost
+                else:
+                    if resource != cost:
+                        raise ValueError(
+                            f"Resource for {spell.name} must be exactly {cost}: {resource}"
+                        )
+                    if layout.resource_gate == GATE_EXACT_RESET:
+                        resource = 0
+
+            resource = min(resource + spell.definition.generation, max_resource)
+            entries.append(spell)
+
+        return tuple(entries)
 
     # ------------------------------------------------------------------------ #
-    def attack(self, selected_spell) -> IBaseHero:
-        is_spell_valid = hasattr(self._attacker, selected_spell)
+    def attack_combo(self, spells: Sequence[int | str]) -> ComboResult:
+        """
+        Cast a whole combo of the attacker in one call. The combo is validated first and either cast
+        completely or not at all. Spells, which need the active effects of the defender (e.g. Lava Burst),
+        get them from the effect scheduler, so they see the effects of the spells before them in the combo.
+
+        Args:
+            spells (Sequence[int | str]): ids or names of the spells, in the order of casting
+
+        Raises:
+            ValueError: if the combo can not be cast, nothing has been cast then
 
-        if is_spell_valid:
-            # result = is_spell_valid()
+        Returns:
+            ComboResult: results of the cast spells and the damage dealt to the defender
+        """
+        entries = self.validate_combo(spells)
 
-            self._defender.curr_health -= result["spell_damage"]
+        names = []
+        results = []
+        total_damage = 0
+        scheduler = self._scheduler
+        for spell in entries:
+            spell_args = ()
+            if spell.takes_args:
+                spell_args = (
+                    scheduler.get_active_effects(self._defender) if scheduler is not None else [],
+                )
 
-        return self._defender
+            result, damage = self._cast(spell, spell_args)
+            names.append(spell.name)
+            results.append(result)
+            total_damage += damage
+            if not self._defender.is_alive():
+                break
+
+        return ComboResult(tuple(names), tuple(results), total_damage)
+
+    # ------------------------------------------------------------------------ #
+    def _cast(self, spell: SpellEntry, spell_args: tuple) -> tuple[SpellResult | None, int]:
+        recorder = self._recorder
+        if recorder is not None:
+            before = recorder.snapshot()
+
+        damage = 0
+        events = self._attacker.event_bus
+        if events is None:
+            result = spell.method(self._attacker, *spell_args)
+        else:
+            events.casting = spell.name
+            try:
+                result = spell.method(self._attacker, *spell_args)
+            finally:
+                events.casting = None
+        if result is not None:
+            if result.spell_damage > 0:
+                damage = self._defending.take_hit(self._attacker, spell.name, result.spell_damage)
+
+            if self._scheduler is not None:
+                self._scheduler.track_spell(
+                    self._attacker, self._defender, spell.name, result, self._defending
+                )
+
+        # Casts without a result are recorded too, they can still change the state of the caster
+        if recorder is not None:
+            recorder.record_cast(self._attacker, spell.spell_id, result, before)
+        if events is not None and events.publish_cast is not None:
+            events.publish_cast(self._attacker, spell.name, result, damage)
+
+        return result, damage
 
     # ------------------------------------------------------------------------ #
     def heal(self, hp_restore) -> None:
@@ -34,18 +438,90 @@ class Attacking:
 
 # ---------------------------------------------------------------------------- #
 class Defending:
+    """
+    Mitigates the damage dealt to the defender with its mitigation stack and its own damage reduction.
+    """
 
     # ------------------------------------------------------------------------ #
-    def __init__(self, defender: IBaseHero) -> None:
+    def __init__(self, defender: IBaseHero, mitigation: MitigationStack | None = None) -> None:
+        """
+        Args:
+            defender (IBaseHero): hero which takes the damage
+            mitigation (MitigationStack | None): mitigation effects active on the defender,
+                an empty stack by default
+        """
         self._defender = defender
+        self._mitigation = (
+            mitigation if mitigation is not None else MitigationStack(defender.max_damage_reduction)
+        )
+
+    # ------------------------------------------------------------------------ #
+    def snapshot(self) -> tuple:
+        """
+        Capture the state of the defender and of its mitigation stack.
+
+        Returns:
+            tuple: state of the defender, which can be given to restore
+        """
+        return (self._defender.snapshot(), self._mitigation.snapshot())
+
+    # ------------------------------------------------------------------------ #
+    def restore(self, state: tuple) -> None:
+        """
+        Bring the defender and its mitigation stack back to a captured state.
+
+        Args:
+            state (tuple): state captured by snapshot
+        """
+        defender_state, mitigation_state = state
+        self._defender.restore(defender_state)
+        self._mitigation.restore(mitigation_state)
 
     # ------------------------------------------------------------------------ #
     def deflect(self, damage: int) -> int:
-        damage_reduction = self._defender.get_current_damage_reduction()
-        mitigated_damage = damage - damage_reduction
-        if mitigated_damage < 0:
-            mitigated_damage = 0
-        return mitigated_damage
+        """
+        Calculate the damage the defender would take from a hit, without using up its absorb effects.
+
+        Args:
+            damage (int): damage before the mitigation
+
+        Returns:
+            int: damage which would be taken by the defender
+        """
+        return max(self._reduce(damage) - self._mitigation.absorb, 0)
+
+    # ------------------------------------------------------------------------ #
+    def _reduce(self, damage: int) -> int:
+        mitigation = self._mitigation
+        mitigated_damage = (
+            damage * mitigation.damage_taken // 100
+            - mitigation.flat
+            - self._defender.damage_reduction
+        )
+        return mitigated_damage if mitigated_damage > 0 else 0
+
+    # ------------------------------------------------------------------------ #
+    def take_hit(self, attacker: IBaseHero, spell_name: str, damage: int) -> int:
+        """
+        Mitigate a hit and subtract what is left of it from the health of the defender.
+
+        Args:
+            attacker (IBaseHero): hero which dealt the damage
+            spell_name (str): name of the spell method or of the damage over time effect
+            damage (int): damage before the mitigation
+
+        Returns:
+            int: damage taken by the defender
+        """
+        defender = self._defender
+        damage_taken = self._reduce(damage)
+        if damage_taken and self._mitigation.absorb:
+            damage_taken = self._mitigation.absorb_damage(damage_taken)
+        defender.take_damage(damage_taken)
+        events = defender.event_bus
+        if events is not None and events.publish_damage is not None:
+            events.publish_damage(attacker, defender, spell_name, damage, damage_taken)
+        return damage_taken
 
     # ------------------------------------------------------------------------ #
     def parry(self, damage: int) -> int:
@@ -0,0 +1,328 @@
+"""
+Scheduler of everything in a battle, which lasts for more than one turn - spell cooldowns,
+effects with turns active, mitigation effects and damage over time.
+Events are kept in buckets keyed by the turn in which they are due, so starting a turn only touches
+the cooldowns, effects and damage over time ticks which are due in that turn.
+"""
+
+from typing import TYPE_CHECKING
+
+from Heroes.hero_base_stats import IBaseHero
+from mitigation_handler import EMPTY_MITIGATION_STATE, MITIGATION_KINDS, MitigationStack
+from Spells.spell_records import SpellResult
+
+if TYPE_CHECKING:
+    from battles_handler import Defending
+    from Storage.battle_log import BattleRecorder
+
+# --------------------------------- Constants -------------------------------- #
+_COOLDOWN_RESET = 0
+_EFFECT_EXPIRY = 1
+_DAMAGE_OVER_TIME_TICK = 2
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class EffectScheduler:
+    """
+    Tracks the cooldowns and active effects of all heroes in a battle.
+    A spell with a cooldown can be cast again in the turn of its cast plus the cooldown.
+    An effect is active from the turn of its cast for its turns active. Effects with damage over time
+    are placed on the target and tick at the start of each of the following turns, the rest are placed
+    on the caster, which is told when they expire. Casting an active effect again refreshes it. Effects of defensive spells also place
+    their mitigation on the caster's mitigation stack, for as long as they are active.
+    Effects expire before the damage over time of the same turn ticks.
+    With a battle recorder, every damage over time tick is written to the battle log.
+    The whole schedule can be captured with snapshot and brought back with restore, for example to try
+    another spell from the same point of a battle.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, recorder: "BattleRecorder | None" = None) -> None:
+        self._recorder = recorder
+        self._turn = 0
+        self._buckets: dict[int, list[tuple]] = {}
+        self._cooldowns: dict[IBaseHero, set[str]] = {}
+        self._effects: dict[IBaseHero, dict[str, int]] = {}
+        self._damage_over_time: dict[tuple[IBaseHero, str], int] = {}
+        self._mitigation: dict[IBaseHero, MitigationStack] = {}
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def turn(self) -> int:
+        """
+        Current turn of the battle.
+        """
+        return self._turn
+
+    # ------------------------------------------------------------------------ #
+    def start_turn(self, turn: int) -> None:
+        """
+        Move the battle to the given turn and process all events due in it - reset the cooldowns,
+        remove the expired effects and apply the damage over time ticks.
+
+        Args:
+            turn (int): the new turn, must not be lower than the current one
+        """
+        while self._turn < turn:
+            self._turn += 1
+            self._process(self._buckets.pop(self._turn, None))
+
+    # ------------------------------------------------------------------------ #
+    def is_on_cooldown(self, hero: IBaseHero, spell_name: str) -> bool:
+        """
+        Check if the spell of the hero is on cooldown.
+
+        Args:
+            hero (IBaseHero): hero which casts the spell
+            spell_name (str): name of the spell method, for example "cast_judgement"
+
+        Returns:
+            bool: True if the spell can not be cast this turn, else False
+        """
+        cooldowns = self._cooldowns.get(hero)
+        return cooldowns is not None and spell_name in cooldowns
+
+    # ------------------------------------------------------------------------ #
+    def get_ready_spells(self, hero: IBaseHero, spells: tuple[str, ...]) -> tuple[str, ...]:
+        """
+        Get the spells of the hero, which are not on cooldown.
+
+        Args:
+            hero (IBaseHero): hero which casts the spells
+            spells (tuple[str, ...]): names of the spells
+
+        Returns:
+            tuple[str, ...]: names of the ready spells, in the same order
+        """
+        cooldowns = self._cooldowns.get(hero)
+        if not cooldowns:
+            return spells
+
+        return tuple(spell for spell in spells if spell not in cooldowns)
+
+    # ------------------------------------------------------------------------ #
+    def get_active_effects(self, hero: IBaseHero) -> list[str]:
+        """
+        Get the names of all effects active on the hero, for example "flame_shock".
+
+        Args:
+            hero (IBaseHero): hero affected by the effects
+
+        Returns:
+            list[str]: names of the active effects
+        """
+        effects = self._effects.get(hero)
+        return list(effects) if effects else []
+
+    # ------------------------------------------------------------------------ #
+    def get_effect_expiries(self, hero: IBaseHero) -> dict[str, int]:
+        """
+        Get the effects active on the hero and the turns in which they expire.
+
+        Args:
+            hero (IBaseHero): hero affected by the effects
+
+        Returns:
+            dict[str, int]: turn of the expiry, by effect name
+        """
+        effects = self._effects.get(hero)
+        return dict(effects) if effects else {}
+
+    # ------------------------------------------------------------------------ #
+    def get_cooldown_ends(self, hero: IBaseHero) -> dict[str, int]:
+        """
+        Get the spells of the hero, which are on cooldown, and the turns in which they are ready again.
+
+        Args:
+            hero (IBaseHero): hero which cast the spells
+
+        Returns:
+            dict[str, int]: turn in which each spell can be cast again, by spell name
+        """
+        if not self._cooldowns.get(hero):
+            return {}
+
+        return {
+            event[2]: turn
+            for turn, events in self._buckets.items()
+            for event in events
+            if event[0] == _COOLDOWN_RESET and event[1] is hero
+        }
+
+    # ------------------------------------------------------------------------ #
+    def get_damage_over_time(self, target: IBaseHero) -> dict[str, tuple[int, int]]:
+        """
+        Get the damage over time effects, which will still tick on the target.
+
+        Args:
+            target (IBaseHero): hero affected by the effects
+
+        Returns:
+            dict[str, tuple[int, int]]: turn of the last tick and damage per tick, by effect name
+        """
+        return {
+            event[2]: (event[3], event[4])
+            for events in self._buckets.values()
+            for event in events
+            if event[0] == _DAMAGE_OVER_TIME_TICK
+            and event[1] is target
+            and self._damage_over_time.get((target, event[2])) == event[3]
+        }
+
+    # ------------------------------------------------------------------------ #
+    def get_mitigation(self, hero: IBaseHero) -> MitigationStack:
+        """
+        Get the mitigation stack of the hero, which is created with the first call.
+
+        Args:
+            hero (IBaseHero): hero protected by the mitigation
+
+        Returns:
+            MitigationStack: mitigation effects active on the hero
+        """
+        mitigation = self._mitigation.get(hero)
+        if mitigation is None:
+            mitigation = self._mitigation[hero] = MitigationStack(hero.max_damage_reduction)
+        return mitigation
+
+    # ------------------------------------------------------------------------ #
+    def snapshot(self) -> tuple:
+        """
+        Capture the turn, the cooldowns, the active effects, the scheduled events and the mitigation
+        of all heroes. Only the containers are copied, the events and effects are immutable.
+
+        Returns:
+            tuple: state of the scheduler, which can be given to restore
+        """
+        return (
+            self._turn,
+            tuple((turn, tuple(events)) for turn, events in self._buckets.items()),
+            tuple((hero, tuple(spells)) for hero, spells in self._cooldowns.items()),
+            tuple((hero, tuple(effects.items())) for hero, effects in self._effects.items()),
+            tuple(self._damage_over_time.items()),
+            tuple((hero, mitigation.snapshot()) for hero, mitigation in self._mitigation.items()),
+        )
+
+    # ------------------------------------------------------------------------ #
+    def restore(self, state: tuple) -> None:
+        """
+        Bring the scheduler back to a captured state. The mitigation stacks are restored in place,
+        so the Defending instances which hold them stay valid.
+
+        Args:
+            state (tuple): state captured by snapshot
+        """
+        self._turn, buckets, cooldowns, effects, damage_over_time, mitigation = state
+        self._buckets = {turn: list(events) for turn, events in buckets}
+        self._cooldowns = {hero: set(spells) for hero, spells in cooldowns}
+        self._effects = {hero: dict(hero_effects) for hero, hero_effects in effects}
+        self._damage_over_time = dict(damage_over_time)
+
+        mitigation_states = dict(mitigation)
+        for hero, stack in self._mitigation.items():
+            stack.restore(mitigation_states.pop(hero, EMPTY_MITIGATION_STATE))
+        for hero, stack_state in mitigation_states.items():
+            self.get_mitigation(hero).restore(stack_state)
+
+    # ------------------------------------------------------------------------ #
+    def track_spell(
+        self,
+        caster: IBaseHero,
+        target: IBaseHero,
+        spell_name: str,
+        result: SpellResult,
+        target_defending: "Defending",
+    ) -> None:
+        """
+        Start the cooldown and the effect of a cast spell.
+
+        Args:
+            caster (IBaseHero): hero which cast the spell
+            target (IBaseHero): opponent of the caster
+            spell_name (str): name of the spell method, for example "cast_flame_shock"
+            result (SpellResult): result of the cast
+            target_defending (Defending): mitigates the damage over time dealt to the target
+        """
+        turn = self._turn
+        if result.cooldown > 0:
+            self._cooldowns.setdefault(caster, set()).add(spell_name)
+            self._schedule(turn + result.cooldown, (_COOLDOWN_RESET, caster, spell_name))
+
+        if result.turns_active > 0:
+            effect_name = spell_name.removeprefix("cast_")
+            expiry = turn + result.turns_active
+            affected = caster
+            if result.damage_over_time > 0:
+                affected = target
+                self._damage_over_time[(target, effect_name)] = expiry
+                self._schedule(
+                    turn + 1,
+                    (
+                        _DAMAGE_OVER_TIME_TICK,
+                        target,
+                        effect_name,
+                        expiry,
+                        result.damage_over_time,
+                        target_defending,
+                        caster,
+                    ),
+                )
+
+            self._effects.setdefault(affected, {})[effect_name] = expiry
+            self._schedule(expiry, (_EFFECT_EXPIRY, affected, effect_name, expiry))
+
+            mitigation_kind = MITIGATION_KINDS.get(spell_name)
+            if mitigation_kind is not None and result.damage_reduction > 0:
+                self.get_mitigation(caster).add(
+                    effect_name, mitigation_kind, result.damage_reduction, expiry
+                )
+
+    # ------------------------------------------------------------------------ #
+    def _schedule(self, turn: int, event: tuple) -> None:
+        bucket = self._buckets.get(turn)
+        if bucket is None:
+            self._buckets[turn] = [event]
+        else:
+            bucket.append(event)
+
+    # ------------------------------------------------------------------------ #
+    def _process(self, events: list[tuple] | None) -> None:
+        if not events:
+            return
+
+        ticks = []
+        for event in events:
+            kind = event[0]
+            if kind == _COOLDOWN_RESET:
+                self._cooldowns[event[1]].discard(event[2])
+
+            elif kind == _EFFECT_EXPIRY:
+                _, hero, effect_name, expiry = event
+                effects = self._effects[hero]
+                # A refreshed effect has a later expiry and stays active
+                if effects.get(effect_name) == expiry:
+                    del effects[effect_name]
+                    hero.expire_effect(effect_name)
+                mitigation = self._mitigation.get(hero)
+                if mitigation is not None:
+                    mitigation.expire(effect_name, expiry)
+
+            else:
+                ticks.append(event)
+
+        # The ticks are mitigated by the effects which are still active after the expiries
+        for event in ticks:
+            _, target, effect_name, expiry, damage, target_defending, caster = event
+            if self._damage_over_time.get((target, effect_name)) != expiry:
+                continue
+
+            recorder = self._recorder
+            if recorder is not None:
+                before = recorder.snapshot()
+            target_defending.take_hit(caster, effect_name, damage)
+            if recorder is not None:
+                recorder.record_tick(target, effect_name, damage, before)
+            if self._turn < expiry:
+                self._schedule(self._turn + 1, event)
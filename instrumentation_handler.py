@@ -0,0 +1,303 @@
+"""
+Opt-in instrumentation of the spells and resource paths of a hero class.
+Enabling it replaces the "cast_*" methods and the resource methods of the class with measuring wrappers,
+disabling it puts the original methods back, so a class which is not instrumented runs without any wrapper.
+Every spell records its call count, cumulative and p99 latency and the change of the hero resources it caused.
+"""
+
+import functools
+import random
+import time
+from array import array
+from collections.abc import Callable
+
+from Heroes.hero_base_stats import IBaseHero
+from Spells.spell_registry import SPELL_PREFIX, SpellRegistry
+
+# --------------------------------- Constants -------------------------------- #
+RESOURCE_METHODS = ("add_specific_stat", "is_specific_stat_spent", "heal_up")
+MAX_LATENCY_SAMPLES = 10000
+RESOURCE_PREFIX = "_curr_"
+
+_MISSING = object()
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class MethodStats:
+    """
+    Measurements of a single method. The latencies are kept in a bounded reservoir sample,
+    so the p99 stays representative for long runs without growing the memory.
+    """
+
+    __slots__ = ("name", "calls", "total_ns", "resource_deltas", "_samples", "_rng")
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, name: str, resources: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.calls = 0
+        self.total_ns = 0
+        self.resource_deltas = dict.fromkeys(resources, 0)
+        self._samples = array("q")
+        self._rng = random.Random(name)
+
+    # ------------------------------------------------------------------------ #
+    def record(self, elapsed_ns: int) -> None:
+        """
+        Record the latency of a single call.
+
+        Args:
+            elapsed_ns (int): duration of the call in nanoseconds
+        """
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if len(self._samples) < MAX_LATENCY_SAMPLES:
+            self._samples.append(elapsed_ns)
+        else:
+            slot = self._rng.randrange(self.calls)
+            if slot < MAX_LATENCY_SAMPLES:
+                self._samples[slot] = elapsed_ns
+
+    # ------------------------------------------------------------------------ #
+    def p99_ns(self) -> int:
+        """
+        Get the 99th percentile latency.
+
+        Returns:
+            int: latency in nanoseconds, 0 if the method was never called
+        """
+        if not self._samples:
+            return 0
+
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)]
+
+    # ------------------------------------------------------------------------ #
+    def as_dict(self) -> dict:
+        """
+        Get the measurements as a dictionary, for example for JSON output.
+
+        Returns:
+            dict: name, calls, cumulative and p99 latency in nanoseconds and total resource deltas
+        """
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "total_ns": self.total_ns,
+            "p99_ns": self.p99_ns(),
+            "resource_deltas": dict(self.resource_deltas),
+        }
+
+
+# ---------------------------------------------------------------------------- #
+class _ClassInstrumentation:
+    """
+    Wrappers installed on a single hero class and the original attributes they replaced.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, hero_cls: type) -> None:
+        self.hero_cls = hero_cls
+        self.stats: dict[str, MethodStats] = {}
+        self.originals: dict[str, object] = {}
+        self.resources = get_resource_slots(hero_cls)
+
+    # ------------------------------------------------------------------------ #
+    def install(self) -> None:
+        hero_cls = self.hero_cls
+        names = [name for name in dir(hero_cls) if name.startswith(SPELL_PREFIX)]
+        for name in names + list(RESOURCE_METHODS):
+            method = getattr(hero_cls, name, None)
+            # Methods already instrumented through a parent class are measured there
+            if method is None or getattr(method, "__instrumented__", False):
+                continue
+
+            self.originals[name] = hero_cls.__dict__.get(name, _MISSING)
+            if name.startswith(SPELL_PREFIX):
+                stats = MethodStats(name, tuple(self.resources.values()))
+                wrapper = _wrap_spell(method, stats, tuple(self.resources))
+            else:
+                stats = MethodStats(name)
+                wrapper = _wrap_method(method, stats)
+            self.stats[name] = stats
+            setattr(hero_cls, name, wrapper)
+
+        _rebuild_spell_registries(hero_cls)
+
+    # ------------------------------------------------------------------------ #
+    def uninstall(self) -> None:
+        hero_cls = self.hero_cls
+        for name, original in self.originals.items():
+            if original is _MISSING:
+                delattr(hero_cls, name)
+            else:
+                setattr(hero_cls, name, original)
+
+        _rebuild_spell_registries(hero_cls)
+
+
+_instrumented: dict[type, _ClassInstrumentation] = {}
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Helpers                                   #
+# ---------------------------------------------------------------------------- #
+def get_resource_slots(hero_cls: type) -> dict[str, str]:
+    """
+    Get the current resources of a hero class - health, pool and class resource.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+
+    Returns:
+        dict[str, str]: resource name by slot name, for example {"_curr_mana": "mana"}
+    """
+    resources = {}
+    for klass in reversed(hero_cls.__mro__):
+        for slot in getattr(klass, "__slots__", ()):
+            if slot.startswith(RESOURCE_PREFIX):
+                resources[slot] = slot.removeprefix(RESOURCE_PREFIX)
+
+    return resources
+
+
+# ---------------------------------------------------------------------------- #
+def _wrap_spell(method: Callable, stats: MethodStats, slots: tuple[str, ...]) -> Callable:
+    perf_counter_ns = time.perf_counter_ns
+    record = stats.record
+    deltas = stats.resource_deltas
+    resources = tuple(zip(slots, deltas))
+
+    @functools.wraps(method)
+    def instrumented(hero: IBaseHero, *args):
+        before = [getattr(hero, slot) for slot in slots]
+        start = perf_counter_ns()
+        result = method(hero, *args)
+        record(perf_counter_ns() - start)
+        for (slot, resource), value in zip(resources, before):
+            deltas[resource] += getattr(hero, slot) - value
+        return result
+
+    instrumented.__instrumented__ = True
+    return instrumented
+
+
+# ---------------------------------------------------------------------------- #
+def _wrap_method(method: Callable, stats: MethodStats) -> Callable:
+    perf_counter_ns = time.perf_counter_ns
+    record = stats.record
+
+    @functools.wraps(method)
+    def instrumented(hero: IBaseHero, *args, **kwargs):
+        start = perf_counter_ns()
+        result = method(hero, *args, **kwargs)
+        record(perf_counter_ns() - start)
+        return result
+
+    instrumented.__instrumented__ = True
+    return instrumented
+
+
+# ---------------------------------------------------------------------------- #
+def _rebuild_spell_registries(hero_cls: type) -> None:
+    pending = [hero_cls]
+    while pending:
+        klass = pending.pop()
+        klass.spell_registry = SpellRegistry(klass)
+        pending.extend(klass.__subclasses__())
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def enable_instrumentation(hero_cls: type) -> None:
+    """
+    Start measuring the spells and resource methods of a hero class and of its child classes.
+    Enabling an already instrumented class does nothing.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+
+    Raises:
+        TypeError: if the class is not a hero class
+    """
+    if not (isinstance(hero_cls, type) and issubclass(hero_cls, IBaseHero)):
+        raise TypeError(f"Only hero classes can be instrumented: {hero_cls!r}")
+
+    if hero_cls not in _instrumented:
+        instrumentation = _ClassInstrumentation(hero_cls)
+        instrumentation.install()
+        _instrumented[hero_cls] = instrumentation
+
+
+# ---------------------------------------------------------------------------- #
+def disable_instrumentation(hero_cls: type) -> None:
+    """
+    Stop measuring a hero class and put its original methods back.
+    The collected measurements are dropped.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+    """
+    instrumentation = _instrumented.pop(hero_cls, None)
+    if instrumentation is not None:
+        instrumentation.uninstall()
+
+
+# ---------------------------------------------------------------------------- #
+def is_instrumented(hero_cls: type) -> bool:
+    """
+    Check if the hero class itself is instrumented.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+
+    Returns:
+        bool: True if enable_instrumentation was called for the class, else False
+    """
+    return hero_cls in _instrumented
+
+
+# ---------------------------------------------------------------------------- #
+def get_method_stats(hero_cls: type) -> dict[str, MethodStats]:
+    """
+    Get the measurements of an instrumented hero class.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+
+    Returns:
+        dict[str, MethodStats]: measurements by method name, empty if the class is not instrumented
+    """
+    instrumentation = _instrumented.get(hero_cls)
+    return dict(instrumentation.stats) if instrumentation is not None else {}
+
+
+# ---------------------------------------------------------------------------- #
+def format_report(hero_cls: type) -> list[str]:
+    """
+    Format the measurements of an instrumented hero class, the most expensive methods first.
+
+    Args:
+        hero_cls (type): hero class, for example RetributionPaladinSpells
+
+    Returns:
+        list[str]: one line per method, which was called at least once
+    """
+    lines = []
+    stats = sorted(get_method_stats(hero_cls).values(), key=lambda item: item.total_ns, reverse=True)
+    for item in stats:
+        if not item.calls:
+            continue
+
+        deltas = ", ".join(
+            f"{resource} {delta / item.calls:+.1f}" for resource, delta in item.resource_deltas.items()
+        )
+        lines.append(
+            f"{item.name:<32} calls {item.calls:>9,} total {item.total_ns / 1e6:10.3f} ms "
+            f"p99 {item.p99_ns() / 1e3:8.3f} us {deltas}".rstrip()
+        )
+
+    return lines
+
@@ -1,19 +1,17 @@
 import argparse
+import json
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
 
-from Heroes.hero_base_stats import IBaseHero
 from Heroes.hero_factory import HeroFactory
-from battles_handler import Attacking, Defending
+from Heroes.hero_selection import AVAILABLE_CLASSES, AVAILABLE_ROLES, parse_hero_key
 
-# --------------------------------- Constants -------------------------------- #
-AVAILABLE_CLASSES = ["Warrior", "Mage", "Paladin", "Shaman", "Monk", "Priest"]
-AVAILABLE_ROLES = {
-    "Paladin": {"Tank": "Protection", "Damage": "Retribution"},
-    "Warrior": {"Tank": "Protection", "Damage": "Fury"},
-    "Monk": {"Tank": "Brewmaster", "Damage": "Windwalker"},
-    "Mage": {"Damage": "Fire"},
-    "Shaman": {"Damage": "Enhancement"},
-    "Priest": {"Damage": "Shadow"},
-}
+# The commands import the modules they need when they run, so the info-only paths
+# (--show-classes, --show-roles) start without loading any spell code
+if TYPE_CHECKING:
+    from Heroes.hero_base_stats import IBaseHero
+    from Simulations.simulation_handler import BattleResult, ISpellPolicy
 
 
 # ------------------------------ Parse argumets ------------------------------ #
@@ -37,16 +35,436 @@ def arg_parser() -> argparse.Namespace:
         action="store_true",
         help="Show available hero roles and exit",
     )
+    parser.add_argument(
+        "--simulate",
+        type=int,
+        metavar="N",
+        help="Run N headless battles between --attacker and --defender and report battles per second",
+    )
+    parser.add_argument(
+        "--attacker",
+        type=parse_hero_key,
+        default="paladin:retribution",
+        help="Attacker used by --simulate, given as class:role (default: paladin:retribution)",
+    )
+    parser.add_argument(
+        "--defender",
+        type=parse_hero_key,
+        default="warrior:protection",
+        help="Defender used by --simulate, given as class:role (default: warrior:protection)",
+    )
+    parser.add_argument(
+        "--policy",
+        choices=["random", "rotation", "minimax", "mcts"],
+        default=None,
+        help=(
+            "Spell selection policy used by --simulate (default: random) and of the computer "
+            "opponent of --serve (default: rotation). Minimax and mcts search ahead within --think-time"
+        ),
+    )
+    parser.add_argument(
+        "--think-time",
+        type=int,
+        default=50,
+        metavar="MS",
+        help="Milliseconds the minimax and mcts policies may search for every move (default: 50)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed for the random spell selection policy",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["object", "vectorized"],
+        default="object",
+        help=(
+            "Engine used by --simulate. The vectorized engine runs all battles in lockstep "
+            "with NumPy and supports only the random policy (default: object)"
+        ),
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Measure the spells and resource methods of both heroes during --simulate and print a report",
+    )
+    parser.add_argument(
+        "--analytics",
+        metavar="PATH",
+        help=(
+            "Write the DPS, HPS, time to kill and spell efficiency of the battles of --simulate "
+            "(object engine only) or --matrix as JSON"
+        ),
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="Append every battle of --simulate to a binary battle log (object engine only)",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="PATH",
+        help="Append the outcome of every battle of --simulate to a memory-mapped results store",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="Rebuild the outcome of every battle in a binary battle log and print a summary",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Host duels for many players over TCP instead of reading from the terminal",
+    )
+    parser.add_argument(
+        "--host",
+        help="Address the --serve server listens on (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Port the --serve server listens on (default: 8765)",
+    )
+    parser.add_argument(
+        "--rotation",
+        type=parse_hero_key,
+        metavar="HERO",
+        help="Find the spell sequence of a hero, given as class:role, which deals the most damage and exit",
+    )
+    parser.add_argument(
+        "--casts",
+        type=int,
+        default=20,
+        help="Length of the spell sequence searched by --rotation (default: 20)",
+    )
+    parser.add_argument(
+        "--matrix",
+        type=int,
+        metavar="N",
+        help="Run N battles for every attacker and defender pairing and write the matchup matrix",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Amount of worker processes used by --matrix, --sweep and the mcts policy (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help=(
+            "Output path of --matrix, without extension. Writes .csv and .json files (default: matchup_matrix). "
+            "With --sweep, writes a .json file of the ranked configs (default: balance_sweep)"
+        ),
+    )
+    parser.add_argument(
+        "--sweep",
+        metavar="PATH",
+        help=(
+            "Evaluate the spell coefficient overrides of a JSON search space, for example "
+            '{"paladin:retribution": {"cast_blade_of_justice": {"attack_power": [120, 135, 150]}}}, '
+            "each with a full matchup matrix"
+        ),
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        metavar="N",
+        help="Evaluate N random configs of the --sweep search space instead of the whole grid",
+    )
+    parser.add_argument(
+        "--sweep-battles",
+        type=int,
+        default=100,
+        metavar="N",
+        help="Battles of every pairing in every config of --sweep (default: 100)",
+    )
+    parser.add_argument(
+        "--sweep-cache",
+        default=".sweep_cache",
+        metavar="DIR",
+        help="Directory of the cached --sweep results (default: .sweep_cache)",
+    )
+
+    args = parser.parse_args()
+    if args.record and args.engine == "vectorized":
+        parser.error("--record is supported only by the object engine")
+    if args.analytics and args.engine == "vectorized" and args.matrix is None:
+        parser.error("--analytics is supported only by the object engine")
+    if args.casts < 1:
+        parser.error("--casts must be positive")
+    if args.sweep_battles < 1 or (args.samples is not None and args.samples < 1):
+        parser.error("--sweep-battles and --samples must be positive")
+    if args.policy in ("minimax", "mcts") and (
+        args.engine == "vectorized" or args.matrix is not None or args.sweep is not None
+    ):
+        parser.error(
+            f"--policy {args.policy} is supported only by --simulate with the object engine and --serve"
+        )
 
-    return parser.parse_args()
+    return args
 
 
 # --------------------------- Create Hero Instance --------------------------- #
-def create_hero_instance(hero_class: str, hero_role: str) -> IBaseHero:
+def create_hero_instance(hero_class: str, hero_role: str) -> "IBaseHero":
     hero_factory = HeroFactory()
     return hero_factory.create_hero(hero_class, hero_role)
 
 
+# ----------------------------- Simulate Battles ----------------------------- #
+def simulate_battles(args: argparse.Namespace) -> None:
+    if args.engine == "vectorized":
+        simulate_battles_vectorized(args)
+        return
+
+    from instrumentation_handler import (
+        disable_instrumentation,
+        enable_instrumentation,
+        format_report,
+    )
+    from Simulations.analytics_handler import BattleAnalytics, write_analytics_json
+    from Simulations.simulation_handler import BattleSimulator, RandomPolicy, RotationPolicy
+    from Storage.battle_log import BattleRecorder
+
+    if args.policy in ("minimax", "mcts"):
+        # Search policies keep a search per hero, so both heroes share one policy and its workers
+        attacker_policy = defender_policy = create_search_policy(args)
+    elif args.policy == "rotation":
+        attacker_policy = RotationPolicy()
+        defender_policy = RotationPolicy()
+    else:
+        seed = args.seed
+        attacker_policy = RandomPolicy(seed)
+        defender_policy = RandomPolicy(None if seed is None else seed + 1)
+
+    hero_classes = []
+    if args.instrument:
+        hero_classes = list(
+            dict.fromkeys(
+                HeroFactory._hero_registry[hero_key] for hero_key in (args.attacker, args.defender)
+            )
+        )
+        for hero_cls in hero_classes:
+            enable_instrumentation(hero_cls)
+
+    recorder = BattleRecorder(args.record) if args.record else None
+    analytics = BattleAnalytics() if args.analytics else None
+    simulator = BattleSimulator(
+        args.attacker,
+        args.defender,
+        attacker_policy,
+        defender_policy,
+        recorder=recorder,
+        analytics=analytics,
+    )
+    start = time.perf_counter()
+    summary = summarize_simulation(args, simulator.simulate(args.simulate))
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    if recorder is not None:
+        recorder.close()
+    print_simulation_summary(args, summary, elapsed)
+    if analytics is not None:
+        write_analytics_json(analytics, args.analytics)
+        print(f"Wrote the battle analytics to {args.analytics}")
+    if args.policy == "mcts":
+        print(
+            f"MCTS rollouts: {attacker_policy.rollouts}, "
+            f"rollouts/second: {attacker_policy.rollouts_per_second:,.0f}"
+        )
+        attacker_policy.close()
+
+    for hero_cls in hero_classes:
+        print(f"\n{hero_cls.__name__}:")
+        print("\n".join(format_report(hero_cls)))
+        disable_instrumentation(hero_cls)
+
+
+# -------------------------- Vectorized Simulation --------------------------- #
+def simulate_battles_vectorized(args: argparse.Namespace) -> None:
+    # NumPy is an optional dependency, needed only by the vectorized engine
+    from Simulations.vectorized_handler import VectorizedBattle
+
+    start = time.perf_counter()
+    battle = VectorizedBattle(args.attacker, args.defender, args.simulate)
+    summary = summarize_simulation(args, battle.run_random(args.seed))
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print_simulation_summary(args, summary, elapsed)
+
+
+# --------------------------- Summarize Simulation --------------------------- #
+def summarize_simulation(
+    args: argparse.Namespace, results: Iterable["BattleResult"]
+) -> dict[str, float]:
+    from Simulations.simulation_handler import summarize_results
+    from Storage.results_store import ResultsWriter
+
+    if not args.store:
+        return summarize_results(results)
+
+    with ResultsWriter(args.store) as writer:
+        return summarize_results(writer.record(args.attacker, args.defender, results))
+
+
+# ---------------------------- Simulation Summary ---------------------------- #
+def print_simulation_summary(
+    args: argparse.Namespace, summary: dict[str, float], elapsed: float
+) -> None:
+    print(f"Attacker: {':'.join(args.attacker)}, defender: {':'.join(args.defender)}")
+    print(
+        f"Battles: {summary['battles']}, attacker wins: {summary['attacker']}, "
+        f"defender wins: {summary['defender']}, draws: {summary['draws']}, "
+        f"average turns: {summary['average_turns']:.2f}"
+    )
+    print(
+        f"Elapsed: {elapsed:.3f}s, battles/second: {summary['battles'] / elapsed:,.0f}"
+    )
+
+
+# ------------------------------ Replay Battles ------------------------------ #
+def replay_battles(args: argparse.Namespace) -> None:
+    from Simulations.simulation_handler import summarize_results
+    from Storage.battle_log import BattleLogReader
+
+    start = time.perf_counter()
+    with BattleLogReader(args.replay) as reader:
+        records = len(reader)
+        summary = summarize_results(reader.replay())
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    print(
+        f"Battles: {summary['battles']}, attacker wins: {summary['attacker']}, "
+        f"defender wins: {summary['defender']}, draws: {summary['draws']}, "
+        f"average turns: {summary['average_turns']:.2f}"
+    )
+    print(
+        f"Records: {records:,}, elapsed: {elapsed:.3f}s, "
+        f"battles/second: {summary['battles'] / elapsed:,.0f}"
+    )
+
+
+# ------------------------------- Game Server -------------------------------- #
+def serve(args: argparse.Namespace) -> None:
+    from server_handler import DEFAULT_HOST, DEFAULT_PORT, SESSION_MAX_TABLE_SIZE, run_server
+
+    defender_policy = None
+    if args.policy in ("minimax", "mcts"):
+        defender_policy = create_search_policy(args, SESSION_MAX_TABLE_SIZE)
+    elif args.policy == "random":
+        from Simulations.simulation_handler import RandomPolicy
+
+        defender_policy = RandomPolicy(args.seed)
+
+    try:
+        run_server(
+            args.host or DEFAULT_HOST,
+            DEFAULT_PORT if args.port is None else args.port,
+            defender_policy,
+        )
+    finally:
+        if args.policy == "mcts":
+            defender_policy.close()
+
+
+# ---------------------------------------------------------------------------- #
+def create_search_policy(
+    args: argparse.Namespace, max_table_size: int | None = None
+) -> "ISpellPolicy":
+    if args.policy == "mcts":
+        from Simulations.mcts_handler import MonteCarloPolicy
+
+        return MonteCarloPolicy(args.think_time / 1000, workers=args.workers, seed=args.seed)
+
+    from Simulations.minimax_handler import MAX_TABLE_SIZE, MinimaxPolicy
+
+    return MinimaxPolicy(
+        time_budget=args.think_time / 1000, max_table_size=max_table_size or MAX_TABLE_SIZE
+    )
+
+
+# ------------------------------ Matchup Matrix ------------------------------ #
+def run_matchup_matrix(args: argparse.Namespace) -> None:
+    from Simulations.analytics_handler import write_analytics_json
+    from Simulations.matrix_handler import MatchupMatrix, write_matrix_csv, write_matrix_json
+
+    matrix = MatchupMatrix(
+        args.matrix,
+        workers=args.workers,
+        policy=args.policy or "random",
+        seed=args.seed,
+        analytics=bool(args.analytics),
+    )
+    start = time.perf_counter()
+    cells = matrix.run()
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    output = args.output or "matchup_matrix"
+    write_matrix_csv(cells, f"{output}.csv")
+    write_matrix_json(cells, f"{output}.json")
+
+    battles = sum(cell.battles for cell in cells)
+    print(f"Wrote {len(cells)} cells to {output}.csv and {output}.json")
+    if matrix.analytics is not None:
+        write_analytics_json(matrix.analytics, args.analytics)
+        print(f"Wrote the battle analytics to {args.analytics}")
+    print(
+        f"Battles: {battles}, elapsed: {elapsed:.3f}s, battles/second: {battles / elapsed:,.0f}"
+    )
+
+
+# ------------------------------- Balance Sweep ------------------------------ #
+def run_balance_sweep(args: argparse.Namespace) -> None:
+    from Simulations.sweep_handler import (
+        BalanceSweep,
+        grid_configs,
+        load_search_space,
+        random_configs,
+        write_sweep_json,
+    )
+
+    space = load_search_space(args.sweep)
+    if args.samples is None:
+        configs = grid_configs(space)
+    else:
+        configs = random_configs(space, args.samples, args.seed)
+
+    sweep = BalanceSweep(
+        args.sweep_battles,
+        workers=args.workers,
+        policy=args.policy or "random",
+        seed=args.seed or 0,
+        cache_dir=args.sweep_cache,
+    )
+    start = time.perf_counter()
+    results = sweep.run(configs)
+    elapsed = time.perf_counter() - start
+
+    output = args.output or "balance_sweep"
+    write_sweep_json(results, f"{output}.json")
+    print(f"Most balanced of {len(results)} configs (win rate spread, overrides):")
+    for result in results[:5]:
+        print(f"{result.spread:.4f}  {json.dumps(result.overrides)}")
+    print(
+        f"Wrote {output}.json, evaluated: {sweep.evaluated}, cached: {sweep.cache_hits}, "
+        f"elapsed: {elapsed:.3f}s"
+    )
+
+
+# ----------------------------- Rotation Optimizer --------------------------- #
+def optimize_rotation(args: argparse.Namespace) -> None:
+    from Simulations.rotation_handler import RotationOptimizer
+
+    optimizer = RotationOptimizer(args.rotation)
+    start = time.perf_counter()
+    plan = optimizer.optimize(args.casts)
+    elapsed = time.perf_counter() - start
+
+    print(f"Best rotation of {':'.join(plan.hero_key)} in {args.casts} casts:")
+    for turn, spell in enumerate(plan.spells, start=1):
+        print(f"{turn:3}. {spell or '(all spells on cooldown)'}")
+    print(f"Damage: {plan.damage}, states: {optimizer.cache_size}, elapsed: {elapsed:.3f}s")
+
+
 # -------------------------- Set Hero Class and Role ------------------------- #
 def set_hero_class_and_role(position: int) -> tuple[str, str]:
     counter = 0
@@ -98,6 +516,32 @@ def main() -> None:
             print(f"{hero_class}: {', '.join(roles)}")
         return
 
+    if args.simulate is not None:
+        simulate_battles(args)
+        return
+
+    if args.serve:
+        serve(args)
+        return
+
+    if args.replay is not None:
+        replay_battles(args)
+        return
+
+    if args.matrix is not None:
+        run_matchup_matrix(args)
+        return
+
+    if args.sweep is not None:
+        run_balance_sweep(args)
+        return
+
+    if args.rotation is not None:
+        optimize_rotation(args)
+        return
+
+    from battles_handler import Attacking, Defending
+
     first_hero = set_hero_class_and_role(position=1)
     second_hero = set_hero_class_and_role(position=2)
 
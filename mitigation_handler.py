@@ -0,0 +1,167 @@
+"""
+Mitigation of the damage taken by a hero. Defensive spells place mitigation effects on their caster:
+flat effects ignore a fixed amount of every hit, percentage effects ignore a share of it and absorb effects
+soak up damage until their amount is used up. The effects of a hero are combined in its mitigation stack,
+which keeps the effective values cached and recomputes them only when an effect is added or expires,
+so mitigating a hit is a few arithmetic operations.
+"""
+
+from typing import NamedTuple
+
+# --------------------------------- Constants -------------------------------- #
+FLAT = "flat"
+PERCENT = "percent"
+ABSORB = "absorb"
+
+# Kind of the mitigation of every defensive spell, the amount is the damage reduction of its result
+MITIGATION_KINDS: dict[str, str] = {
+    "cast_divine_shield": PERCENT,
+    "cast_divine_protection": FLAT,
+    "cast_blessed_hammer": FLAT,
+    "cast_shield_block": PERCENT,
+    "cast_ignore_pain": PERCENT,
+    "cast_power_word_shield": ABSORB,
+}
+# State of a stack without effects, as captured by MitigationStack.snapshot
+EMPTY_MITIGATION_STATE: tuple = ((), 100, 0, 0)
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class MitigationEffect(NamedTuple):
+    """
+    A single mitigation effect. The amount of an absorb effect is what is left of it.
+    """
+
+    kind: str
+    amount: int
+    expiry: int  # turn in which the effect expires
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class MitigationStack:
+    """
+    Mitigation effects active on a single hero. Percentage effects add up, capped by the max damage reduction
+    of the hero, flat effects add up and absorb effects are used up in the order in which they were added.
+    A hit is first reduced by the percentage, then by the flat amount and what is left is absorbed.
+    """
+
+    __slots__ = ("_max_percent", "_effects", "damage_taken", "flat", "absorb")
+
+    # ------------------------------------------------------------------------ #
+    def __init__(self, max_percent: int = 100) -> None:
+        """
+        Args:
+            max_percent (int): cap of the summed percentage effects, the max damage reduction of the hero
+        """
+        self._max_percent = max_percent
+        self._effects: dict[str, MitigationEffect] = {}
+        self.damage_taken = 100  # percent of a hit, which goes through the percentage effects
+        self.flat = 0
+        self.absorb = 0
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def effects(self) -> dict[str, MitigationEffect]:
+        """
+        Active mitigation effects by effect name. Must not be modified.
+        """
+        return self._effects
+
+    # ------------------------------------------------------------------------ #
+    def add(self, effect_name: str, kind: str, amount: int, expiry: int) -> None:
+        """
+        Add a mitigation effect. Adding an active effect again refreshes it.
+
+        Args:
+            effect_name (str): name of the effect, for example "divine_shield"
+            kind (str): FLAT, PERCENT or ABSORB
+            amount (int): flat amount, percentage or amount to absorb
+            expiry (int): turn in which the effect expires
+
+        Raises:
+            ValueError: if the kind is unknown
+        """
+        if kind not in (FLAT, PERCENT, ABSORB):
+            raise ValueError(f"Unknown mitigation kind: {kind}")
+
+        self._effects.pop(effect_name, None)
+        self._effects[effect_name] = MitigationEffect(kind, amount, expiry)
+        self._recompute()
+
+    # ------------------------------------------------------------------------ #
+    def expire(self, effect_name: str, expiry: int) -> None:
+        """
+        Remove an effect, unless it was refreshed since and expires later.
+
+        Args:
+            effect_name (str): name of the effect
+            expiry (int): turn in which the effect was to expire
+        """
+        effect = self._effects.get(effect_name)
+        if effect is not None and effect.expiry == expiry:
+            del self._effects[effect_name]
+            self._recompute()
+
+    # ------------------------------------------------------------------------ #
+    def snapshot(self) -> tuple:
+        """
+        Capture the active effects and their cached values.
+
+        Returns:
+            tuple: state of the stack, which can be given to restore
+        """
+        return (tuple(self._effects.items()), self.damage_taken, self.flat, self.absorb)
+
+    # ------------------------------------------------------------------------ #
+    def restore(self, state: tuple) -> None:
+        """
+        Bring the stack back to a captured state, without recomputing the cached values.
+
+        Args:
+            state (tuple): state captured by snapshot
+        """
+        effects, self.damage_taken, self.flat, self.absorb = state
+        self._effects = dict(effects)
+
+    # ------------------------------------------------------------------------ #
+    def absorb_damage(self, damage: int) -> int:
+        """
+        Use up the absorb effects on a hit.
+
+        Args:
+            damage (int): damage of the hit after the percentage and flat effects
+
+        Returns:
+            int: damage which was not absorbed
+        """
+        for effect_name, effect in list(self._effects.items()):
+            if not damage:
+                break
+            if effect.kind != ABSORB:
+                continue
+
+            absorbed = min(effect.amount, damage)
+            damage -= absorbed
+            self._effects[effect_name] = effect._replace(amount=effect.amount - absorbed)
+            self.absorb -= absorbed
+
+        return damage
+
+    # ------------------------------------------------------------------------ #
+    def _recompute(self) -> None:
+        percent = flat = absorb = 0
+        for kind, amount, _ in self._effects.values():
+            if kind == PERCENT:
+                percent += amount
+            elif kind == FLAT:
+                flat += amount
+            else:
+                absorb += amount
+
+        self.damage_taken = 100 - min(percent, self._max_percent)
+        self.flat = flat
+        self.absorb = absorb
@@ -0,0 +1,582 @@
+"""
+Game server, which hosts many concurrent duels in a single process.
+Players connect over TCP and talk to the server with one line per message. Every connection is served
+by a single coroutine, which waits for the next line without blocking the other sessions, so an idle
+session costs only its coroutine and, once the heroes are chosen, its two heroes.
+"""
+
+import asyncio
+from collections.abc import Callable
+from typing import NamedTuple, TypeVar
+
+from battles_handler import Attacking, ComboResult
+from effects_handler import EffectScheduler
+from Heroes.hero_base_stats import IBaseHero
+from Heroes.hero_factory import HeroFactory
+from Heroes.hero_selection import (
+    AVAILABLE_CLASSES,
+    AVAILABLE_ROLES,
+    get_spec,
+    parse_hero_class,
+    parse_hero_role,
+)
+from Simulations.simulation_handler import (
+    ATTACKER,
+    DEFAULT_MAX_TURNS,
+    DEFENDER,
+    ISpellPolicy,
+    RotationPolicy,
+)
+from Spells.spell_records import SpellResult
+from Spells.spell_registry import SPELL_PREFIX
+
+# --------------------------------- Constants -------------------------------- #
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_INVALID_ATTEMPTS = 3
+MAX_LINE_LENGTH = 256
+QUIT_COMMAND = "quit"
+# Positions of the minimax transposition table of every duel, the server plays many duels at once
+SESSION_MAX_TABLE_SIZE = 1 << 14
+COMBO_SEPARATOR = ","
+
+_HERO_POSITIONS = {1: "first", 2: "second"}
+
+_Choice = TypeVar("_Choice")
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Records                                   #
+# ---------------------------------------------------------------------------- #
+class TurnOutcome(NamedTuple):
+    """
+    Spells cast in a single turn of a duel. A spell is None if the hero did not cast.
+    When the attacker cast a combo, its spell and result are None and the combo holds its outcome.
+    """
+
+    attacker_spell: str | None
+    attacker_result: SpellResult | None
+    defender_spell: str | None
+    defender_result: SpellResult | None
+    attacker_combo: ComboResult | None = None
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Classes                                   #
+# ---------------------------------------------------------------------------- #
+class DuelSession:
+    """
+    A duel, in which the player picks the spells of the attacker and the defender casts by a policy.
+    The turns follow the same rules as the headless BattleSimulator.
+    """
+
+    __slots__ = (
+        "attacker",
+        "defender",
+        "turn",
+        "winner",
+        "finished",
+        "_max_turns",
+        "_defender_policy",
+        "_scheduler",
+        "_attacking",
+        "_counter_attacking",
+    )
+
+    # ------------------------------------------------------------------------ #
+    def __init__(
+        self,
+        attacker: IBaseHero,
+        defender: IBaseHero,
+        defender_policy: ISpellPolicy,
+        max_turns: int = DEFAULT_MAX_TURNS,
+    ) -> None:
+        self.attacker = attacker
+        self.defender = defender
+        self.turn = 0
+        self.winner: str | None = None
+        self.finished = False
+        self._max_turns = max_turns
+        self._defender_policy = defender_policy
+        self._scheduler = EffectScheduler()
+        self._attacking = Attacking(attacker, defender, self._scheduler)
+        self._counter_attacking = Attacking(defender, attacker, self._scheduler)
+        defender_policy.begin_duel(defender, attacker, self._scheduler, False)
+
+    # ------------------------------------------------------------------------ #
+    def close(self) -> None:
+        """
+        Tell the policy of the defender, that the duel is over or abandoned.
+        """
+        self._defender_policy.end_duel(self.defender)
+
+    # ------------------------------------------------------------------------ #
+    def begin_turn(self) -> tuple[str, ...]:
+        """
+        Start the current turn - apply the damage over time and check if the duel is over.
+
+        Returns:
+            tuple[str, ...]: names of the spells the attacker can cast, empty if the duel is over
+        """
+        self._scheduler.start_turn(self.turn)
+        if self._check_finished():
+            return ()
+
+        return self._scheduler.get_ready_spells(
+            self.attacker, type(self.attacker).spell_registry.names
+        )
+
+    # ------------------------------------------------------------------------ #
+    async def play_turn(self, spell: str | None) -> TurnOutcome:
+        """
+        Cast the spell of the attacker, then let the defender cast and move to the next turn.
+        The other sessions keep running, while the policy of the defender selects its spell.
+
+        Args:
+            spell (str | None): name of a ready spell of the attacker, None if no spell is ready
+
+        Returns:
+            TurnOutcome: spells cast in the turn and their results
+        """
+        attacker_result = None
+        if spell is not None:
+            attacker_result = self._cast(self._attacking, self.attacker, self.defender, spell)
+
+        return await self._finish_turn(TurnOutcome(spell, attacker_result, None, None))
+
+    # ------------------------------------------------------------------------ #
+    def validate_combo(self, spells: tuple[str, ...]) -> None:
+        """
+        Check that the attacker can cast the combo this turn, without changing any state.
+
+        Args:
+            spells (tuple[str, ...]): names of the spells, in the order of casting
+
+        Raises:
+            ValueError: if the combo can not be cast
+        """
+        self._attacking.validate_combo(spells)
+
+    # ------------------------------------------------------------------------ #
+    async def play_combo(self, spells: tuple[str, ...]) -> TurnOutcome:
+        """
+        Cast a whole combo of the attacker in this turn, then let the defender cast and move to the next turn.
+
+        Args:
+            spells (tuple[str, ...]): names of the spells, in the order of casting
+
+        Raises:
+            ValueError: if the combo can not be cast, the turn is not played then
+
+        Returns:
+            TurnOutcome: the combo and the spell of the defender
+        """
+        combo = self._attacking.attack_combo(spells)
+        return await self._finish_turn(TurnOutcome(None, None, None, None, combo))
+
+    # ------------------------------------------------------------------------ #
+    async def _finish_turn(self, outcome: TurnOutcome) -> TurnOutcome:
+        if not self.defender.is_alive():
+            self.turn += 1
+            self.winner = ATTACKER
+            self.finished = True
+            return outcome
+
+        defender_spell = None
+        defender_result = None
+        spells = self._scheduler.get_ready_spells(
+            self.defender, type(self.defender).spell_registry.names
+        )
+        if spells:
+            defender_spell = await self._defender_policy.select_spell_async(
+                self.defender, spells, self.turn
+            )
+            defender_result = self._cast(
+                self._counter_attacking, self.defender, self.attacker, defender_spell
+            )
+
+        self.turn += 1
+        if not self.attacker.is_alive():
+            self.winner = DEFENDER
+            self.finished = True
+
+        return outcome._replace(defender_spell=defender_spell, defender_result=defender_result)
+
+    # ------------------------------------------------------------------------ #
+    def _cast(
+        self, attacking: Attacking, caster: IBaseHero, target: IBaseHero, spell: str
+    ) -> SpellResult | None:
+        if spell in type(caster).spell_registry.spells_with_args:
+            return attacking.attack(spell, self._scheduler.get_active_effects(target))
+        return attacking.attack(spell)
+
+    # ------------------------------------------------------------------------ #
+    def _check_finished(self) -> bool:
+        if not self.defender.is_alive():
+            self.winner = ATTACKER
+        elif not self.attacker.is_alive():
+            self.winner = DEFENDER
+        elif self.turn < self._max_turns:
+            return False
+
+        self.finished = True
+        return True
+
+
+# ---------------------------------------------------------------------------- #
+class GameServer:
+    """
+    Asyncio TCP server, which runs a duel session for every connected player.
+    """
+
+    # ------------------------------------------------------------------------ #
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        defender_policy: ISpellPolicy | None = None,
+        max_turns: int = DEFAULT_MAX_TURNS,
+    ) -> None:
+        self._host = host
+        self._port = port
+        # The policy is shared by all sessions, policies with state per duel keep it by hero
+        self._defender_policy = defender_policy or RotationPolicy()
+        self._max_turns = max_turns
+        self._hero_factory = HeroFactory()
+        self._server: asyncio.Server | None = None
+        self._sessions: dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def session_count(self) -> int:
+        """
+        Amount of connected players.
+        """
+        return len(self._sessions)
+
+    # ------------------------------------------------------------------------ #
+    @property
+    def port(self) -> int:
+        """
+        Port the server listens on, useful when it was started on port 0.
+        """
+        if self._server is None or not self._server.sockets:
+            return self._port
+        return self._server.sockets[0].getsockname()[1]
+
+    # ------------------------------------------------------------------------ #
+    async def start(self) -> None:
+        """
+        Start listening for players.
+        """
+        self._server = await asyncio.start_server(
+            self._handle_session, self._host, self._port, limit=MAX_LINE_LENGTH
+        )
+
+    # ------------------------------------------------------------------------ #
+    async def serve_forever(self) -> None:
+        """
+        Start listening for players and serve them, until the server is cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    # ------------------------------------------------------------------------ #
+    async def close(self) -> None:
+        """
+        Stop listening for players and end all sessions.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+        # Closed connections end the sessions at their next read, so no session is cancelled
+        sessions = list(self._sessions.items())
+        for writer, _ in sessions:
+            writer.close()
+        await asyncio.gather(*(task for _, task in sessions))
+
+    # ------------------------------------------------------------------------ #
+    async def _handle_session(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._sessions[writer] = asyncio.current_task()
+        try:
+            await self._run_session(reader, writer)
+        # A line longer than the limit raises ValueError
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            del self._sessions[writer]
+            writer.close()
+
+    # ------------------------------------------------------------------------ #
+    async def _run_session(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        first_hero = await self._choose_hero(reader, writer, position=1)
+        if first_hero is None:
+            return
+        second_hero = await self._choose_hero(reader, writer, position=2)
+        if second_hero is None:
+            return
+
+        session = DuelSession(
+            self._hero_factory.create_hero(first_hero[0], get_spec(*first_hero)),
+            self._hero_factory.create_hero(second_hero[0], get_spec(*second_hero)),
+            self._defender_policy,
+            self._max_turns,
+        )
+        try:
+            await self._play_duel(reader, writer, session)
+        finally:
+            session.close()
+
+    # ------------------------------------------------------------------------ #
+    async def _play_duel(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, session: DuelSession
+    ) -> None:
+        await _send(
+            writer,
+            f"Created attacker: {session.attacker.get_name()}, defender: {session.defender.get_name()}",
+        )
+
+        while True:
+            spells = session.begin_turn()
+            if session.finished:
+                break
+
+            if not spells:
+                outcome = await session.play_turn(None)
+            else:
+                combo = await self._choose_spell(reader, writer, session, spells)
+                if combo is None:
+                    return
+                if len(combo) == 1:
+                    outcome = await session.play_turn(combo[0])
+                else:
+                    outcome = await session.play_combo(combo)
+
+            await _send(writer, format_turn(session, outcome))
+            if session.finished:
+                break
+
+        await _send(writer, format_winner(session))
+
+    # ------------------------------------------------------------------------ #
+    async def _choose_hero(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, position: int
+    ) -> tuple[str, str] | None:
+        hero = _HERO_POSITIONS[position]
+        prompt = f"Enter the class of the {hero} hero ({', '.join(AVAILABLE_CLASSES)}):"
+        hero_class = await self._ask(reader, writer, prompt, parse_hero_class)
+        if hero_class is None:
+            return None
+
+        roles = AVAILABLE_ROLES[hero_class]
+        if len(roles) == 1:
+            hero_role = next(iter(roles))
+            await _send(writer, f"Automatically selected role: {hero_role}")
+            return hero_class, hero_role
+
+        prompt = f"Enter the role of the {hero} hero ({', '.join(roles)}):"
+        hero_role = await self._ask(
+            reader, writer, prompt, lambda value: parse_hero_role(hero_class, value)
+        )
+        if hero_role is None:
+            return None
+
+        return hero_class, hero_role
+
+    # ------------------------------------------------------------------------ #
+    async def _choose_spell(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        session: DuelSession,
+        spells: tuple[str, ...],
+    ) -> tuple[str, ...] | None:
+        def parse(value: str) -> tuple[str, ...] | None:
+            combo = parse_combo(value, spells)
+            if combo is not None and len(combo) > 1:
+                session.validate_combo(combo)
+            return combo
+
+        choices = ", ".join(
+            f"{number} {name.removeprefix(SPELL_PREFIX)}" for number, name in enumerate(spells)
+        )
+        prompt = (
+            f"Turn {session.turn}. Choose a spell or a combo separated by "
+            f"\"{COMBO_SEPARATOR}\" ({choices}):"
+        )
+        return await self._ask(reader, writer, prompt, parse)
+
+    # ------------------------------------------------------------------------ #
+    async def _ask(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        prompt: str,
+        parse: Callable[[str], _Choice | None],
+    ) -> _Choice | None:
+        await _send(writer, prompt)
+        for attempt in range(1, MAX_INVALID_ATTEMPTS + 1):
+            line = await reader.readline()
+            value = line.decode(errors="replace").strip()
+            if not line or value.lower() == QUIT_COMMAND:
+                return None
+
+            # The parser can explain why a choice is invalid, for example a combo without enough resource
+            reason = ""
+            try:
+                parsed = parse(value)
+            except ValueError as error:
+                parsed = None
+                reason = f" {error}."
+            if parsed is not None:
+                return parsed
+
+            if attempt < MAX_INVALID_ATTEMPTS:
+                await _send(writer, f"Invalid choice.{reason} {prompt}")
+
+        await _send(writer, "Too many invalid attempts. Goodbye.")
+        return None
+
+
+# ---------------------------------------------------------------------------- #
+#                                    Helpers                                   #
+# ---------------------------------------------------------------------------- #
+async def _send(writer: asyncio.StreamWriter, message: str) -> None:
+    writer.write(f"{message}\n".encode())
+    await writer.drain()
+
+
+# ---------------------------------------------------------------------------- #
+def parse_spell(value: str, spells: tuple[str, ...]) -> str | None:
+    """
+    Validate a spell entered by a player - its number in the list of ready spells or its name.
+
+    Args:
+        value (str): entered spell, for example "1", "judgement" or "cast_judgement"
+        spells (tuple[str, ...]): names of the ready spells
+
+    Returns:
+        str | None: name of the spell method or None if the spell is not ready
+    """
+    if value.isdigit():
+        index = int(value)
+        return spells[index] if index < len(spells) else None
+
+    name = value.lower().replace(" ", "_")
+    if not name.startswith(SPELL_PREFIX):
+        name = SPELL_PREFIX + name
+    return name if name in spells else None
+
+
+# ---------------------------------------------------------------------------- #
+def parse_combo(value: str, spells: tuple[str, ...]) -> tuple[str, ...] | None:
+    """
+    Validate the spells of a combo entered by a player, separated by commas. A single spell is a combo of one.
+    Only the spell names are checked here, the cooldowns and resources are checked by the duel.
+
+    Args:
+        value (str): entered combo, for example "2, 0" or "judgement, final verdict"
+        spells (tuple[str, ...]): names of the ready spells
+
+    Returns:
+        tuple[str, ...] | None: names of the spell methods or None if any spell is not ready
+    """
+    combo = []
+    for part in value.split(COMBO_SEPARATOR):
+        spell = parse_spell(part.strip(), spells)
+        if spell is None:
+            return None
+        combo.append(spell)
+
+    return tuple(combo)
+
+
+# ---------------------------------------------------------------------------- #
+def format_turn(session: DuelSession, outcome: TurnOutcome) -> str:
+    """
+    Describe a played turn in a single line.
+
+    Args:
+        session (DuelSession): the duel
+        outcome (TurnOutcome): spells cast in the turn
+
+    Returns:
+        str: the cast spells, their damage and the health of both heroes
+    """
+    parts = []
+    combo = outcome.attacker_combo
+    if combo is not None:
+        names = ", ".join(spell.removeprefix(SPELL_PREFIX) for spell in combo.spells)
+        parts.append(f"You cast the combo {names} for {combo.damage} damage.")
+
+    for hero, spell, result in (
+        ("You", outcome.attacker_spell, outcome.attacker_result),
+        ("Opponent", outcome.defender_spell, outcome.defender_result),
+    ):
+        if spell is None:
+            continue
+        name = spell.removeprefix(SPELL_PREFIX)
+        damage = result.spell_damage if result is not None else 0
+        parts.append(
+            f"{hero} cast {name} for {damage} damage." if damage > 0 else f"{hero} cast {name}."
+        )
+
+    parts.append(
+        f"Health: you {session.attacker.get_current_health()}, "
+        f"opponent {session.defender.get_current_health()}."
+    )
+    return " ".join(parts)
+
+
+# ---------------------------------------------------------------------------- #
+def format_winner(session: DuelSession) -> str:
+    """
+    Describe the outcome of a finished duel.
+
+    Args:
+        session (DuelSession): the finished duel
+
+    Returns:
+        str: the winner and the amount of turns
+    """
+    if session.winner == ATTACKER:
+        return f"You win after {session.turn} turns."
+    if session.winner == DEFENDER:
+        return f"You lose after {session.turn} turns."
+    return f"Draw after {session.turn} turns."
+
+
+# ---------------------------------------------------------------------------- #
+#                                   Functions                                  #
+# ---------------------------------------------------------------------------- #
+def run_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    defender_policy: ISpellPolicy | None = None,
+) -> None:
+    """
+    Run the game server until it is interrupted.
+
+    Args:
+        host (str): address to listen on, localhost by default
+        port (int): port to listen on
+        defender_policy (ISpellPolicy | None): policy of the computer opponent, RotationPolicy by default
+    """
+    server = GameServer(host, port, defender_policy)
+
+    async def serve() -> None:
+        await server.start()
+        print(f"Serving on {host}:{server.port}, press Ctrl+C to stop")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass